@@ -0,0 +1,209 @@
+"""Représentation compacte d'un article
+
+Les articles restent utilisables comme des dictionnaires (get, [], in, items)
+mais stockent leurs champs dans des slots ; le nom de la source est interné et
+un contenu plus long que ARTICLE_SPILL_THRESHOLD est écrit dans un fichier
+temporaire puis relu à la demande.
+"""
+
+import json
+import os
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator
+from config import ARTICLE_SPILL_THRESHOLD
+
+# Taille de lecture initiale du lecteur JSON incrémental (doublée tant qu'un article ne tient pas)
+READ_CHUNK_SIZE = 64 * 1024
+
+# Ordre des champs dans le JSON, identique à celui des dictionnaires construits par le scraper
+FIELDS = ("source", "title", "link", "published", "summary", "content", "author", "score", "tags", "scraped_at")
+
+_MISSING = object()
+_spill_dir = None
+
+def _remove_spill_dir():
+    import shutil
+    shutil.rmtree(_spill_dir, ignore_errors=True)
+
+def _get_spill_dir() -> str:
+    global _spill_dir
+    if _spill_dir is None:
+        # tempfile, atexit et weakref ne sont chargés qu'au premier contenu écrit sur disque
+        import atexit
+        import tempfile
+        _spill_dir = tempfile.mkdtemp(prefix="newsletter_articles_")
+        # Supprimé à la fin du processus avec les contenus encore sur disque
+        atexit.register(_remove_spill_dir)
+    return _spill_dir
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class Article(MutableMapping):
+    __slots__ = ("source", "title", "link", "published", "summary", "_content", "_content_path",
+                 "author", "score", "tags", "scraped_at", "extra", "__weakref__")
+    
+    def __init__(self, **fields):
+        for name in FIELDS:
+            object.__setattr__(self, name if name != "content" else "_content", _MISSING)
+        self._content_path = None
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Article":
+        if isinstance(data, Article):
+            return data
+        return cls(**data)
+    
+    @property
+    def content(self):
+        if self._content_path is not None:
+            with open(self._content_path, "r", encoding="utf-8", errors="surrogatepass") as f:
+                return f.read()
+        return self._content
+    
+    def _set_content(self, value):
+        if self._content_path is not None:
+            _remove_file(self._content_path)
+            self._content_path = None
+        
+        if isinstance(value, str) and len(value) > ARTICLE_SPILL_THRESHOLD:
+            import tempfile
+            import weakref
+            fd, path = tempfile.mkstemp(suffix=".txt", dir=_get_spill_dir())
+            with os.fdopen(fd, "w", encoding="utf-8", errors="surrogatepass") as f:
+                f.write(value)
+            self._content_path = path
+            self._content = None
+            weakref.finalize(self, _remove_file, path)
+        else:
+            self._content = value
+    
+    def __getitem__(self, key):
+        if key == "content":
+            if self._content is _MISSING and self._content_path is None:
+                raise KeyError(key)
+            return self.content
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+    
+    def __setitem__(self, key, value):
+        if key == "content":
+            self._set_content(value)
+        elif key == "source":
+            self.source = sys.intern(value) if isinstance(value, str) else value
+        elif key in FIELDS:
+            object.__setattr__(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key == "content":
+            self._set_content(_MISSING)
+        elif key in FIELDS:
+            object.__setattr__(self, key, _MISSING)
+        else:
+            del self.extra[key]
+    
+    def __contains__(self, key):
+        if key == "content":
+            return self._content_path is not None or self._content is not _MISSING
+        if key in FIELDS:
+            return getattr(self, key) is not _MISSING
+        return self.extra is not None and key in self.extra
+    
+    def __iter__(self):
+        for name in FIELDS:
+            if name in self:
+                yield name
+        if self.extra:
+            yield from self.extra
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return f"Article(source={self.source!r}, title={self['title'] if 'title' in self else ''!r})"
+    
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self}
+
+def write_articles_json(path: str, articles: Iterable) -> int:
+    """Écrit les articles dans un tableau JSON, un article à la fois (même format que json.dump(indent=2))"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for article in articles:
+            data = article.to_dict() if isinstance(article, Article) else article
+            item = json.dumps(data, ensure_ascii=False, indent=2)
+            f.write(("," if count else "") + "\n  " + item.replace("\n", "\n  "))
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+
+def iter_articles_json(path: str) -> Iterator[Dict]:
+    """Lit un tableau JSON d'articles un élément à la fois, sans charger le fichier entier
+    
+    Seuls l'article en cours et un tampon de lecture restent en mémoire.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        chunk_size = READ_CHUNK_SIZE
+        eof = False
+        started = False
+        
+        while True:
+            # Sauter les blancs, le '[' initial et les virgules entre éléments
+            while position < len(buffer) and buffer[position] in " \t\r\n,[":
+                if buffer[position] == "[":
+                    if started:
+                        break
+                    started = True
+                position += 1
+            
+            if position < len(buffer) and buffer[position] == "]" and started:
+                return
+            
+            if position < len(buffer) and started:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    # Un élément qui touche la fin du tampon peut être tronqué (nombre, par exemple)
+                    if end < len(buffer) or eof:
+                        yield item
+                        position = end
+                        chunk_size = READ_CHUNK_SIZE
+                        continue
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    # Élément incomplet : lire plus gros la prochaine fois pour éviter de le redécoder trop souvent
+                    chunk_size *= 2
+            
+            if eof:
+                if started:
+                    raise ValueError(f"Tableau JSON non terminé: {path}")
+                raise ValueError(f"Pas de tableau JSON dans {path}")
+            
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
\ No newline at end of file
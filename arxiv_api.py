@@ -0,0 +1,68 @@
+"""Métadonnées arXiv par lot via l'API d'export
+
+Les identifiants des entrées d'un flux arXiv sont envoyés en une seule requête
+(`id_list`) ; la réponse Atom donne le titre, les auteurs, le résumé et les
+catégories de chaque paper, sans télécharger les PDFs.
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlencode, urljoin
+from config import ARXIV_API_PATH
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV = "{http://arxiv.org/schemas/atom}"
+
+# Identifiant d'un paper dans un lien abs/pdf, sans numéro de version ("2501.01234", "cs/0112017")
+ARXIV_ID_RE = re.compile(r"/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$")
+
+def arxiv_id(link: str) -> Optional[str]:
+    match = ARXIV_ID_RE.search(link or "")
+    return match.group(1) if match else None
+
+def metadata_url(feed_url: str, ids: Iterable[str]) -> str:
+    """Requête de l'API d'export pour tous les identifiants (même hôte que le flux)"""
+    ids = list(ids)
+    return f"{urljoin(feed_url, ARXIV_API_PATH)}?{urlencode({'id_list': ','.join(ids), 'max_results': len(ids)})}"
+
+def _clean(text: Optional[str]) -> str:
+    # Titres et résumés de l'API sont coupés en lignes de largeur fixe
+    return " ".join((text or "").split())
+
+def parse_metadata(data: bytes) -> Dict[str, Dict]:
+    """Métadonnées par identifiant ; les entrées d'erreur de l'API (identifiant inconnu) sont ignorées"""
+    # Comme dans feed_parser, xml.etree n'est chargé qu'à la première réponse
+    import xml.etree.ElementTree as ET
+    papers = {}
+    for entry in ET.fromstring(data).iter(f"{ATOM}entry"):
+        paper_id = arxiv_id(entry.findtext(f"{ATOM}id", ""))
+        if paper_id is None:
+            continue
+
+        links = {link.get("title") or link.get("rel"): link.get("href") for link in entry.iter(f"{ATOM}link")}
+        primary = entry.find(f"{ARXIV}primary_category")
+        papers[paper_id] = {
+            "id": paper_id,
+            "title": _clean(entry.findtext(f"{ATOM}title")),
+            "authors": [_clean(author.findtext(f"{ATOM}name")) for author in entry.iter(f"{ATOM}author")],
+            "abstract": _clean(entry.findtext(f"{ATOM}summary")),
+            "categories": [category.get("term") for category in entry.iter(f"{ATOM}category") if category.get("term")],
+            "primary_category": primary.get("term") if primary is not None else None,
+            "comment": _clean(entry.findtext(f"{ARXIV}comment")),
+            "published": entry.findtext(f"{ATOM}published", ""),
+            "updated": entry.findtext(f"{ATOM}updated", ""),
+            "link": links.get("alternate", ""),
+            "pdf_url": links.get("pdf", "")
+        }
+    return papers
+
+def format_abstract(paper: Dict) -> str:
+    """Contenu d'un article en mode résumés : auteurs, catégories et résumé complet"""
+    parts = [f"Auteurs: {', '.join(paper['authors'])}"]
+    if paper["categories"]:
+        parts.append(f"Catégories: {', '.join(paper['categories'])}")
+    if paper["comment"]:
+        parts.append(f"Commentaire: {paper['comment']}")
+    parts.append("")
+    parts.append(paper["abstract"])
+    return "\n".join(parts)
\ No newline at end of file
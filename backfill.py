@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Re-génération en parallèle des transcripts de runs passés
+
+Chaque fichier data/raw_articles_AAAAMMJJ_HHMMSS.json est un run. Ses transcripts par source
+et sa newsletter sont écrits dans backfill/<run>/, datés du run. Un marqueur .done enregistre
+l'empreinte du code de rendu : relancer la commande reprend là où elle s'était arrêtée, et
+une modification du format rend à nouveau tous les runs.
+
+Usage:
+    python backfill.py [--since 2025-06-01] [--until 2025-08-31] [--glob "data/raw_articles_2025*.json"]
+                       [--workers 8] [--output backfill] [--force]
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import BACKFILL_OUTPUT_DIR
+
+RUN_FILE_RE = re.compile(r"raw_articles_(\d{8}_\d{6})\.json$")
+MARKER_FILE = ".done"
+
+# Modules dont le code détermine le rendu : leur empreinte invalide les runs déjà rendus
+RENDER_MODULES = ["transcript_by_source.py", "transcript_generator.py", "ranking.py", "feed_parser.py", "article.py"]
+
+# Réglages de config.py lus par le rendu (le reste du fichier ne change pas les sorties)
+RENDER_CONFIG = ["ARTICLES_PER_SECTION", "RANKING_WEIGHTS", "RANKING_RECENCY_HALF_LIFE"]
+
+def render_fingerprint() -> str:
+    import config
+    digest = hashlib.sha1()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in RENDER_MODULES:
+        with open(os.path.join(base_dir, name), 'rb') as f:
+            digest.update(f.read())
+    digest.update(json.dumps({name: getattr(config, name) for name in RENDER_CONFIG}, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def run_id(path: str) -> Optional[str]:
+    match = RUN_FILE_RE.search(os.path.basename(path))
+    return match.group(1) if match else None
+
+def find_runs(pattern: str, since: Optional[str] = None, until: Optional[str] = None) -> List[str]:
+    """Fichiers de runs correspondant au motif, filtrés par date (AAAA-MM-JJ, bornes incluses)"""
+    since_key = since.replace("-", "") if since else None
+    until_key = until.replace("-", "") if until else None
+    
+    runs = []
+    for path in glob.glob(pattern):
+        rid = run_id(path)
+        if rid is None:
+            continue
+        day = rid[:8]
+        if (since_key and day < since_key) or (until_key and day > until_key):
+            continue
+        runs.append(path)
+    return sorted(runs, key=run_id)
+
+def is_done(run_dir: str, fingerprint: str) -> bool:
+    try:
+        with open(os.path.join(run_dir, MARKER_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f).get("fingerprint") == fingerprint
+    except (OSError, ValueError):
+        return False
+
+def render_run(data_file: str, run_dir: str, fingerprint: str) -> Dict:
+    """Rend un run (exécuté dans un processus du pool) ; le marqueur est écrit en dernier"""
+    from article import iter_articles_json
+    from transcript_by_source import TranscriptBySource
+    from transcript_generator import TranscriptGenerator
+    
+    start = time.perf_counter()
+    generated_at = datetime.strptime(run_id(data_file), "%Y%m%d_%H%M%S")
+    os.makedirs(run_dir, exist_ok=True)
+    
+    # Les messages par source des workers noieraient la progression
+    with contextlib.redirect_stdout(io.StringIO()):
+        saved_files = TranscriptBySource(base_dir=run_dir).save_transcripts_streaming(
+            lambda: iter_articles_json(data_file), generated_at)
+        newsletter, count = TranscriptGenerator().generate_transcript_streaming(
+            lambda: iter_articles_json(data_file), generated_at)
+    
+    with open(os.path.join(run_dir, f"newsletter_{run_id(data_file)}.md"), 'w', encoding='utf-8') as f:
+        f.write(newsletter)
+    
+    result = {
+        "run": run_id(data_file),
+        "articles": count,
+        "sources": len(saved_files),
+        "seconds": round(time.perf_counter() - start, 2)
+    }
+    with open(os.path.join(run_dir, MARKER_FILE), 'w', encoding='utf-8') as f:
+        json.dump(dict(result, fingerprint=fingerprint, source_file=data_file), f)
+    return result
+
+def backfill(runs: List[str], output_dir: str, workers: int, force: bool = False) -> int:
+    """Rend tous les runs en parallèle ; retourne le nombre de runs en échec"""
+    fingerprint = render_fingerprint()
+    pending = [path for path in runs
+               if force or not is_done(os.path.join(output_dir, run_id(path)), fingerprint)]
+    
+    print(f"🔁 {len(runs)} runs trouvés, {len(runs) - len(pending)} déjà à jour, {len(pending)} à rendre "
+          f"({workers} processus)")
+    if not pending:
+        return 0
+    
+    failures = 0
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {executor.submit(render_run, path, os.path.join(output_dir, run_id(path)), fingerprint): path
+                   for path in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            elapsed = time.perf_counter() - start
+            eta = elapsed / done * (len(pending) - done)
+            try:
+                result = future.result()
+                print(f"  [{done}/{len(pending)}] ✓ {result['run']}: {result['articles']} articles, "
+                      f"{result['sources']} sources ({result['seconds']}s) - reste ~{eta:.0f}s")
+            except Exception as e:
+                failures += 1
+                print(f"  [{done}/{len(pending)}] ✗ {futures[future]}: {str(e)}")
+    
+    print(f"\n✅ {len(pending) - failures} runs rendus en {time.perf_counter() - start:.1f}s dans {output_dir}/")
+    if failures:
+        print(f"❌ {failures} runs en échec (relancer la commande pour les reprendre)")
+    return failures
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-génère les transcripts des runs passés en parallèle")
+    parser.add_argument("--glob", default="data/raw_articles_*.json", help="motif des fichiers de runs")
+    parser.add_argument("--since", help="premier jour inclus (AAAA-MM-JJ)")
+    parser.add_argument("--until", help="dernier jour inclus (AAAA-MM-JJ)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    parser.add_argument("--output", default=BACKFILL_OUTPUT_DIR, help="dossier de sortie (un sous-dossier par run)")
+    parser.add_argument("--force", action="store_true", help="rend aussi les runs déjà à jour")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    runs = find_runs(args.glob, args.since, args.until)
+    if not runs:
+        print("❌ Aucun run trouvé.")
+        sys.exit(1)
+    
+    failures = backfill(runs, args.output, max(args.workers, 1), args.force)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
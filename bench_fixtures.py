@@ -0,0 +1,185 @@
+"""Fixtures synthétiques pour les benchmarks hors-ligne
+
+Génère des réponses réalistes pour chaque type de source (flux RSS, pages
+d'articles, métadonnées et PDFs arXiv, JSON Reddit et Hugging Face, HTML GitHub Trending)
+ainsi qu'un serveur aiohttp local qui les sert avec une latence injectée.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import zlib
+from typing import Dict, Tuple
+from xml.sax.saxutils import escape
+
+LOREM = ("language models keep improving on reasoning benchmarks while research teams "
+         "publish new methods for training evaluation and deployment at scale with open "
+         "weights efficient inference and better data curation pipelines").split()
+
+def lorem(words: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(LOREM) for _ in range(words))
+
+def make_pdf(pages: int, seed: int) -> bytes:
+    """Construit un PDF minimal valide contenant du texte sur plusieurs pages"""
+    objects = []
+    page_ids = [4 + 2 * i for i in range(pages)]
+    objects.append("<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {pages} >>")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    
+    for i in range(pages):
+        heading = ["Abstract", "1 Introduction", "2 Method", "3 Results", "4 Conclusion"][i % 5]
+        lines = [heading] + [lorem(12, seed * 1000 + i * 40 + j) for j in range(40)]
+        text_ops = " ".join(f"({line.encode('ascii', 'replace').decode()}) Tj T*" for line in lines)
+        stream = f"BT /F1 9 Tf 11 TL 40 800 Td {text_ops} ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[i] + 1} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def make_rss(base_url: str, name: str, slug: str, entries: int, arxiv: bool, short: bool) -> str:
+    items = []
+    for i in range(entries):
+        link = f"{base_url}/abs/{slug}.{i:05d}" if arxiv else f"{base_url}/articles/{slug}/{i}.html"
+        description = lorem(20 if short else 300, zlib.crc32(f'{slug}/{i}'.encode()))
+        items.append(
+            f"<item><title>{escape(name)} article {i}</title><link>{link}</link>"
+            f"<description>&lt;p&gt;{escape(description)}&lt;/p&gt;</description>"
+            f"<pubDate>Mon, 06 Jan 2025 {i % 24:02d}:00:00 GMT</pubDate>"
+            f"<author>auteur{i}@example.com</author><category>AI</category></item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(name)}</title><link>{base_url}</link>{''.join(items)}</channel></rss>")
+
+def make_arxiv_api(base_url: str, slugs, entries: int) -> str:
+    """Réponse Atom de l'API d'export pour tous les papers des flux arXiv simulés"""
+    items = []
+    for slug in slugs:
+        for i in range(entries):
+            paper_id = f"{slug}.{i:05d}"
+            authors = "".join(f"<author><name>Auteur {j} {slug}</name></author>" for j in range(3))
+            items.append(
+                f"<entry><id>{base_url}/abs/{paper_id}v1</id><published>2025-01-06T{i % 24:02d}:00:00Z</published>"
+                f"<title>{escape(slug)} paper\n  {i}</title><summary>{lorem(200, zlib.crc32(paper_id.encode()))}</summary>"
+                f"{authors}<arxiv:comment>12 pages</arxiv:comment>"
+                f'<link href="{base_url}/abs/{paper_id}v1" rel="alternate" type="text/html"/>'
+                f'<link title="pdf" href="{base_url}/pdf/{paper_id}v1" rel="related" type="application/pdf"/>'
+                f'<arxiv:primary_category term="cs.AI"/><category term="cs.AI"/><category term="cs.LG"/></entry>'
+            )
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+            f'xmlns:arxiv="http://arxiv.org/schemas/atom"><title>arXiv Query</title>{"".join(items)}</feed>')
+
+def make_article_html(slug: str, index: int) -> str:
+    paragraphs = "".join(f"<p>{lorem(60, zlib.crc32(f'{slug}/{index}/{j}'.encode()))}</p>" for j in range(12))
+    return (f"<html><head><title>{slug} {index}</title><script>var x = 1;</script></head><body>"
+            f"<nav>Menu</nav><article><h1>{slug} {index}</h1>{paragraphs}</article>"
+            f"<footer>Footer</footer></body></html>")
+
+def make_reddit(count: int) -> str:
+    children = [{"data": {
+        "title": f"[D] Discussion {i}",
+        "permalink": f"/r/MachineLearning/comments/{i}/discussion_{i}/",
+        "created_utc": 1736150400 + i * 60,
+        "selftext": lorem(150, i),
+        "is_self": i % 4 != 0,
+        "score": 10 * i
+    }} for i in range(count)]
+    return json.dumps({"data": {"children": children}})
+
+def make_huggingface(count: int) -> str:
+    return json.dumps([{
+        "modelId": f"bench-org/model-{i}",
+        "pipeline_tag": "text-generation",
+        "downloads": 1000 * (count - i),
+        "likes": 10 * (count - i),
+        "library_name": "transformers",
+        "author": "bench-org",
+        "lastModified": "2025-01-06T00:00:00.000Z",
+        "tags": ["transformers", "pytorch"]
+    } for i in range(count)])
+
+def make_github_trending(count: int) -> str:
+    rows = "".join(
+        f'<article class="Box-row"><h2 class="h3"><a href="/bench/repo-{i}">bench / repo-{i}</a></h2>'
+        f'<p class="col-9">{lorem(15, i)}</p><span class="d-inline-block float-sm-right">{i * 7} stars today</span></article>'
+        for i in range(count)
+    )
+    return f"<html><body>{rows}</body></html>"
+
+def build_fixtures(base_url: str, sources: Dict[str, Dict], entries: int) -> Tuple[Dict[str, Tuple[str, bytes]], Dict[str, str]]:
+    """Retourne les réponses par chemin et l'URL locale de chaque source du registre, selon son type"""
+    routes = {}
+    urls = {}
+    
+    arxiv_slugs = []
+    for index, (name, spec) in enumerate(sources.items()):
+        if spec["type"] not in ("rss", "arxiv"):
+            continue
+        slug = f"feed{index}"
+        arxiv = spec["type"] == "arxiv"
+        if arxiv:
+            arxiv_slugs.append(slug)
+        short = spec["full_content"] == "page"
+        routes[f"/rss/{slug}.xml"] = ("application/rss+xml", make_rss(base_url, name, slug, entries, arxiv, short).encode())
+        urls[name] = f"{base_url}/rss/{slug}.xml"
+        for i in range(entries):
+            if arxiv:
+                routes[f"/pdf/{slug}.{i:05d}.pdf"] = ("application/pdf", make_pdf(5, index * 100 + i))
+            else:
+                routes[f"/articles/{slug}/{i}.html"] = ("text/html", make_article_html(slug, i).encode())
+    
+    routes["/api/query"] = ("application/atom+xml", make_arxiv_api(base_url, arxiv_slugs, entries).encode())
+    routes["/reddit.json"] = ("application/json", make_reddit(25).encode())
+    routes["/api/models"] = ("application/json", make_huggingface(10).encode())
+    for i in range(10):
+        routes[f"/bench-org/model-{i}/raw/main/README.md"] = ("text/plain", f"# model-{i}\n\n{lorem(400, i)}".encode())
+    routes["/trending"] = ("text/html", make_github_trending(25).encode())
+    
+    # Les sources d'API partagent la même réponse quel que soit leur nombre
+    api_paths = {"reddit": "/reddit.json", "huggingface": "/api/models", "github_trending": "/trending"}
+    for name, spec in sources.items():
+        if spec["type"] in api_paths:
+            urls[name] = f"{base_url}{api_paths[spec['type']]}"
+    
+    return routes, urls
+
+def use_fixtures(sources: Dict[str, Dict], urls: Dict[str, str]):
+    """Pointe les sources du registre vers le serveur local"""
+    for name, url in urls.items():
+        sources[name]["url"] = url
+
+async def start_fixture_server(routes: Dict[str, Tuple[str, bytes]], latency: float = 0.0, jitter: float = 0.0):
+    """Démarre un serveur aiohttp local qui sert les fixtures ; retourne (runner, base_url)"""
+    from aiohttp import web
+    
+    async def handler(request):
+        if latency or jitter:
+            await asyncio.sleep(latency + random.uniform(0, jitter))
+        route = routes.get(request.path)
+        if route is None:
+            return web.Response(status=404)
+        content_type, body = route
+        return web.Response(body=body, content_type=content_type)
+    
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark hors-ligne du scraper
+
+Sert des fixtures pour toutes les sources depuis un serveur aiohttp local,
+y pointe NewsletterScraper et mesure le temps total, le temps par phase,
+la mémoire maximale et le débit en articles par seconde.
+
+Usage:
+    python bench_scraper.py [--latency 0.05] [--jitter 0.02] [--runs 3]
+                            [--save bench_baseline.json] [--baseline bench_baseline.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+import resource
+from typing import Dict
+from bench_fixtures import build_fixtures, use_fixtures, start_fixture_server
+from config import BENCH_ENTRIES_PER_FEED, BENCH_DEFAULT_LATENCY
+from metrics import PHASES
+from scraper import NewsletterScraper
+
+async def run_benchmark(latency: float, jitter: float, entries: int, verbose: bool = False, arxiv_pdf: bool = False) -> Dict:
+    """Exécute un scraping complet contre le serveur local et retourne les mesures"""
+    routes = {}
+    runner, base_url = await start_fixture_server(routes, latency, jitter)
+    try:
+        scraper = NewsletterScraper()
+        fixture_routes, urls = build_fixtures(base_url, scraper.sources, entries)
+        routes.update(fixture_routes)
+        use_fixtures(scraper.sources, urls)
+        scraper.arxiv_pdf = arxiv_pdf
+        
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        with output:
+            articles = await scraper.scrape_all_sources()
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        # RSS maximal du processus (Linux : en Ko) ; inclut le serveur local, qui tourne dans le même processus
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    finally:
+        await runner.cleanup()
+    
+    timings = scraper.metrics.report()
+    stages = {phase: round(sum(record[phase] for record in timings.values()), 4) for phase in PHASES}
+    
+    return {
+        "elapsed_s": round(elapsed, 4),
+        "cpu_s": round(cpu, 4),
+        "articles": len(articles),
+        "articles_per_s": round(len(articles) / elapsed, 2) if elapsed else 0,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+        "bytes": sum(record["bytes"] for record in timings.values()),
+        "stages": stages,
+        "sources": {name: record["duration"] for name, record in sorted(timings.items())}
+    }
+
+def summarize(runs) -> Dict:
+    """Médiane des mesures principales sur plusieurs exécutions"""
+    summary = {key: statistics.median(run[key] for run in runs)
+               for key in ["elapsed_s", "cpu_s", "articles", "articles_per_s", "peak_memory_mb", "bytes"]}
+    summary["stages"] = {phase: statistics.median(run["stages"][phase] for run in runs) for phase in PHASES}
+    summary["sources"] = runs[-1]["sources"]
+    return summary
+
+def print_summary(summary: Dict, baseline: Dict = None):
+    def delta(key):
+        if not baseline or not baseline.get(key):
+            return ""
+        change = (summary[key] - baseline[key]) / baseline[key] * 100
+        return f" ({change:+.1f}% vs baseline)"
+    
+    print(f"⏱ Temps total: {summary['elapsed_s']:.3f}s{delta('elapsed_s')}")
+    print(f"🖥 Temps CPU: {summary['cpu_s']:.3f}s{delta('cpu_s')}")
+    print(f"📰 Articles: {summary['articles']} ({summary['articles_per_s']:.1f}/s){delta('articles_per_s')}")
+    print(f"💾 Mémoire max: {summary['peak_memory_mb']:.1f} Mo{delta('peak_memory_mb')}")
+    print(f"📦 Octets reçus: {summary['bytes']:,}")
+    print("\nTemps cumulé par phase (toutes sources):")
+    for phase, value in summary["stages"].items():
+        print(f"  - {phase}: {value:.3f}s")
+    print("\nSources les plus lentes:")
+    for name, duration in sorted(summary["sources"].items(), key=lambda item: item[1], reverse=True)[:5]:
+        print(f"  - {name}: {duration:.3f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne du scraper")
+    parser.add_argument("--latency", type=float, default=BENCH_DEFAULT_LATENCY, help="latence injectée par requête (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latence aléatoire additionnelle maximale (s)")
+    parser.add_argument("--entries", type=int, default=BENCH_ENTRIES_PER_FEED, help="entrées par flux RSS")
+    parser.add_argument("--runs", type=int, default=3, help="nombre d'exécutions (médiane)")
+    parser.add_argument("--save", help="enregistre le résultat comme baseline JSON")
+    parser.add_argument("--baseline", help="compare à une baseline JSON et échoue en cas de régression")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="régression tolérée sur le temps total (fraction)")
+    parser.add_argument("--arxiv-pdf", action="store_true", help="inclut le palier PDF arXiv")
+    parser.add_argument("--verbose", action="store_true", help="affiche la sortie du scraper")
+    args = parser.parse_args()
+    
+    runs = []
+    for i in range(args.runs):
+        print(f"▶ Exécution {i + 1}/{args.runs}...")
+        runs.append(asyncio.run(run_benchmark(args.latency, args.jitter, args.entries, args.verbose, args.arxiv_pdf)))
+    summary = summarize(runs)
+    summary["params"] = {"latency": args.latency, "jitter": args.jitter, "entries": args.entries, "runs": args.runs,
+                         "arxiv_pdf": args.arxiv_pdf}
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    
+    print()
+    print_summary(summary, baseline)
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 Baseline sauvegardée dans {args.save}")
+    
+    if baseline and summary["elapsed_s"] > baseline["elapsed_s"] * (1 + args.tolerance):
+        print(f"\n❌ Régression: {summary['elapsed_s']:.3f}s contre {baseline['elapsed_s']:.3f}s en baseline")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark du temps de démarrage des points d'entrée
+
+Chaque point d'entrée est importé dans un interpréteur neuf ; le script échoue
+si le temps d'import dépasse le budget défini dans config.py, ou si un script
+de rendu texte charge une dépendance lourde.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from config import STARTUP_IMPORT_BUDGET_MS
+
+HEAVY_MODULES = ["aiohttp", "feedparser", "bs4", "PyPDF2"]
+
+# Points d'entrée qui ne font que du rendu texte et ne doivent charger aucune dépendance lourde
+TEXT_ONLY_ENTRY_POINTS = ["generate_transcripts_only", "merge_transcripts"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"import_ms": elapsed, "heavy": heavy}}))
+"""
+
+def measure(module: str, runs: int = 5) -> dict:
+    """Mesure le temps d'import d'un module dans un interpréteur neuf (médiane sur plusieurs essais)"""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    import_times = []
+    heavy = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=repo_dir, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        import_times.append(result["import_ms"])
+        heavy = result["heavy"]
+    
+    return {"import_ms": statistics.median(import_times), "heavy": heavy}
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = []
+    
+    print(f"⏱ Temps d'import par point d'entrée (médiane sur {runs} essais)")
+    for module, budget in STARTUP_IMPORT_BUDGET_MS.items():
+        result = measure(module, runs)
+        ok = result["import_ms"] <= budget
+        if module in TEXT_ONLY_ENTRY_POINTS and result["heavy"]:
+            ok = False
+        
+        status = "✓" if ok else "✗"
+        heavy = f" (chargés: {', '.join(result['heavy'])})" if result["heavy"] else ""
+        print(f"  {status} {module}: {result['import_ms']:.1f} ms / budget {budget} ms{heavy}")
+        if not ok:
+            failures.append(module)
+    
+    if failures:
+        print(f"\n❌ Budget de démarrage dépassé: {', '.join(failures)}")
+        sys.exit(1)
+    
+    print("\n✅ Tous les points d'entrée respectent leur budget")
+
+if __name__ == "__main__":
+    main()
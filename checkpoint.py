@@ -0,0 +1,108 @@
+"""Points de reprise d'un run de scraping (--resume)
+
+Pendant le run, chaque article traité (page complète, PDF) puis chaque source terminée
+est ajouté à un journal JSON Lines dans CHECKPOINT_DIR/<run-id>/. Un run interrompu est
+repris avec `python main.py --resume <run-id>` : les sources terminées sont relues depuis
+le journal, les autres sont scrapées à nouveau mais leurs articles déjà traités ne sont
+pas redemandés. Les options du run (run.json) et l'heure de départ, qui fixe la fenêtre
+de publication, sont celles du run d'origine.
+
+Chaque processus écrit son propre journal (workers de sharding.py) ; une ligne tronquée
+par l'interruption est ignorée à la relecture.
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import CHECKPOINT_DIR
+
+def new_run_id() -> str:
+    """Identifiant d'un run : horodatage de son départ, repris dans le nom des fichiers de sortie"""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+class RunCheckpoint:
+    def __init__(self, run_id: str, base_dir: str = CHECKPOINT_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(base_dir, run_id)
+        self.options: Dict = {}
+        self.started = time.time()
+        # Travail relu dans les journaux : sources terminées (statut, mesures, articles) et articles traités des autres sources
+        self.sources: Dict[str, Dict] = {}
+        self.articles: Dict[str, Dict[str, Dict]] = {}
+        self._journal = None
+    
+    @classmethod
+    def create(cls, options: Dict, run_id: Optional[str] = None, base_dir: str = CHECKPOINT_DIR) -> "RunCheckpoint":
+        """Nouveau run : son dossier et ses options sont écrits avant le scraping"""
+        checkpoint = cls(run_id or new_run_id(), base_dir)
+        checkpoint.options = options
+        os.makedirs(checkpoint.path, exist_ok=True)
+        with open(os.path.join(checkpoint.path, "run.json"), 'w', encoding='utf-8') as f:
+            json.dump({"run_id": checkpoint.run_id, "started": checkpoint.started, "options": options}, f,
+                      ensure_ascii=False, indent=2)
+        return checkpoint
+    
+    @classmethod
+    def load(cls, run_id: str, base_dir: str = CHECKPOINT_DIR) -> "RunCheckpoint":
+        """Run existant : options d'origine et travail déjà enregistré dans ses journaux"""
+        checkpoint = cls(run_id, base_dir)
+        run_file = os.path.join(checkpoint.path, "run.json")
+        if not os.path.exists(run_file):
+            raise ValueError(f"Aucun point de reprise pour le run {run_id} dans {base_dir}")
+        with open(run_file, 'r', encoding='utf-8') as f:
+            run = json.load(f)
+        checkpoint.options = run["options"]
+        checkpoint.started = run["started"]
+        
+        for filename in sorted(os.listdir(checkpoint.path)):
+            if filename.startswith("journal_") and filename.endswith(".jsonl"):
+                checkpoint._read_journal(os.path.join(checkpoint.path, filename))
+        return checkpoint
+    
+    def _read_journal(self, path: str):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Dernière ligne écrite au moment de l'interruption
+                    break
+                if record["kind"] == "source":
+                    self.sources[record["source"]] = record
+                else:
+                    self.articles.setdefault(record["source"], {})[record["key"]] = record["article"]
+    
+    def _write(self, record: Dict):
+        if self._journal is None:
+            self._journal = open(os.path.join(self.path, f"journal_{os.getpid()}.jsonl"), 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Visible sur disque même si le processus est tué juste après
+        self._journal.flush()
+    
+    # Le travail du run en cours n'est pas gardé en mémoire : seul le journal compte pour une reprise
+    def record_article(self, source: str, key: str, article: Dict):
+        self._write({"kind": "article", "source": source, "key": key, "article": article})
+    
+    def record_source(self, source: str, status: Dict, timings: Optional[Dict], articles: List[Dict]):
+        self._write({"kind": "source", "source": source, "status": status, "timings": timings, "articles": articles})
+    
+    def article(self, source: str, key: str) -> Optional[Dict]:
+        """Article déjà traité d'une source non terminée (None s'il reste à faire)"""
+        return self.articles.get(source, {}).get(key)
+    
+    def completed(self, source: str) -> Optional[Dict]:
+        """Source terminée : statut, mesures de temps et articles (None si elle reste à faire)"""
+        return self.sources.get(source)
+    
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def remove(self):
+        """Supprime les points de reprise une fois les sorties du run écrites"""
+        self.close()
+        shutil.rmtree(self.path, ignore_errors=True)
\ No newline at end of file
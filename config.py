@@ -1,30 +1,15 @@
 """Configuration pour le scraper de newsletter IA"""
 
-# Sources qui nécessitent de récupérer le contenu complet depuis la page web
-SOURCES_NEED_FULL_CONTENT = [
-    "ActuIA",
-    "MIT Tech Review AI", 
-    "TechCrunch AI",
-    "VentureBeat AI",
-    "L'Usine Digitale IA",
-    "AI Trends",
-    "KDnuggets"
-]
-
-# Sources avec des restrictions d'accès (403 sur extraction)
-RESTRICTED_SOURCES = ["AI Business"]
-
-# Sources qui nécessitent une approche spéciale
-SPECIAL_HANDLING_SOURCES = {
-    "AI Business": {
-        "use_rss_content": True,
-        "note": "Source avec protection anti-scraping. Utilisation du contenu RSS uniquement."
-    }
-}
+# Registre des sources (type d'adaptateur, URL, limites et options d'extraction), voir source_registry.py
+SOURCES_FILE = "sources.json"
 
 # Limite d'articles par source
 ARTICLES_PER_SOURCE = 10
 
+# Fenêtre de publication en heures (None = pas de filtre) : les entrées RSS et les posts Reddit
+# plus anciens sont écartés dès le parsing, avant toute extraction de contenu ou de PDF
+ARTICLE_MAX_AGE_HOURS = None
+
 # Timeout pour les requêtes HTTP (en secondes)
 REQUEST_TIMEOUT = 30
 
@@ -38,4 +23,136 @@ MIN_CONTENT_LENGTH = 500
 MAX_CONTENT_LENGTH = 5000
 
 # Pas de limite pour arXiv - on veut le PDF complet
-ARXIV_NO_LIMIT = True
\ No newline at end of file
+ARXIV_NO_LIMIT = True
+
+# Mode daemon : intervalles de polling adaptatifs par source (en secondes)
+DAEMON_DEFAULT_INTERVAL = 3600
+DAEMON_MIN_INTERVAL = 300
+DAEMON_MAX_INTERVAL = 86400
+
+# Nombre de nouveaux articles visé par passage ; l'intervalle s'ajuste au rythme de publication observé
+DAEMON_TARGET_NEW_ARTICLES = 3
+
+# Facteur d'allongement de l'intervalle quand une source n'a rien publié ou a échoué
+DAEMON_BACKOFF_FACTOR = 1.5
+
+# Liens déjà vus gardés en mémoire par le daemon : ceux vus avant la fenêtre de publication sont oubliés,
+# et au-delà de ce nombre les plus anciens aussi
+DAEMON_KNOWN_LINKS_MAX = 50000
+
+# Budget de temps d'import (en millisecondes) par point d'entrée, vérifié par bench_startup.py
+STARTUP_IMPORT_BUDGET_MS = {
+    "main": 150,
+    "daemon": 150,
+    "generate_transcripts_only": 50,
+    "merge_transcripts": 50
+}
+
+# Benchmark hors-ligne (bench_scraper.py) : nombre d'entrées par flux simulé et latence injectée par défaut (en secondes)
+BENCH_ENTRIES_PER_FEED = 20
+BENCH_DEFAULT_LATENCY = 0.05
+
+# Test de charge (stress_scraper.py) : nombres de flux synthétiques testés, entrées par flux
+# et part des flux dont les articles sont récupérés depuis leur page
+STRESS_SCALES = [19, 100, 500, 2000]
+STRESS_ENTRIES_PER_FEED = 5
+STRESS_PAGE_FRACTION = 0.25
+
+# Croissance du coût par source (plus grande taille contre plus petite) au-delà de laquelle une étape est signalée
+STRESS_SCALING_TOLERANCE = 1.5
+
+# Scraping réparti (sharding.py) : sources traitées en parallèle par worker et délai avant de reprendre une source abandonnée (en secondes)
+SHARD_WORKER_CONCURRENCY = 8
+SHARD_JOB_TIMEOUT = 900
+
+# Contenu d'article au-delà duquel le texte est déplacé dans un fichier temporaire (en caractères)
+ARTICLE_SPILL_THRESHOLD = 64 * 1024
+
+# Nombre maximal de requêtes HTTP simultanées, partagé entre toutes les sources
+SCRAPER_MAX_CONCURRENT_REQUESTS = 20
+
+# Historique des durées par source, utilisé pour lancer et servir en priorité les sources les plus longues
+SOURCE_HISTORY_FILE = "data/source_timings.json"
+SOURCE_HISTORY_ALPHA = 0.3
+
+# Requêtes de couverture (--hedge) : une seconde tentative est lancée quand une page d'article dépasse le
+# percentile HEDGE_PERCENTILE des latences de son hôte ; au plus HEDGE_BUDGET_FRACTION des requêtes de pages en plus,
+# et HEDGE_HOST_BUDGET_FRACTION des requêtes de chaque hôte (une relance au moins par hôte).
+# Sans HEDGE_MIN_SAMPLES latences connues (hôte ou ensemble des hôtes), le délai est HEDGE_DEFAULT_DELAY (secondes)
+HOST_LATENCY_FILE = "data/host_latency.json"
+HEDGE_PERCENTILE = 0.95
+HEDGE_BUDGET_FRACTION = 0.1
+HEDGE_HOST_BUDGET_FRACTION = 0.2
+HEDGE_MIN_SAMPLES = 5
+HEDGE_DEFAULT_DELAY = 10.0
+HEDGE_MIN_DELAY = 0.5
+HEDGE_HISTORY_SAMPLES = 50
+
+# Points de reprise (--resume) : journal des sources terminées et des articles traités, un dossier par run
+CHECKPOINT_DIR = "data/checkpoints"
+
+# Mode échéance (--deadline) : fractions du budget de temps à partir desquelles le scraper se dégrade
+# 1) plus d'extraction PDF / contenu complet (contenu RSS conservé), 2) annulation des sources restantes
+DEADLINE_DEGRADE_FRACTION = 0.6
+DEADLINE_CANCEL_FRACTION = 0.9
+
+# Classement des articles de la newsletter : poids de chaque composante et demi-vie de la fraîcheur (en heures)
+RANKING_WEIGHTS = {"text": 0.5, "recency": 0.3, "engagement": 0.2}
+RANKING_RECENCY_HALF_LIFE = 24
+ARTICLES_PER_SECTION = 5
+
+# API Hugging Face : tri, nombre de modèles et champs demandés côté serveur
+HUGGINGFACE_MODELS_LIMIT = 10
+HUGGINGFACE_SORT = "trendingScore"
+HUGGINGFACE_FIELDS = ["author", "cardData", "downloads", "lastModified", "library_name", "likes", "pipeline_tag", "tags"]
+
+# arXiv : métadonnées de tous les papers d'un flux en une requête à l'API d'export (mode résumés par défaut).
+# Palier PDF (--arxiv-pdf, sources avec full_content "arxiv_pdf") : au plus ARXIV_PDF_BUDGET PDFs par run,
+# ARXIV_PDF_CONCURRENCY téléchargements à la fois
+ARXIV_API_PATH = "/api/query"
+ARXIV_PDF_BUDGET = 10
+ARXIV_PDF_CONCURRENCY = 2
+
+# API Reddit : posts texte voulus, taille de page demandée et nombre maximal de pages
+REDDIT_POSTS_LIMIT = 10
+REDDIT_PAGE_SIZE = 25
+REDDIT_MAX_PAGES = 3
+
+# GitHub Trending : nombre de dépôts retenus
+GITHUB_TRENDING_LIMIT = 10
+
+# Profilage (--profile) : intervalle d'échantillonnage en secondes et taille du top des fonctions
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_TOP_N = 25
+
+# Surveillance de la boucle asyncio : blocage signalé au-delà du seuil (secondes), période du battement
+LOOP_STALL_THRESHOLD = 0.1
+LOOP_MONITOR_INTERVAL = 0.02
+LOOP_STALL_REPORT_TOP = 10
+
+# Re-génération des runs passés (backfill.py) : dossier de sortie, un sous-dossier par run
+BACKFILL_OUTPUT_DIR = "backfill"
+
+# Profils de newsletters (python main.py --newsletters recherche,actu_fr) : sources (identifiants du
+# scraper), catégories optionnelles (clés research/news/tools/community), limites et dossier de sortie
+NEWSLETTER_PROFILES = {
+    "recherche": {
+        "title": "Digest Recherche IA",
+        "sources": ["arXiv AI", "arXiv ML", "Papers With Code", "Google AI Blog", "OpenAI Blog", "ScienceDaily AI", "AIhub"],
+        "articles_per_section": 10,
+        "output_dir": "transcripts/profiles/recherche"
+    },
+    "actu_fr": {
+        "title": "Actualités IA en français",
+        "sources": ["ActuIA", "L'Usine Digitale IA"],
+        "categories": {"news": ["ActuIA", "L'Usine Digitale"]},
+        "articles_per_section": 8,
+        "output_dir": "transcripts/profiles/actu_fr"
+    },
+    "outils": {
+        "title": "Nouveaux outils IA",
+        "sources": ["Hugging Face", "GitHub Trending", "Reddit ML"],
+        "articles_per_source": 5,
+        "output_dir": "transcripts/profiles/outils"
+    }
+}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Mode daemon : scraping continu avec un intervalle de polling adaptatif par source"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Optional, TYPE_CHECKING
+from scraper import NewsletterScraper
+from config import (DAEMON_DEFAULT_INTERVAL, DAEMON_MIN_INTERVAL, DAEMON_MAX_INTERVAL,
+                    DAEMON_TARGET_NEW_ARTICLES, DAEMON_BACKOFF_FACTOR, DAEMON_KNOWN_LINKS_MAX, ARXIV_PDF_BUDGET)
+
+if TYPE_CHECKING:
+    import aiohttp
+
+class ScraperDaemon:
+    def __init__(self, scraper: NewsletterScraper = None, profiles: Optional[Dict] = None, delta: bool = False):
+        self.scraper = scraper or NewsletterScraper()
+        # Sorties de chaque passage : newsletters des profils et transcripts delta éventuels
+        self.profiles = profiles
+        self.delta = delta
+        # Heure du premier passage de chaque lien connu du scraper, dans l'ordre où ils ont été vus
+        self.seen_at: Dict[str, float] = {}
+        # Articles courants de chaque source (liens encore connus), comparés en mode delta
+        self.current: Dict[str, Dict[str, Dict]] = {}
+        self.polled: List[str] = []
+        self.schedule = {}
+        now = time.monotonic()
+        for name in self.scraper.get_source_names():
+            self.schedule[name] = {
+                "interval": DAEMON_DEFAULT_INTERVAL,
+                "next_run": now,
+                "last_run": None,
+                "rate": None  # nouveaux articles par seconde (moyenne mobile)
+            }
+    
+    def update_interval(self, name: str, new_count: int, failed: bool, now: float):
+        """Ajuste l'intervalle d'une source selon son rythme de publication observé"""
+        state = self.schedule[name]
+        
+        if state["last_run"] is None and not failed:
+            # Premier passage : tout est nouveau, rien à déduire du rythme de publication
+            interval = state["interval"]
+        elif failed or new_count == 0:
+            interval = state["interval"] * DAEMON_BACKOFF_FACTOR
+        else:
+            observed_rate = new_count / max(now - state["last_run"], 1.0)
+            if state["rate"] is None:
+                state["rate"] = observed_rate
+            else:
+                state["rate"] = 0.5 * state["rate"] + 0.5 * observed_rate
+            interval = DAEMON_TARGET_NEW_ARTICLES / state["rate"]
+        
+        state["interval"] = min(max(interval, DAEMON_MIN_INTERVAL), DAEMON_MAX_INTERVAL)
+        state["last_run"] = now
+        state["next_run"] = now + state["interval"]
+    
+    async def poll_source(self, session: aiohttp.ClientSession, name: str) -> List[Dict]:
+        """Scrape une source et met à jour son planning"""
+        try:
+            articles = await self.scraper.scrape_source(session, name)
+        except Exception as e:
+            print(f"✗ Erreur {name}: {str(e)}")
+            self.scraper.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
+            articles = []
+        
+        failed = self.scraper.source_status.get(name, {}).get("status") == "failed"
+        self.update_interval(name, len(articles), failed, time.monotonic())
+        
+        now = time.time()
+        current = self.current.setdefault(name, {})
+        for article in articles:
+            if article.get("link") and article["link"] not in self.seen_at:
+                self.scraper.known_links.add(article["link"])
+                self.seen_at[article["link"]] = now
+                current[article["link"]] = article
+        
+        print(f"  ⏱ {name}: prochain passage dans {int(self.schedule[name]['interval'])}s")
+        return articles
+    
+    def forget_old_links(self):
+        """Oublie les liens vus avant la fenêtre de publication (leurs entrées sont écartées de toute façon),
+        puis les plus anciens au-delà de DAEMON_KNOWN_LINKS_MAX"""
+        window_start = self.scraper.window_start()
+        while self.seen_at:
+            link, seen = next(iter(self.seen_at.items()))
+            if len(self.seen_at) <= DAEMON_KNOWN_LINKS_MAX and (window_start is None or seen >= window_start):
+                break
+            del self.seen_at[link]
+            self.scraper.known_links.discard(link)
+            for current in self.current.values():
+                current.pop(link, None)
+    
+    def current_articles(self) -> List[Dict]:
+        """Articles courants des sources du dernier passage : les articles déjà vus restent présents en mode delta"""
+        return [article for name in self.polled for article in self.current.get(name, {}).values()]
+    
+    async def run_once(self, session: aiohttp.ClientSession) -> List[Dict]:
+        """Scrape toutes les sources arrivées à échéance"""
+        now = time.monotonic()
+        due = [name for name, state in self.schedule.items() if state["next_run"] <= now]
+        if not due:
+            return []
+        
+        self.forget_old_links()
+        # Le budget de PDFs arXiv vaut pour chaque passage
+        self.scraper.arxiv_pdf_budget = ARXIV_PDF_BUDGET
+        self.scraper.source_status = {}
+        self.scraper.metrics.reset()
+        self.scraper.stall_monitor.reset()
+        self.polled = due
+        results = await asyncio.gather(*[self.poll_source(session, name) for name in due])
+        
+        articles = []
+        for result in results:
+            articles.extend(result)
+        return self.scraper.deduplicate(articles)
+    
+    def get_schedule_report(self) -> Dict:
+        """Intervalles courants par source, pour le rapport de statut"""
+        return {
+            name: {"interval": int(state["interval"]), "rate_per_hour": round(state["rate"] * 3600, 2) if state["rate"] else 0}
+            for name, state in self.schedule.items()
+        }
+    
+    async def run(self):
+        """Boucle principale : la session HTTP reste ouverte entre les passages"""
+        import aiohttp
+        from main import save_outputs
+        
+        async with aiohttp.ClientSession(trace_configs=[self.scraper.metrics.trace_config()]) as session:
+            session = self.scraper.wrap_session(session)
+            self.scraper.stall_monitor.start()
+            while True:
+                articles = await self.run_once(session)
+                
+                if articles:
+                    print(f"\n✅ {len(articles)} nouveaux articles")
+                    status_report = self.scraper.get_status_report()
+                    status_report["schedule"] = self.get_schedule_report()
+                    save_outputs(articles, status_report, self.profiles, self.delta,
+                                 delta_articles=self.current_articles() if self.delta else None)
+                    self.scraper.hedger.history.save()
+                
+                next_run = min(state["next_run"] for state in self.schedule.values())
+                await asyncio.sleep(max(next_run - time.monotonic(), 1.0))
+
+async def run_daemon(args=None):
+    """Lance le daemon avec les options de main.py (--max-age, --arxiv-pdf, --hedge, --newsletters, --delta)"""
+    print("🚀 Démarrage du scraper en mode daemon...")
+    if args is None:
+        daemon = ScraperDaemon()
+    else:
+        from main import apply_scraper_options
+        from profiles import load_profiles
+        scraper = NewsletterScraper()
+        profiles = load_profiles(args.newsletters, scraper.get_source_names()) if args.newsletters else None
+        apply_scraper_options(scraper, args, profiles)
+        # Planning construit après le filtrage des sources par les profils
+        daemon = ScraperDaemon(scraper, profiles, args.delta)
+    await daemon.run()
+
+if __name__ == "__main__":
+    from main import parse_args
+    asyncio.run(run_daemon(parse_args()))
@@ -0,0 +1,219 @@
+"""Parser RSS/Atom incrémental avec arrêt anticipé
+
+Les entrées sont lues avec un parser XML incrémental et le parsing s'arrête
+dès que le nombre d'entrées voulu est atteint. Les entrées produites exposent
+les mêmes clés que celles de feedparser utilisées par le scraper ; feedparser
+n'est utilisé qu'en secours, pour les flux mal formés.
+
+Les dates sont normalisées dès le parsing (`published_ts`, timestamp UTC), ce
+qui permet d'écarter les entrées trop anciennes avant toute autre requête.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+CHUNK_SIZE = 64 * 1024
+
+# Date RFC 822 des pubDate ("Mon, 06 Jan 2025 14:00:00 GMT") : email.utils est tolérant au point
+# d'accepter d'autres formats en les interprétant mal, d'où ce filtre avant de l'utiliser
+RFC822_RE = re.compile(r"^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}")
+
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+
+class FeedEntry(dict):
+    """Dictionnaire avec accès par attribut, comme FeedParserDict"""
+    
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+class FeedEntries(list):
+    """Entrées retenues ; `skipped` compte celles écartées car trop anciennes"""
+    skipped = 0
+
+def parse_timestamp(value, local: bool = False) -> Optional[float]:
+    """Timestamp UTC d'une date (RFC 822, ISO 8601, sinon dateutil), ou None si elle est absente ou illisible
+    
+    Une date sans fuseau est lue en UTC, ou en heure locale avec `local` (dates écrites par le scraper avec datetime.now()).
+    """
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    value = value.strip()
+    parsed = None
+    if RFC822_RE.match(value):
+        # Format des pubDate RSS, le plus fréquent
+        import email.utils
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            pass
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                from dateutil import parser as date_parser
+                parsed = date_parser.parse(value)
+            except (ValueError, OverflowError, TypeError):
+                return None
+    if parsed.tzinfo is None and not local:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    # Sans fuseau, timestamp() lit la date en heure locale
+    return parsed.timestamp()
+
+def is_stale(entry, since: Optional[float]) -> bool:
+    """Entrée publiée avant `since` ; une entrée sans date lisible est conservée"""
+    return since is not None and entry.get("published_ts") is not None and entry["published_ts"] < since
+
+def _split_tag(tag: str):
+    if tag.startswith("{"):
+        namespace, local = tag[1:].split("}", 1)
+        return namespace, local
+    return "", tag
+
+def _text(element) -> str:
+    """Texte d'un élément ; le XHTML inline (Atom type="xhtml") est resérialisé"""
+    if len(element):
+        import xml.etree.ElementTree as ET
+        parts = [element.text or ""]
+        for child in element:
+            parts.append(ET.tostring(child, encoding="unicode"))
+        return "".join(parts).strip()
+    return (element.text or "").strip()
+
+def _rss_entry(item) -> FeedEntry:
+    entry = FeedEntry()
+    tags = []
+    guid = ""
+    for child in item:
+        namespace, local = _split_tag(child.tag)
+        if namespace == CONTENT_NS and local == "encoded":
+            entry.setdefault("content", []).append(FeedEntry(value=_text(child), type="text/html"))
+        elif namespace == DC_NS and local == "creator":
+            entry.setdefault("author", _text(child))
+        elif namespace == DC_NS and local == "date":
+            entry.setdefault("updated", _text(child))
+        elif namespace in ("", RSS1_NS):
+            if local == "title":
+                entry["title"] = _text(child)
+            elif local == "link":
+                entry["link"] = _text(child)
+            elif local == "description":
+                entry["summary"] = _text(child)
+            elif local == "pubDate":
+                entry["published"] = _text(child)
+                entry["updated"] = entry["published"]
+            elif local == "author":
+                entry["author"] = _text(child)
+            elif local == "category" and _text(child):
+                tags.append(FeedEntry(term=_text(child)))
+            elif local == "guid" and child.get("isPermaLink", "true") != "false":
+                guid = _text(child)
+    
+    if not entry.get("link") and guid:
+        entry["link"] = guid
+    if not entry.get("link") and item.get(RDF_ABOUT):
+        entry["link"] = item.get(RDF_ABOUT)
+    return _finish(entry, tags)
+
+def _atom_entry(item) -> FeedEntry:
+    entry = FeedEntry()
+    tags = []
+    for child in item:
+        namespace, local = _split_tag(child.tag)
+        if namespace != ATOM_NS:
+            continue
+        if local == "title":
+            entry["title"] = _text(child)
+        elif local == "link":
+            if child.get("rel", "alternate") == "alternate" and "link" not in entry:
+                entry["link"] = child.get("href", "")
+        elif local == "summary":
+            entry["summary"] = _text(child)
+        elif local == "content":
+            entry.setdefault("content", []).append(FeedEntry(value=_text(child), type=child.get("type", "text")))
+        elif local == "published":
+            entry["published"] = _text(child)
+        elif local == "updated":
+            entry["updated"] = _text(child)
+        elif local == "author":
+            name = child.find(f"{{{ATOM_NS}}}name")
+            if name is not None:
+                entry.setdefault("author", _text(name))
+        elif local == "category" and child.get("term"):
+            tags.append(FeedEntry(term=child.get("term")))
+    return _finish(entry, tags)
+
+def _finish(entry: FeedEntry, tags) -> FeedEntry:
+    # Comme feedparser : sans résumé (flux Blogger en Atom), le résumé est le premier contenu
+    if "summary" not in entry and entry.get("content"):
+        entry["summary"] = entry["content"][0]["value"]
+    if "summary" in entry:
+        entry["description"] = entry["summary"]
+        entry["summary_detail"] = FeedEntry(value=entry["summary"], type="text/html")
+    if entry.get("author"):
+        entry["author_detail"] = FeedEntry(name=entry["author"])
+    if tags:
+        entry["tags"] = tags
+    entry["published_ts"] = parse_timestamp(entry.get("published") or entry.get("updated"))
+    return entry
+
+def parse_entries_fast(data: Union[bytes, str], limit: int, since: Optional[float] = None) -> FeedEntries:
+    """Lit au plus `limit` entrées publiées après `since` ; lève ET.ParseError si le flux est mal formé avant d'y arriver"""
+    # xml.etree et email.utils ne sont chargés qu'au premier flux, pas au démarrage de main.py
+    import xml.etree.ElementTree as ET
+    parser = ET.XMLPullParser(events=("end",))
+    entries = FeedEntries()
+    
+    for start in range(0, len(data), CHUNK_SIZE):
+        parser.feed(data[start:start + CHUNK_SIZE])
+        for _, element in parser.read_events():
+            namespace, local = _split_tag(element.tag)
+            if local == "item" and namespace in ("", RSS1_NS):
+                entries.append(_rss_entry(element))
+            elif local == "entry" and namespace == ATOM_NS:
+                entries.append(_atom_entry(element))
+            else:
+                continue
+            element.clear()
+            if is_stale(entries[-1], since):
+                entries.pop()
+                entries.skipped += 1
+                continue
+            if len(entries) >= limit:
+                return entries
+    
+    parser.close()
+    return entries
+
+def parse_entries(data: Union[bytes, str], limit: int, since: Optional[float] = None) -> FeedEntries:
+    """Entrées d'un flux RSS/Atom publiées après `since` (timestamp), avec repli sur feedparser pour les flux mal formés"""
+    import xml.etree.ElementTree as ET
+    try:
+        entries = parse_entries_fast(data, limit, since)
+        if entries or entries.skipped:
+            return entries
+    except ET.ParseError:
+        pass
+    
+    import feedparser
+    entries = FeedEntries()
+    for entry in feedparser.parse(data).entries:
+        entry["published_ts"] = parse_timestamp(entry.get("published") or entry.get("updated"))
+        if is_stale(entry, since):
+            entries.skipped += 1
+            continue
+        entries.append(entry)
+        if len(entries) >= limit:
+            break
+    return entries
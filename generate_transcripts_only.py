@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 """Script pour générer uniquement les transcripts à partir de données existantes"""
 
-import json
 import os
 import sys
 from datetime import datetime
 from transcript_by_source import TranscriptBySource
 from transcript_generator import TranscriptGenerator
+from article import iter_articles_json
 
 def find_latest_data_file():
     """Trouve le fichier de données le plus récent"""
@@ -14,51 +14,64 @@ def find_latest_data_file():
     if not os.path.exists(data_dir):
         return None
     
-    files = [f for f in os.listdir(data_dir) if f.startswith("raw_articles_") and f.endswith(".json")]
-    if not files:
-        return None
-    
-    # Trier par date de modification
-    files.sort(key=lambda x: os.path.getmtime(os.path.join(data_dir, x)), reverse=True)
-    return os.path.join(data_dir, files[0])
+    # Le nom contient l'horodatage (raw_articles_AAAAMMJJ_HHMMSS.json) : le plus grand est le plus récent, sans stat
+    with os.scandir(data_dir) as entries:
+        latest = max((entry.name for entry in entries
+                      if entry.name.startswith("raw_articles_") and entry.name.endswith(".json")), default=None)
+    return os.path.join(data_dir, latest) if latest else None
 
-def main():
+def main(argv):
+    # --delta : seuls les articles nouveaux ou modifiés depuis la génération précédente
+    delta = "--delta" in argv
+    argv = [arg for arg in argv if arg != "--delta"]
+    
     # Trouver le fichier de données
-    if len(sys.argv) > 1:
-        data_file = sys.argv[1]
+    if argv:
+        data_file = argv[0]
     else:
         data_file = find_latest_data_file()
     
     if not data_file or not os.path.exists(data_file):
         print("❌ Aucun fichier de données trouvé.")
-        print("Usage: python generate_transcripts_only.py [fichier_json]")
+        print("Usage: python generate_transcripts_only.py [--profile] [--delta] [fichier_json]")
         return
     
-    print(f"📂 Chargement des données depuis: {data_file}")
-    
-    # Charger les articles
-    with open(data_file, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+    # Lecture en flux : le fichier est relu à chaque passe, les articles ne sont jamais tous en mémoire
+    print(f"📂 Lecture des données depuis: {data_file}")
     
-    print(f"✅ {len(articles)} articles chargés")
-    
-    # Générer les transcripts par source
+    # Générer les transcripts par source (relecture du fichier, article par article)
     print(f"\n📝 Génération des transcripts par source...")
     source_transcripts = TranscriptBySource()
-    saved_files = source_transcripts.save_transcripts_by_source(articles)
+    if delta:
+        manifest = source_transcripts.save_transcripts_delta(lambda: iter_articles_json(data_file))
+        saved_files = {source: info["file"] for source, info in manifest["sources"].items() if info["file"]}
+    else:
+        saved_files = source_transcripts.save_transcripts_streaming(lambda: iter_articles_json(data_file))
     
     print(f"\n✅ Transcripts générés pour {len(saved_files)} sources")
     
     # Optionnel: générer aussi la newsletter globale
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     generator = TranscriptGenerator()
-    transcript = generator.generate_transcript(articles)
+    transcript, count = generator.generate_transcript_streaming(lambda: iter_articles_json(data_file))
     
     transcript_file = f"transcripts/newsletter_{timestamp}.md"
     with open(transcript_file, 'w', encoding='utf-8') as f:
         f.write(transcript)
     
-    print(f"📄 Newsletter globale générée dans {transcript_file}")
+    print(f"📄 Newsletter globale ({count} articles) générée dans {transcript_file}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    argv = sys.argv[1:]
+    if "--profile" in argv:
+        argv.remove("--profile")
+        from profiler import SamplingProfiler, print_profile
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            main(argv)
+        finally:
+            profiler.stop()
+            print_profile(profiler)
+    else:
+        main(argv)
\ No newline at end of file
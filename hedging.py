@@ -0,0 +1,161 @@
+"""Requêtes de couverture pour les pages d'articles les plus lentes
+
+La latence de chaque page d'article est mémorisée par hôte d'un run à l'autre.
+Quand une requête dépasse le percentile HEDGE_PERCENTILE des latences de son hôte,
+une seconde tentative est lancée et la première réponse obtenue est gardée. Une
+seconde tentative perdante est annulée ; quand elle l'emporte, la requête initiale
+va à son terme pour que l'historique garde sa latence réelle. Le nombre de
+tentatives supplémentaires est plafonné à une fraction des requêtes du run, et des
+requêtes de chaque hôte, pour ne pas ajouter de charge aux sites déjà lents.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+from config import (HEDGE_PERCENTILE, HEDGE_BUDGET_FRACTION, HEDGE_HOST_BUDGET_FRACTION, HEDGE_MIN_SAMPLES,
+                    HEDGE_DEFAULT_DELAY, HEDGE_MIN_DELAY, HEDGE_HISTORY_SAMPLES)
+
+T = TypeVar("T")
+
+class HostLatencyHistory:
+    """Dernières latences observées par hôte (en secondes)"""
+    
+    def __init__(self, path: str = None):
+        self.path = path
+        self.samples: Dict[str, List[float]] = {}
+    
+    @classmethod
+    def load(cls, path: str) -> "HostLatencyHistory":
+        history = cls(path)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    history.samples = json.load(f)
+            except (OSError, ValueError):
+                pass
+        return history
+    
+    def save(self):
+        if not self.path:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.samples, f, ensure_ascii=False)
+    
+    def add(self, host: str, latency: float):
+        samples = self.samples.setdefault(host, [])
+        samples.append(round(latency, 3))
+        del samples[:-HEDGE_HISTORY_SAMPLES]
+    
+    def percentile(self, host: str, fraction: float) -> Optional[float]:
+        """Percentile des latences de l'hôte, ou de tous les hôtes s'il est trop peu connu (None sans historique)"""
+        samples = self.samples.get(host, [])
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            samples = [latency for host_samples in self.samples.values() for latency in host_samples]
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+class Hedger:
+    """Exécute les requêtes de pages en mesurant leur latence, avec une seconde tentative si `enabled`"""
+    
+    def __init__(self, history: Optional[HostLatencyHistory] = None, enabled: bool = False):
+        self.history = history if history is not None else HostLatencyHistory()
+        self.enabled = enabled
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self.budget_denied = 0
+        self.by_host = defaultdict(lambda: {"requests": 0, "hedged": 0, "wins": 0})
+    
+    def hedge_delay(self, host: str) -> float:
+        """Délai avant la seconde tentative : percentile de l'historique, borné par HEDGE_MIN_DELAY"""
+        latency = self.history.percentile(host, HEDGE_PERCENTILE)
+        return max(latency if latency is not None else HEDGE_DEFAULT_DELAY, HEDGE_MIN_DELAY)
+    
+    def take_budget(self, host: str) -> bool:
+        """Une tentative supplémentaire est permise tant qu'elles restent sous HEDGE_BUDGET_FRACTION des requêtes
+        du run et sous HEDGE_HOST_BUDGET_FRACTION de celles de l'hôte (une au moins par hôte)"""
+        stats = self.by_host[host]
+        if (self.hedged + 1 > HEDGE_BUDGET_FRACTION * self.requests
+                or stats["hedged"] + 1 > max(HEDGE_HOST_BUDGET_FRACTION * stats["requests"], 1)):
+            self.budget_denied += 1
+            return False
+        return True
+    
+    def _record_primary(self, host: str, started: float, primary: asyncio.Future):
+        """Requête initiale terminée après la victoire de la couverture : sa latence complète va dans l'historique"""
+        if not primary.cancelled():
+            primary.exception()
+        self.history.add(host, time.perf_counter() - started)
+    
+    async def run(self, url: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Exécute attempt() ; relance une seconde fois si la réponse tarde, et garde la première réponse réussie"""
+        host = urlparse(url).netloc
+        self.requests += 1
+        self.by_host[host]["requests"] += 1
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(attempt())
+        tasks = [primary]
+        try:
+            if not self.enabled:
+                return await primary
+            
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(host))
+            if done or not self.take_budget(host):
+                return await primary
+            
+            # La tâche copie le contexte : la seconde tentative reste attribuée à la source et à l'article
+            hedge = asyncio.ensure_future(attempt())
+            tasks.append(hedge)
+            self.hedged += 1
+            self.by_host[host]["hedged"] += 1
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.wins += 1
+                            self.by_host[host]["wins"] += 1
+                            if not primary.done():
+                                # Sa latence est mesurée jusqu'au bout plutôt que coupée à la réponse de la couverture
+                                tasks.remove(primary)
+                                primary.add_done_callback(lambda task: self._record_primary(host, started, task))
+                        return task.result()
+            # Les deux tentatives ont échoué
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Exception de la tentative perdante : marquée comme lue
+                    task.exception()
+            if primary in tasks:
+                # Latence de la requête initiale (ou des deux tentatives en échec)
+                self.history.add(host, time.perf_counter() - started)
+    
+    def report(self) -> Optional[Dict]:
+        """Statistiques de couverture du run (None si désactivée)"""
+        if not self.enabled:
+            return None
+        return {
+            "percentile": HEDGE_PERCENTILE,
+            "budget_fraction": HEDGE_BUDGET_FRACTION,
+            "host_budget_fraction": HEDGE_HOST_BUDGET_FRACTION,
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "wins": self.wins,
+            "hit_rate": round(self.wins / self.hedged, 3) if self.hedged else 0.0,
+            "budget_denied": self.budget_denied,
+            "hosts": {
+                host: dict(stats, delay_s=round(self.hedge_delay(host), 3))
+                for host, stats in sorted(self.by_host.items())
+            }
+        }
\ No newline at end of file
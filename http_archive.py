@@ -0,0 +1,137 @@
+"""Archive HTTP pour enregistrer un run puis le rejouer sans réseau
+
+En mode enregistrement, chaque échange fait via la session du scraper est
+capturé (statut, en-têtes utiles, corps) ; en mode rejeu, NewsletterScraper,
+ContentExtractor et PDFExtractor sont servis uniquement depuis l'archive.
+
+L'archive est un fichier zip : un index JSON et les corps dédupliqués par hash.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional
+
+# En-têtes conservés dans l'archive (les autres n'ont pas d'effet sur le scraper)
+KEPT_HEADERS = ["Content-Type", "ETag", "Last-Modified"]
+
+class ArchiveMiss(Exception):
+    """Requête absente de l'archive en mode rejeu"""
+
+class ArchivedResponse:
+    """Réponse servie depuis l'archive, avec l'API utilisée par le scraper"""
+    
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, encoding: Optional[str]):
+        from multidict import CIMultiDict
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self._body = body
+        self._encoding = encoding or "utf-8"
+    
+    async def read(self) -> bytes:
+        return self._body
+    
+    async def text(self, encoding: Optional[str] = None, errors: str = "replace") -> str:
+        return self._body.decode(encoding or self._encoding, errors)
+    
+    async def json(self, **kwargs):
+        return json.loads(await self.text())
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+class HttpArchive:
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, List[Dict]] = {}
+        self.bodies: Dict[str, bytes] = {}
+        self._replay_positions: Dict[str, int] = {}
+    
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+    
+    def add(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes, encoding: Optional[str]):
+        # hashlib et zipfile ne sont importés qu'en enregistrement ou en rejeu, pas au démarrage de main.py
+        import hashlib
+        digest = hashlib.sha1(body).hexdigest()
+        self.bodies[digest] = body
+        self.entries.setdefault(self.key(method, url), []).append({
+            "status": status,
+            "headers": headers,
+            "body": digest,
+            "encoding": encoding
+        })
+    
+    def lookup(self, method: str, url: str) -> ArchivedResponse:
+        """Réponse enregistrée pour une requête ; les appels répétés rejouent les réponses dans l'ordre"""
+        key = self.key(method, url)
+        responses = self.entries.get(key)
+        if not responses:
+            raise ArchiveMiss(f"Absent de l'archive: {key}")
+        
+        position = self._replay_positions.get(key, 0)
+        self._replay_positions[key] = position + 1
+        entry = responses[min(position, len(responses) - 1)]
+        return ArchivedResponse(url, entry["status"], entry["headers"], self.bodies[entry["body"]], entry["encoding"])
+    
+    def save(self):
+        import zipfile
+        with zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("index.json", json.dumps(self.entries, ensure_ascii=False))
+            for digest, body in self.bodies.items():
+                archive.writestr(f"bodies/{digest}", body)
+        print(f"🗄 Archive HTTP sauvegardée dans {self.path} ({len(self.entries)} requêtes)")
+    
+    @classmethod
+    def load(cls, path: str) -> "HttpArchive":
+        import zipfile
+        archive = cls(path)
+        with zipfile.ZipFile(path, "r") as zf:
+            archive.entries = json.loads(zf.read("index.json"))
+            for name in zf.namelist():
+                if name.startswith("bodies/"):
+                    archive.bodies[name[len("bodies/"):]] = zf.read(name)
+        return archive
+
+class _RecordingRequest:
+    def __init__(self, session, archive: HttpArchive, method: str, url: str, kwargs):
+        self.session = session
+        self.archive = archive
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+    
+    async def __aenter__(self) -> ArchivedResponse:
+        async with self.session.request(self.method, self.url, **self.kwargs) as response:
+            body = await response.read()
+            headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+            encoding = response.charset
+            self.archive.add(self.method, self.url, response.status, headers, body, encoding)
+            return ArchivedResponse(self.url, response.status, headers, body, encoding)
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+class RecordingSession:
+    """Session qui effectue les requêtes réelles et les enregistre dans l'archive"""
+    
+    def __init__(self, session, archive: HttpArchive):
+        self.session = session
+        self.archive = archive
+    
+    def get(self, url: str, **kwargs) -> _RecordingRequest:
+        return _RecordingRequest(self.session, self.archive, "GET", str(url), kwargs)
+
+class ReplaySession:
+    """Session qui sert toutes les requêtes depuis l'archive, sans réseau"""
+    
+    def __init__(self, archive: HttpArchive):
+        self.archive = archive
+    
+    def get(self, url: str, **kwargs) -> ArchivedResponse:
+        return self.archive.lookup("GET", str(url))
@@ -0,0 +1,144 @@
+"""Détection des blocages de la boucle asyncio (parsing, extraction) et attribution à la source en cours"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from contextlib import suppress
+from typing import Dict, List
+from metrics import current_source, current_article
+from profiler import LOOP_STEP_FRAME, frame_label
+from config import LOOP_STALL_THRESHOLD, LOOP_MONITOR_INTERVAL, LOOP_STALL_REPORT_TOP
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def describe_stall(frame) -> Dict:
+    """Source, URL et fonction du callback qui occupe la boucle.
+    
+    Le contexte du callback (contextvars de la tâche) est lu sur le Handle en cours d'exécution,
+    ce qui donne la source et l'article même depuis un autre thread.
+    """
+    stall = {"source": None, "url": None, "function": None}
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    if not frames:
+        return stall
+    
+    for frame in frames:
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) == LOOP_STEP_FRAME:
+            context = getattr(frame.f_locals.get("self"), "_context", None)
+            if context is not None:
+                stall["source"] = context.get(current_source)
+                stall["url"] = context.get(current_article)
+            break
+    
+    # Fonction du projet la plus profonde (sinon la frame la plus profonde)
+    project = [f for f in frames if os.path.dirname(os.path.abspath(f.f_code.co_filename)) == PROJECT_DIR]
+    stall["function"] = frame_label((project or frames)[0].f_code)
+    return stall
+
+class LoopStallMonitor:
+    """Battement de cœur dans la boucle + watchdog dans un thread.
+    
+    Le battement mesure le retard de la boucle ; pendant un blocage, le watchdog capture la pile
+    du thread de la boucle pour savoir quelle source et quelle URL étaient en cours.
+    """
+    
+    def __init__(self, threshold: float = LOOP_STALL_THRESHOLD, interval: float = LOOP_MONITOR_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = []
+        self._lock = threading.Lock()
+        self._beat = 0.0
+        self._open = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._loop_thread = None
+    
+    def reset(self):
+        with self._lock:
+            self.stalls = []
+    
+    def start(self):
+        """Démarre la surveillance (à appeler depuis la boucle surveillée)"""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._open = None
+        self._stop.clear()
+        self._task = asyncio.ensure_future(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-stall-watchdog", daemon=True)
+        self._thread.start()
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._thread = None
+    
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = now - before - self.interval
+            with self._lock:
+                self._beat = now
+                stall, self._open = self._open, None
+                if lag < self.threshold:
+                    continue
+                if stall is None:
+                    stall = {"source": None, "url": None, "function": None}
+                stall["duration"] = round(lag, 3)
+                self.stalls.append(stall)
+            
+            where = ", ".join(part for part in (stall["source"], stall["url"]) if part) or "source inconnue"
+            print(f"⚠️ Boucle asyncio bloquée {lag * 1000:.0f} ms ({where})")
+    
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                beat = self._beat
+                if self._open is not None or time.monotonic() - beat < self.threshold + self.interval:
+                    continue
+            
+            stall = describe_stall(sys._current_frames().get(self._loop_thread))
+            with self._lock:
+                # Le battement a pu reprendre pendant la capture : ce n'est plus le même blocage
+                if self._beat == beat and self._open is None:
+                    self._open = stall
+    
+    def for_source(self, name: str) -> List[Dict]:
+        with self._lock:
+            return [stall for stall in self.stalls if stall["source"] == name]
+    
+    def report(self, top: int = LOOP_STALL_REPORT_TOP) -> Dict:
+        """Résumé des blocages du run pour le rapport de statut"""
+        with self._lock:
+            stalls = list(self.stalls)
+        
+        by_source = {}
+        for stall in stalls:
+            entry = by_source.setdefault(stall["source"] or "(inconnue)", {"count": 0, "total_s": 0.0})
+            entry["count"] += 1
+            entry["total_s"] = round(entry["total_s"] + stall["duration"], 3)
+        
+        return {
+            "threshold_ms": int(self.threshold * 1000),
+            "count": len(stalls),
+            "total_s": round(sum(stall["duration"] for stall in stalls), 3),
+            "max_s": max((stall["duration"] for stall in stalls), default=0.0),
+            "by_source": by_source,
+            "worst": sorted(stalls, key=lambda stall: stall["duration"], reverse=True)[:top]
+        }
\ No newline at end of file
@@ -1,49 +1,63 @@
+from __future__ import annotations
+
+import argparse
 import asyncio
 import json
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, TYPE_CHECKING
 from scraper import NewsletterScraper
 from transcript_by_source import TranscriptBySource
+from metrics import timings_to_prometheus
+from article import Article, write_articles_json
+from scheduling import SourceHistory
+from config import SOURCE_HISTORY_FILE, HOST_LATENCY_FILE
 
-async def main():
-    scraper = NewsletterScraper()
-    
-    print("🚀 Démarrage du scraping des actualités IA...")
-    articles = await scraper.scrape_all_sources()
-    
-    print(f"\n✅ {len(articles)} articles récupérés (après dédupplication)")
-    
-    # Rapport de statut
-    status_report = scraper.get_status_report()
-    print(f"\n📊 Rapport de statut:")
-    print(f"   - Sources totales: {status_report['total_sources']}")
-    print(f"   - Sources réussies: {status_report['successful']}")
-    print(f"   - Sources échouées: {status_report['failed']}")
-    print(f"   - Articles totaux (avant dédupplication): {status_report['total_articles']}")
-    
-    if status_report['failed'] > 0:
-        print(f"\n❌ Sources en erreur:")
-        for source, info in status_report['sources'].items():
-            if info['status'] == 'failed':
-                print(f"   - {source}: {info['error']}")
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"data/raw_articles_{timestamp}.json"
-    
-    # Nettoyer les articles des caractères problématiques avant la sauvegarde
+# Archives HTTP, points de reprise et profils sont importés là où ils servent, pour le démarrage (bench_startup.py)
+if TYPE_CHECKING:
+    from checkpoint import RunCheckpoint
+
+# Options du run enregistrées avec ses points de reprise et réappliquées par --resume
+RESUME_OPTIONS = ("newsletters", "max_age", "arxiv_pdf", "hedge", "delta", "workers")
+
+# Options gérées par le scraper d'un seul processus, pas par les workers de sharding.py
+SINGLE_PROCESS_OPTIONS = ("record", "replay", "hedge", "deadline")
+
+# Options d'un run unique que le daemon (run_daemon) n'applique pas
+RUN_ONLY_OPTIONS = ("deadline", "record", "replay", "resume")
+
+def clean_articles(articles: List[Dict]) -> List[Article]:
+    """Nettoie les articles des caractères problématiques avant la sauvegarde (Article modifié sur place)"""
     cleaned_articles = []
     for article in articles:
-        cleaned_article = {}
-        for key, value in article.items():
+        article = Article.from_dict(article)
+        for key, value in list(article.items()):
             if isinstance(value, str):
                 # Supprimer les surrogates Unicode invalides
-                value = value.encode('utf-8', 'surrogatepass').decode('utf-8', 'replace')
-                value = re.sub(r'[\ud800-\udfff]', '', value)
-            cleaned_article[key] = value
-        cleaned_articles.append(cleaned_article)
+                cleaned = value.encode('utf-8', 'surrogatepass').decode('utf-8', 'replace')
+                cleaned = re.sub(r'[\ud800-\udfff]', '', cleaned)
+                # Champ réécrit seulement s'il change : un contenu déjà sur disque n'y est pas recopié
+                if cleaned != value:
+                    article[key] = cleaned
+        cleaned_articles.append(article)
+    return cleaned_articles
+
+def save_outputs(articles: List[Dict], status_report: Dict, profiles: Optional[Dict] = None, delta: bool = False,
+                 timestamp: Optional[str] = None, delta_articles: Optional[List[Dict]] = None) -> List[Dict]:
+    """Sauvegarde les articles, le rapport de statut et les transcripts par source (ou ceux de chaque profil)
+    
+    En mode delta, seuls les articles nouveaux ou modifiés depuis le run précédent sont écrits.
+    Ils sont comparés à `delta_articles` si fourni : le daemon n'a que les nouveaux articles de
+    chaque passage et y passe l'ensemble courant de ses sources, pour ne pas marquer les autres retirés.
+    Les fichiers sont horodatés par `timestamp` (identifiant du run), par défaut l'heure courante.
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"data/raw_articles_{timestamp}.json"
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_articles, f, ensure_ascii=False, indent=2)
+    cleaned_articles = clean_articles(articles)
+    
+    # Écriture article par article : les contenus déplacés sur disque ne sont relus qu'un à la fois
+    write_articles_json(output_file, cleaned_articles)
     
     print(f"📁 Articles sauvegardés dans {output_file}")
     
@@ -54,12 +68,239 @@ async def main():
     
     print(f"📊 Rapport de statut sauvegardé dans {status_file}")
     
+    # Exporter les mesures de temps au format Prometheus
+    if status_report.get("timings"):
+        metrics_file = f"data/metrics_{timestamp}.prom"
+        with open(metrics_file, 'w', encoding='utf-8') as f:
+            f.write(timings_to_prometheus(status_report["timings"]))
+        print(f"⏱ Mesures de temps sauvegardées dans {metrics_file}")
+    
+    compared_articles = clean_articles(delta_articles) if delta and delta_articles is not None else cleaned_articles
+    
+    if profiles:
+        # Un seul passage de scraping réparti entre les newsletters demandées
+        from profiles import render_profiles
+        from source_registry import load_source_registry, source_labels
+        render_profiles(profiles, compared_articles, source_labels(load_source_registry()), delta=delta)
+        return cleaned_articles
+    
+    if delta:
+        print(f"\n📂 Génération des transcripts delta par source...")
+        TranscriptBySource().save_transcripts_delta(lambda: compared_articles)
+        return cleaned_articles
+    
     # Générer les transcripts par source (utiliser les articles nettoyés)
     print(f"\n📂 Génération des transcripts par source...")
     source_transcripts = TranscriptBySource()
     saved_files = source_transcripts.save_transcripts_by_source(cleaned_articles)
     
     print(f"\n✅ Transcripts générés pour {len(saved_files)} sources")
+    
+    return cleaned_articles
+
+def apply_scraper_options(scraper: NewsletterScraper, args, profiles: Optional[Dict] = None):
+    """Options de la ligne de commande communes au run unique et au mode daemon"""
+    from hedging import HostLatencyHistory
+    scraper.hedger.history = HostLatencyHistory.load(HOST_LATENCY_FILE)
+    
+    if args.hedge:
+        scraper.hedger.enabled = True
+        print("🪁 Requêtes de couverture activées pour les pages d'articles lentes")
+    
+    if profiles:
+        # Union des sources des profils, chacune récupérée une seule fois
+        from profiles import union_sources, fetch_limit
+        scraper.enabled_sources = set(union_sources(profiles))
+        scraper.articles_per_source = fetch_limit(profiles)
+        print(f"📬 Profils {', '.join(profiles)}: {len(scraper.enabled_sources)} sources")
+    
+    if args.arxiv_pdf:
+        scraper.arxiv_pdf = True
+        print(f"📄 arXiv : PDFs complets (au plus {scraper.arxiv_pdf_budget} par run)")
+    
+    if args.max_age is not None:
+        scraper.max_age_hours = args.max_age
+        print(f"🗓 Articles publiés depuis moins de {args.max_age:g}h uniquement")
+
+async def scrape(args, profiles: Optional[Dict] = None, checkpoint: Optional[RunCheckpoint] = None):
+    """Scrape toutes les sources dans ce processus ; retourne les articles et le rapport de statut"""
+    scraper = NewsletterScraper()
+    scraper.checkpoint = checkpoint
+    scraper.history = SourceHistory.load(SOURCE_HISTORY_FILE)
+    apply_scraper_options(scraper, args, profiles)
+    
+    if args.deadline is not None:
+        scraper.set_time_budget(args.deadline)
+        print(f"⏰ Budget de temps: {args.deadline:.0f}s")
+    
+    if args.record or args.replay:
+        from http_archive import HttpArchive
+    if args.record:
+        scraper.http_archive = HttpArchive(args.record)
+        scraper.archive_mode = "record"
+    elif args.replay:
+        scraper.http_archive = HttpArchive.load(args.replay)
+        scraper.archive_mode = "replay"
+        print(f"🗄 Rejeu depuis l'archive {args.replay} (aucune requête réseau)")
+    
+    print("🚀 Démarrage du scraping des actualités IA...")
+    articles = await scraper.scrape_all_sources()
+    
+    if args.record:
+        scraper.http_archive.save()
+    
+    # Mémoriser les durées par source pour l'ordonnancement des prochains runs
+    status_report = scraper.get_status_report()
+    scraper.history.update(status_report["timings"])
+    scraper.history.save()
+    scraper.hedger.history.save()
+    
+    return articles, status_report
+
+def open_checkpoint(args) -> RunCheckpoint:
+    """Points de reprise d'un nouveau run, ou ceux du run à reprendre (dont les options remplacent celles de `args`)"""
+    from checkpoint import RunCheckpoint
+    if not args.resume:
+        checkpoint = RunCheckpoint.create({option: getattr(args, option) for option in RESUME_OPTIONS})
+        print(f"🔖 Points de reprise dans {checkpoint.path} (en cas d'interruption: --resume {checkpoint.run_id})")
+        return checkpoint
+    
+    checkpoint = RunCheckpoint.load(args.resume)
+    for option, value in checkpoint.options.items():
+        setattr(args, option, value)
+    if unsupported_with_workers(args):
+        raise ValueError(f"Le run {args.resume} utilise --workers: {', '.join(unsupported_with_workers(args))} non disponibles")
+    restored = sum(len(articles) for articles in checkpoint.articles.values())
+    print(f"↻ Reprise du run {checkpoint.run_id}: {len(checkpoint.sources)} sources terminées, "
+          f"{restored} articles déjà traités")
+    return checkpoint
+
+async def main(args):
+    checkpoint = open_checkpoint(args)
+    profiles = None
+    if args.newsletters:
+        from profiles import load_profiles
+        profiles = load_profiles(args.newsletters, NewsletterScraper().get_source_names())
+    
+    if args.workers > 1:
+        from sharding import run_local_shards
+        from profiles import union_sources, fetch_limit
+        sources = union_sources(profiles) if profiles else None
+        articles_per_source = fetch_limit(profiles) if profiles else None
+        articles, status_report = await asyncio.to_thread(run_local_shards, args.workers, max_age_hours=args.max_age,
+                                                          sources=sources, articles_per_source=articles_per_source,
+                                                          arxiv_pdf=args.arxiv_pdf, run_id=checkpoint.run_id)
+        # Durées des sources mesurées par les workers, pour l'ordonnancement des prochains runs
+        history = SourceHistory.load(SOURCE_HISTORY_FILE)
+        history.update(status_report["timings"])
+        history.save()
+    else:
+        articles, status_report = await scrape(args, profiles, checkpoint)
+    
+    print(f"\n✅ {len(articles)} articles récupérés (après dédupplication)")
+    
+    # Rapport de statut
+    print(f"\n📊 Rapport de statut:")
+    print(f"   - Sources totales: {status_report['total_sources']}")
+    print(f"   - Sources réussies: {status_report['successful']}")
+    print(f"   - Sources échouées: {status_report['failed']}")
+    print(f"   - Articles totaux (avant dédupplication): {status_report['total_articles']}")
+    
+    if status_report.get('degradation') and status_report['degradation']['level'] > 0:
+        degradation = status_report['degradation']
+        print(f"\n⏰ Mode dégradé (niveau {degradation['level']}):")
+        print(f"   - Extractions complètes ignorées: {degradation['full_content_skipped']}")
+        if degradation['cancelled_sources']:
+            print(f"   - Sources annulées: {', '.join(degradation['cancelled_sources'])}")
+    
+    stalls = status_report.get('stalls')
+    if stalls and stalls['count']:
+        print(f"\n🐢 Boucle asyncio bloquée {stalls['count']} fois (> {stalls['threshold_ms']} ms, {stalls['total_s']}s au total):")
+        for source, info in sorted(stalls['by_source'].items(), key=lambda item: item[1]['total_s'], reverse=True):
+            print(f"   - {source}: {info['count']} blocages, {info['total_s']}s")
+    
+    hedging = status_report.get('hedging')
+    if hedging and hedging['hedged']:
+        print(f"\n🪁 Requêtes de couverture: {hedging['hedged']} sur {hedging['requests']} pages, "
+              f"{hedging['wins']} plus rapides que la requête initiale ({hedging['hit_rate']:.0%})")
+    
+    if status_report['failed'] > 0:
+        print(f"\n❌ Sources en erreur:")
+        for source, info in status_report['sources'].items():
+            if info['status'] == 'failed':
+                print(f"   - {source}: {info['error']}")
+    
+    save_outputs(articles, status_report, profiles, args.delta, timestamp=checkpoint.run_id)
+    # Sorties écrites : le run n'a plus besoin d'être repris
+    checkpoint.remove()
+
+def parse_deadline(value: str) -> float:
+    """Budget en secondes, ou heure limite HH:MM (aujourd'hui, ou demain si déjà passée)"""
+    if ":" not in value:
+        return float(value)
+    
+    hours, minutes = (int(part) for part in value.split(":"))
+    now = datetime.now()
+    deadline = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return (deadline - now).total_seconds()
+
+def unsupported_with_workers(args) -> List[str]:
+    """Options demandées qui ne sont pas transmises aux workers (--workers > 1)"""
+    if args.workers <= 1:
+        return []
+    return [f"--{option}" for option in SINGLE_PROCESS_OPTIONS if getattr(args, option) not in (None, False)]
+
+def unsupported_with_daemon(args) -> List[str]:
+    """Options demandées qui ne sont pas appliquées en mode daemon (--daemon)"""
+    if not args.daemon:
+        return []
+    unsupported = [f"--{option}" for option in RUN_ONLY_OPTIONS if getattr(args, option) not in (None, False)]
+    if args.workers > 1:
+        unsupported.append("--workers")
+    return unsupported
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping des actualités IA")
+    parser.add_argument("--daemon", action="store_true", help="scraping continu avec polling adaptatif par source")
+    parser.add_argument("--deadline", type=parse_deadline, help="budget de temps total en secondes, ou heure limite HH:MM")
+    parser.add_argument("--max-age", type=float, metavar="HEURES", help="ignore les articles publiés il y a plus de HEURES heures")
+    parser.add_argument("--arxiv-pdf", action="store_true", help="extrait aussi le PDF complet des papers arXiv (budget ARXIV_PDF_BUDGET)")
+    parser.add_argument("--hedge", action="store_true", help="relance les pages d'articles qui dépassent le p95 de latence de leur hôte")
+    parser.add_argument("--newsletters", metavar="PROFILS", help="profils de newsletters de config.py, séparés par des virgules (ou all)")
+    parser.add_argument("--delta", action="store_true", help="transcripts limités aux articles nouveaux ou modifiés depuis le run précédent")
+    parser.add_argument("--workers", type=int, default=1, help="répartit les sources sur N processus (voir sharding.py)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="reprend un run interrompu à partir de ses points de reprise (mêmes options)")
+    parser.add_argument("--profile", action="store_true", help="profil par échantillonnage (piles repliées pour flamegraph + top des fonctions)")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="ARCHIVE", help="enregistre tous les échanges HTTP dans une archive")
+    archive.add_argument("--replay", metavar="ARCHIVE", help="rejoue une archive HTTP sans accès réseau")
+    args = parser.parse_args(argv)
+    if unsupported_with_workers(args):
+        parser.error(f"{', '.join(unsupported_with_workers(args))} non disponible(s) avec --workers")
+    if unsupported_with_daemon(args):
+        parser.error(f"{', '.join(unsupported_with_daemon(args))} non disponible(s) avec --daemon")
+    return args
+
+def run(args):
+    if args.daemon:
+        from daemon import run_daemon
+        asyncio.run(run_daemon(args))
+    else:
+        asyncio.run(main(args))
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    if args.profile:
+        from profiler import SamplingProfiler, print_profile
+        # Le profil est écrit même si le run est interrompu (Ctrl+C en mode daemon)
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            run(args)
+        finally:
+            profiler.stop()
+            print_profile(profiler)
+    else:
+        run(args)
@@ -3,6 +3,7 @@
 
 import os
 import sys
+import json
 from datetime import datetime
 from collections import defaultdict
 import re
@@ -10,6 +11,7 @@ import re
 class TranscriptMerger:
     def __init__(self, transcripts_dir="transcripts"):
         self.transcripts_dir = transcripts_dir
+        self.cache_dir = os.path.join(transcripts_dir, ".merge_cache")
         
     def find_latest_transcripts(self):
         """Trouve les transcripts les plus récents pour chaque source"""
@@ -19,7 +21,7 @@ class TranscriptMerger:
         for source_dir in os.listdir(self.transcripts_dir):
             source_path = os.path.join(self.transcripts_dir, source_dir)
             
-            if os.path.isdir(source_path) and source_dir not in ['.', '..']:
+            if os.path.isdir(source_path) and not source_dir.startswith('.'):
                 # Lister tous les fichiers transcript dans ce dossier
                 for filename in os.listdir(source_path):
                     if filename.startswith("transcript_") and filename.endswith(".txt"):
@@ -44,8 +46,106 @@ class TranscriptMerger:
         
         return latest_files
     
-    def merge_transcripts(self, transcript_files=None, output_file=None):
-        """Fusionne tous les transcripts en un seul fichier"""
+    def build_source_section(self, source, filepath):
+        """Construit la section fusionnée d'une source et compte ses articles"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Compter les articles
+        article_count = len(re.findall(r'### ARTICLE \d+/\d+ ###', content))
+        
+        # Ajouter un séparateur de source
+        section = []
+        section.append("\n" + "#" * 100)
+        section.append(f"### SOURCE: {source.upper()} ###")
+        section.append("#" * 100 + "\n")
+        
+        # Ajouter le contenu (sans le header/footer original)
+        lines = content.split('\n')
+        start_idx = 0
+        end_idx = len(lines)
+        
+        # Trouver le début du contenu (après le header)
+        for i, line in enumerate(lines):
+            if "### ARTICLE 1/" in line:
+                start_idx = i
+                break
+        
+        # Trouver la fin du contenu (avant le footer)
+        for i in range(len(lines)-1, -1, -1):
+            if lines[i].startswith("FIN DU TRANSCRIPT"):
+                end_idx = i - 1
+                break
+        
+        # Ajouter le contenu
+        section.extend(lines[start_idx:end_idx])
+        
+        return '\n'.join(section), article_count
+    
+    def load_cache(self):
+        """Charge le manifeste des sections déjà fusionnées"""
+        manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_cache(self, cache):
+        """Sauvegarde le manifeste des sections fusionnées"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+    
+    def prune_cache(self, cache, transcript_files):
+        """Retire du cache les sources dont le transcript n'est plus parmi les fichiers fusionnés (supprimé, renommé)"""
+        for source in list(cache):
+            if transcript_files.get(source) != cache[source].get('path'):
+                del cache[source]
+                section_path = os.path.join(self.cache_dir, f"{source}.section.txt")
+                if os.path.exists(section_path):
+                    os.remove(section_path)
+    
+    def get_cached_section(self, source, filepath, cache):
+        """Retourne la section d'une source depuis le cache, ou la reconstruit si le transcript a changé"""
+        stat = os.stat(filepath)
+        entry = cache.get(source)
+        section_path = os.path.join(self.cache_dir, f"{source}.section.txt")
+        
+        if (entry and entry.get('path') == filepath
+                and entry.get('mtime') == stat.st_mtime
+                and entry.get('size') == stat.st_size
+                and os.path.exists(section_path)):
+            print(f"  ↺ {source}: section en cache")
+            with open(section_path, 'r', encoding='utf-8') as f:
+                return f.read(), entry['article_count']
+        
+        print(f"  ✓ Lecture de {source}...")
+        section, article_count = self.build_source_section(source, filepath)
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(section_path, 'w', encoding='utf-8') as f:
+            f.write(section)
+        
+        cache[source] = {
+            'path': filepath,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'article_count': article_count
+        }
+        return section, article_count
+    
+    def merge_transcripts(self, transcript_files=None, output_file=None, incremental=False):
+        """Fusionne tous les transcripts en un seul fichier
+        
+        En mode incrémental, les sections par source sont conservées dans
+        le cache et seules celles dont le transcript a changé sont reconstruites.
+        """
         if transcript_files is None:
             transcript_files = self.find_latest_transcripts()
         
@@ -59,6 +159,8 @@ class TranscriptMerger:
         
         print(f"📄 Fusion de {len(transcript_files)} transcripts...")
         
+        cache = self.load_cache() if incremental else None
+        
         # Header du document fusionné
         merged_content = []
         merged_content.append("=" * 100)
@@ -81,45 +183,24 @@ class TranscriptMerger:
         # Fusionner chaque transcript
         for source in sorted(transcript_files.keys()):
             filepath = transcript_files[source]
-            print(f"  ✓ Lecture de {source}...")
             
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Compter les articles
-                article_count = len(re.findall(r'### ARTICLE \d+/\d+ ###', content))
-                total_articles += article_count
-                articles_by_source[source] = article_count
-                
-                # Ajouter un séparateur de source
-                merged_content.append("\n" + "#" * 100)
-                merged_content.append(f"### SOURCE: {source.upper()} ###")
-                merged_content.append("#" * 100 + "\n")
-                
-                # Ajouter le contenu (sans le header/footer original)
-                lines = content.split('\n')
-                start_idx = 0
-                end_idx = len(lines)
-                
-                # Trouver le début du contenu (après le header)
-                for i, line in enumerate(lines):
-                    if "### ARTICLE 1/" in line:
-                        start_idx = i
-                        break
-                
-                # Trouver la fin du contenu (avant le footer)
-                for i in range(len(lines)-1, -1, -1):
-                    if lines[i].startswith("FIN DU TRANSCRIPT"):
-                        end_idx = i - 1
-                        break
-                
-                # Ajouter le contenu
-                merged_content.extend(lines[start_idx:end_idx])
-                
+                if incremental:
+                    section, article_count = self.get_cached_section(source, filepath, cache)
+                else:
+                    print(f"  ✓ Lecture de {source}...")
+                    section, article_count = self.build_source_section(source, filepath)
             except Exception as e:
                 print(f"  ✗ Erreur avec {source}: {str(e)}")
                 continue
+            
+            total_articles += article_count
+            articles_by_source[source] = article_count
+            merged_content.append(section)
+        
+        if incremental:
+            self.prune_cache(cache, transcript_files)
+            self.save_cache(cache)
         
         # Footer avec statistiques
         merged_content.append("\n\n" + "=" * 100)
@@ -145,21 +226,21 @@ class TranscriptMerger:
         
         return output_file
     
-    def merge_by_timestamp(self, timestamp_pattern):
+    def merge_by_timestamp(self, timestamp_pattern, incremental=False):
         """Fusionne tous les transcripts correspondant à un timestamp"""
         transcript_files = {}
         
         for source_dir in os.listdir(self.transcripts_dir):
             source_path = os.path.join(self.transcripts_dir, source_dir)
             
-            if os.path.isdir(source_path):
+            if os.path.isdir(source_path) and not source_dir.startswith('.'):
                 for filename in os.listdir(source_path):
                     if timestamp_pattern in filename and filename.endswith(".txt"):
                         transcript_files[source_dir] = os.path.join(source_path, filename)
         
         if transcript_files:
             output_file = os.path.join(self.transcripts_dir, f"merged_{timestamp_pattern}.txt")
-            return self.merge_transcripts(transcript_files, output_file)
+            return self.merge_transcripts(transcript_files, output_file, incremental=incremental)
         else:
             print(f"❌ Aucun transcript trouvé pour le timestamp: {timestamp_pattern}")
             return None
@@ -167,15 +248,19 @@ class TranscriptMerger:
 def main():
     merger = TranscriptMerger()
     
-    if len(sys.argv) > 1:
+    args = sys.argv[1:]
+    incremental = "--incremental" in args
+    args = [a for a in args if a != "--incremental"]
+    
+    if args:
         # Si un timestamp est fourni, fusionner les transcripts de ce timestamp
-        timestamp = sys.argv[1]
+        timestamp = args[0]
         print(f"🔍 Fusion des transcripts du timestamp: {timestamp}")
-        merger.merge_by_timestamp(timestamp)
+        merger.merge_by_timestamp(timestamp, incremental=incremental)
     else:
         # Sinon, fusionner les derniers transcripts de chaque source
         print("🔍 Fusion des derniers transcripts de chaque source...")
-        merger.merge_transcripts()
+        merger.merge_transcripts(incremental=incremental)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""Mesures de temps par source et par article (phases HTTP, parsing, extraction)"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Source et article en cours dans la tâche asyncio courante (chaque tâche a sa propre copie)
+current_source = contextvars.ContextVar("current_source", default=None)
+current_article = contextvars.ContextVar("current_article", default=None)
+
+# Phases mesurées, en secondes
+#   queue_wait : attente d'un slot de connexion dans le pool
+#   dns        : résolution DNS (incluse dans connect)
+#   connect    : établissement TCP/TLS
+#   ttfb       : de la connexion à la réception des en-têtes
+#   download   : réception du corps de la réponse
+#   parse      : parsing du flux / HTML / PDF
+#   extract    : extraction et nettoyage du texte
+PHASES = ["queue_wait", "dns", "connect", "ttfb", "download", "parse", "extract"]
+
+COUNTERS = ["bytes", "requests", "cache_hits", "cache_misses", "connections_reused"]
+
+class RunMetrics:
+    def __init__(self):
+        self.sources = {}
+    
+    def reset(self):
+        self.sources = {}
+    
+    def _new_record(self) -> Dict:
+        record = {phase: 0.0 for phase in PHASES}
+        record.update({counter: 0 for counter in COUNTERS})
+        return record
+    
+    def _source_record(self, name: str) -> Dict:
+        if name not in self.sources:
+            record = self._new_record()
+            record["duration"] = 0.0
+            record["articles"] = {}
+            self.sources[name] = record
+        return self.sources[name]
+    
+    def _targets(self) -> List[Dict]:
+        """Enregistrements à mettre à jour pour le contexte courant (source, puis article)"""
+        source = current_source.get()
+        if source is None:
+            return []
+        
+        source_record = self._source_record(source)
+        targets = [source_record]
+        article = current_article.get()
+        if article is not None and article in source_record["articles"]:
+            targets.append(source_record["articles"][article])
+        return targets
+    
+    def add(self, key: str, value, targets: Optional[List[Dict]] = None):
+        for record in (self._targets() if targets is None else targets):
+            record[key] += value
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Chronomètre une phase (parse, extract) pour la source et l'article courants"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    @contextmanager
+    def article(self, url: str):
+        """Attribue les mesures suivantes à un article de la source courante"""
+        source = current_source.get()
+        if source is not None and url:
+            self._source_record(source)["articles"].setdefault(url, self._new_record())
+        token = current_article.set(url)
+        try:
+            yield
+        finally:
+            current_article.reset(token)
+    
+    async def track_source(self, name: str, coro):
+        """Exécute le scraping d'une source en lui attribuant toutes les mesures"""
+        token = current_source.set(name)
+        record = self._source_record(name)
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            record["duration"] += time.perf_counter() - start
+            current_source.reset(token)
+    
+    def trace_config(self):
+        """TraceConfig aiohttp qui alimente les phases HTTP"""
+        import aiohttp
+        
+        async def on_request_start(session, ctx, params):
+            ctx.targets = self._targets()
+            ctx.start = time.perf_counter()
+            ctx.mark = ctx.start
+            self.add("requests", 1, ctx.targets)
+        
+        async def on_connection_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+        
+        async def on_connection_queued_end(session, ctx, params):
+            ctx.mark = time.perf_counter()
+            self.add("queue_wait", ctx.mark - ctx.queued_at, ctx.targets)
+        
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_at = time.perf_counter()
+        
+        async def on_dns_resolvehost_end(session, ctx, params):
+            self.add("dns", time.perf_counter() - ctx.dns_at, ctx.targets)
+        
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_at = time.perf_counter()
+        
+        async def on_connection_create_end(session, ctx, params):
+            ctx.mark = time.perf_counter()
+            self.add("connect", ctx.mark - ctx.connect_at, ctx.targets)
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            ctx.mark = time.perf_counter()
+            self.add("connections_reused", 1, ctx.targets)
+        
+        async def on_request_end(session, ctx, params):
+            now = time.perf_counter()
+            self.add("ttfb", now - ctx.mark, ctx.targets)
+            self.add("cache_hits" if params.response.status == 304 else "cache_misses", 1, ctx.targets)
+            ctx.mark = now
+        
+        async def on_response_chunk_received(session, ctx, params):
+            now = time.perf_counter()
+            self.add("download", now - ctx.mark, ctx.targets)
+            self.add("bytes", len(params.chunk), ctx.targets)
+            ctx.mark = now
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        return trace_config
+    
+    def report(self) -> Dict:
+        """Mesures arrondies, prêtes pour le rapport de statut JSON"""
+        def rounded(record):
+            return {key: round(value, 4) if isinstance(value, float) else value
+                    for key, value in record.items() if key != "articles"}
+        
+        report = {}
+        for name, record in self.sources.items():
+            entry = rounded(record)
+            entry["articles"] = [dict(url=url, **rounded(article)) for url, article in record["articles"].items()]
+            report[name] = entry
+        return report
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def timings_to_prometheus(timings: Dict) -> str:
+    """Convertit les mesures du rapport de statut au format texte Prometheus"""
+    lines = []
+    
+    lines.append("# HELP newsletter_source_duration_seconds Durée totale du scraping de la source")
+    lines.append("# TYPE newsletter_source_duration_seconds gauge")
+    for source, record in sorted(timings.items()):
+        lines.append(f'newsletter_source_duration_seconds{{source="{_escape_label(source)}"}} {record["duration"]}')
+    
+    lines.append("# HELP newsletter_source_phase_seconds Temps cumulé par phase")
+    lines.append("# TYPE newsletter_source_phase_seconds gauge")
+    for source, record in sorted(timings.items()):
+        for phase in PHASES:
+            lines.append(f'newsletter_source_phase_seconds{{source="{_escape_label(source)}",phase="{phase}"}} {record[phase]}')
+    
+    for counter in COUNTERS:
+        lines.append(f"# TYPE newsletter_source_{counter}_total counter")
+        for source, record in sorted(timings.items()):
+            lines.append(f'newsletter_source_{counter}_total{{source="{_escape_label(source)}"}} {record[counter]}')
+    
+    return "\n".join(lines) + "\n"
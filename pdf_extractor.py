@@ -1,12 +1,51 @@
-import aiohttp
+from __future__ import annotations
+
 import asyncio
 from io import BytesIO
-import PyPDF2
-from typing import Optional
+from typing import Dict, List, Optional, TYPE_CHECKING
 import re
+from metrics import RunMetrics
+
+# aiohttp et PyPDF2 sont importés à la première utilisation pour garder un démarrage rapide
+if TYPE_CHECKING:
+    import aiohttp
+
+# Titres de section reconnus (en minuscules) -> type de section
+SECTION_KINDS = {
+    "abstract": "abstract",
+    "introduction": "introduction",
+    "related work": "related_work", "background": "related_work", "preliminaries": "related_work",
+    "method": "method", "methods": "method", "methodology": "method", "approach": "method",
+    "our approach": "method", "proposed method": "method",
+    "experiments": "results", "experiment": "results", "experimental setup": "results",
+    "experimental results": "results", "results": "results", "evaluation": "results",
+    "discussion": "conclusion", "conclusion": "conclusion", "conclusions": "conclusion",
+    "conclusion and future work": "conclusion",
+    "references": "references", "acknowledgments": "acknowledgments", "acknowledgements": "acknowledgments",
+}
+UNNUMBERED_SECTIONS = {"abstract", "references", "acknowledgments"}
+STRUCTURED_SECTIONS = ["abstract", "introduction", "method", "results", "conclusion"]
+# Libellés des sections principales dans le transcript
+SECTION_LABELS = {"abstract": "Résumé", "introduction": "Introduction", "method": "Méthode",
+                  "results": "Résultats", "conclusion": "Conclusion"}
+
+# Une seule expression sans quantificateur paresseux : chaque position du texte n'est testée
+# qu'une fois contre des titres de longueur bornée, d'où un temps linéaire en la taille du paper.
+# Titres en casse "Titre", "Phrase" ou en majuscules, éventuellement précédés d'un numéro ("3", "3.").
+# Le texte nettoyé tient sur une ligne : un numéro de section doit suivre le début du texte ou une fin
+# de phrase, et un titre ne doit pas être suivi d'un mot en minuscules ("on 5 Results datasets").
+_titles = sorted(SECTION_KINDS, key=len, reverse=True)
+_variants = list(dict.fromkeys(variant for title in _titles
+                               for variant in (title.title().replace(" And ", " and "), title.capitalize(), title.upper())))
+HEADING_RE = re.compile(
+    r"(?:(?:^|(?<=[.!?:] ))(?P<number>[1-9]\d?)\.?\s+"
+    r"|(?<![\w.,;:-])(?<!Table )(?<!Figure )(?<!Fig\. )(?<!Section )(?<!Eq\. ))"
+    r"(?P<title>" + "|".join(re.escape(title) for title in _variants) + r")(?![\w-])(?!\s+[a-z])"
+)
 
 class PDFExtractor:
-    def __init__(self):
+    def __init__(self, metrics: Optional[RunMetrics] = None):
+        self.metrics = metrics if metrics is not None else RunMetrics()
         self.headers = {
             "User-Agent": "Mozilla/5.0 (compatible; AI Newsletter Bot/1.0; +https://github.com/ai-fo/news)"
         }
@@ -28,50 +67,57 @@ class PDFExtractor:
                 
                 # Lire le PDF en mémoire
                 pdf_bytes = await response.read()
-                pdf_file = BytesIO(pdf_bytes)
+                return self.extract_pdf_content(pdf_bytes)
+            
+        except Exception as e:
+            print(f"  ↳ Erreur extraction PDF arXiv: {str(e)}")
+            return None
+    
+    def extract_pdf_content(self, pdf_bytes: bytes) -> Optional[str]:
+        """Extrait et formate le texte d'un PDF déjà téléchargé"""
+        pdf_file = BytesIO(pdf_bytes)
+        
+        # Extraire le texte du PDF
+        try:
+            with self.metrics.phase("parse"):
+                import PyPDF2
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
                 
-                # Extraire le texte du PDF
-                try:
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    
-                    # Informations sur le PDF
-                    num_pages = len(pdf_reader.pages)
-                    print(f"  ↳ PDF chargé: {num_pages} pages")
-                    
-                    # Extraire le texte de TOUTES les pages
-                    extracted_text = []
-                    pages_to_extract = num_pages  # Extraire TOUT le PDF
-                    
-                    print(f"  ↳ Extraction de TOUTES les {pages_to_extract} pages...")
-                    
-                    for page_num in range(pages_to_extract):
-                        page = pdf_reader.pages[page_num]
-                        text = page.extract_text()
-                        if text:
-                            extracted_text.append(text)
-                        
-                        # Afficher la progression pour les longs PDFs
-                        if (page_num + 1) % 10 == 0:
-                            print(f"    ... {page_num + 1}/{pages_to_extract} pages extraites")
-                    
-                    full_text = '\n\n'.join(extracted_text)
-                    
-                    # Nettoyer le texte
-                    full_text = self.clean_pdf_text(full_text)
-                    
-                    # Pour arXiv, on veut le texte complet structuré
-                    formatted_content = self.format_full_arxiv_content(full_text, num_pages, pages_to_extract)
-                    
-                    print(f"  ↳ Contenu extrait: {len(formatted_content)} caractères")
-                    
-                    return formatted_content
-                    
-                except Exception as e:
-                    print(f"  ↳ Erreur lecture PDF: {str(e)}")
-                    return None
+                # Informations sur le PDF
+                num_pages = len(pdf_reader.pages)
+                print(f"  ↳ PDF chargé: {num_pages} pages")
+                
+                # Extraire le texte de TOUTES les pages
+                extracted_text = []
+                pages_to_extract = num_pages  # Extraire TOUT le PDF
+                
+                print(f"  ↳ Extraction de TOUTES les {pages_to_extract} pages...")
+                
+                for page_num in range(pages_to_extract):
+                    page = pdf_reader.pages[page_num]
+                    text = page.extract_text()
+                    if text:
+                        extracted_text.append(text)
                     
+                    # Afficher la progression pour les longs PDFs
+                    if (page_num + 1) % 10 == 0:
+                        print(f"    ... {page_num + 1}/{pages_to_extract} pages extraites")
+                
+                full_text = '\n\n'.join(extracted_text)
+            
+            with self.metrics.phase("extract"):
+                # Nettoyer le texte
+                full_text = self.clean_pdf_text(full_text)
+                
+                # Pour arXiv, on veut le texte complet structuré
+                formatted_content = self.format_full_arxiv_content(full_text, num_pages, pages_to_extract)
+            
+            print(f"  ↳ Contenu extrait: {len(formatted_content)} caractères")
+            
+            return formatted_content
+            
         except Exception as e:
-            print(f"  ↳ Erreur extraction PDF arXiv: {str(e)}")
+            print(f"  ↳ Erreur lecture PDF: {str(e)}")
             return None
     
     def clean_pdf_text(self, text: str) -> str:
@@ -112,96 +158,96 @@ class PDFExtractor:
         
         return text.strip()
     
-    def extract_paper_sections(self, text: str) -> dict:
-        """Extrait les sections principales d'un paper"""
-        sections = {
-            'title': '',
-            'authors': '',
-            'abstract': '',
-            'introduction': '',
-            'methods': '',
-            'results': '',
-            'content_preview': ''
-        }
-        
-        # Titre (généralement en première ligne ou avant Abstract)
-        title_match = re.search(r'^(.+?)(?:\n|Abstract)', text, re.MULTILINE | re.DOTALL)
-        if title_match:
-            sections['title'] = title_match.group(1).strip()
-        
-        # Abstract
-        abstract_match = re.search(r'Abstract[:\s]*(.+?)(?:1\.|Introduction|Keywords|CCS Concepts|$)', text, re.IGNORECASE | re.DOTALL)
-        if abstract_match:
-            sections['abstract'] = abstract_match.group(1).strip()[:1500]
-        
-        # Introduction
-        intro_match = re.search(r'(?:1\.|1\s+)?Introduction[:\s]*(.+?)(?:2\.|Related Work|Background|Method|Approach|$)', text, re.IGNORECASE | re.DOTALL)
-        if intro_match:
-            sections['introduction'] = intro_match.group(1).strip()[:2000]
-        
-        # Méthodes/Approche
-        method_match = re.search(r'(?:Method|Approach|Methodology|Proposed Method|Our Approach)[:\s]*(.+?)(?:Experiment|Result|Evaluation|$)', text, re.IGNORECASE | re.DOTALL)
-        if method_match:
-            sections['methods'] = method_match.group(1).strip()[:2000]
-        
-        # Résultats
-        results_match = re.search(r'(?:Result|Experiment|Evaluation)[s]?[:\s]*(.+?)(?:Discussion|Conclusion|Related Work|$)', text, re.IGNORECASE | re.DOTALL)
-        if results_match:
-            sections['results'] = results_match.group(1).strip()[:2000]
-        
-        # Contenu général - prendre une grande portion du texte
-        if len(text) > 5000:
-            sections['content_preview'] = text[2000:8000]  # 6000 caractères de contenu
-        
-        return sections
+    def index_sections(self, text: str) -> List[Dict]:
+        """Repère en une passe les titres de section du texte nettoyé (tout est sur une ligne)
+        
+        Un titre numéroté n'est retenu que si son numéro dépasse le précédent ; sans numéro,
+        seuls Abstract, References et Acknowledgments sont acceptés, une seule fois.
+        """
+        headings = []
+        last_number = 0
+        seen = set()
+        for match in HEADING_RE.finditer(text):
+            kind = SECTION_KINDS[match.group("title").lower()]
+            number = match.group("number")
+            if number:
+                if int(number) <= last_number:
+                    continue
+                last_number = int(number)
+            elif kind not in UNNUMBERED_SECTIONS or kind in seen:
+                continue
+            seen.add(kind)
+            headings.append({"kind": kind, "heading": match.group(0), "start": match.start(), "body_start": match.end()})
+        
+        # Chaque section s'arrête au titre suivant
+        for current, following in zip(headings, headings[1:]):
+            current["end"] = following["start"]
+        if headings:
+            headings[-1]["end"] = len(text)
+        return headings
     
-    def format_arxiv_content(self, sections: dict, total_pages: int) -> str:
-        """Formate le contenu extrait pour le transcript"""
-        content_parts = []
-        
-        content_parts.append("📄 CONTENU DU PAPER ARXIV")
-        content_parts.append(f"Pages extraites: 15 premières pages sur {total_pages} pages totales")
-        content_parts.append("-" * 40)
-        
-        if sections['abstract']:
-            content_parts.append("\nABSTRACT:")
-            content_parts.append(sections['abstract'])
-        
-        if sections['introduction']:
-            content_parts.append("\nINTRODUCTION:")
-            content_parts.append(sections['introduction'])
-        
-        # Ajouter plus de contenu
-        if sections.get('methods'):
-            content_parts.append("\nMETHODOLOGIE:")
-            content_parts.append(sections['methods'][:2000])
-        
-        if sections.get('results'):
-            content_parts.append("\nRESULTATS:")
-            content_parts.append(sections['results'][:2000])
-        
-        if sections['content_preview']:
-            content_parts.append("\nCONTENU ADDITIONNEL:")
-            content_parts.append(sections['content_preview'][:3000])
-        
-        content_parts.append("\n" + "-" * 40)
-        content_parts.append("Note: Extraction des 15 premières pages du paper.")
-        content_parts.append("Pour lire le paper complet, consultez le lien PDF ci-dessus.")
-        
-        return '\n'.join(content_parts)
+    def extract_paper_sections(self, text: str) -> Dict:
+        """Sections principales d'un paper avec leurs positions dans le texte (début du corps, fin)"""
+        headings = self.index_sections(text)
+        
+        sections = {}
+        for heading in headings:
+            kind = heading["kind"]
+            if kind not in STRUCTURED_SECTIONS:
+                continue
+            if kind in sections:
+                # Sections consécutives du même type (Experiments puis Results) : on les réunit
+                if sections[kind]["end"] == heading["start"]:
+                    sections[kind]["end"] = heading["end"]
+                continue
+            sections[kind] = {"heading": heading["heading"], "start": heading["body_start"], "end": heading["end"]}
+        
+        preamble_end = headings[0]["start"] if headings else 0
+        return {
+            "title": text[:preamble_end].strip()[:300],
+            "sections": sections,
+            "headings": headings
+        }
     
     def format_full_arxiv_content(self, text: str, total_pages: int, extracted_pages: int) -> str:
-        """Formate le contenu complet du PDF arXiv"""
+        """Formate le contenu complet du PDF arXiv, découpé selon ses sections (sections principales libellées)"""
         # PAS DE LIMITE - on veut TOUT le contenu
+        paper = self.extract_paper_sections(text)
+        headings = paper["headings"]
+        sections = paper["sections"]
         
         content_parts = []
         content_parts.append("📄 CONTENU COMPLET DU PAPER ARXIV")
         content_parts.append(f"Pages totales extraites: {extracted_pages} pages")
         content_parts.append(f"Caractères totaux: {len(text)}")
+        if headings:
+            content_parts.append(f"Sections: {', '.join(heading['heading'] for heading in headings)}")
+        if sections:
+            content_parts.append(f"Structure: {', '.join(SECTION_LABELS[kind] for kind in STRUCTURED_SECTIONS if kind in sections)}")
         content_parts.append("=" * 80)
         content_parts.append("")
-        content_parts.append(text)
-        content_parts.append("")
+        
+        if not headings:
+            content_parts.append(text)
+            content_parts.append("")
+        else:
+            # Titre et auteurs avant la première section
+            preamble = text[:headings[0]["start"]].strip()
+            if preamble:
+                content_parts.append("EN-TÊTE:")
+                content_parts.append(preamble)
+                content_parts.append("")
+            
+            for heading in headings:
+                # Titre suivi du libellé de la section principale qui le contient
+                section = sections.get(heading["kind"])
+                if section is not None and section["start"] <= heading["body_start"] <= section["end"]:
+                    content_parts.append(f"{heading['heading'].upper()} [{SECTION_LABELS[heading['kind']]}]:")
+                else:
+                    content_parts.append(f"{heading['heading'].upper()}:")
+                content_parts.append(text[heading["body_start"]:heading["end"]].strip(" :"))
+                content_parts.append("")
+        
         content_parts.append("=" * 80)
         content_parts.append("FIN DU PAPER - CONTENU INTÉGRAL EXTRAIT")
         
@@ -0,0 +1,198 @@
+"""Profileur par échantillonnage adapté à asyncio (temps réel et CPU, par source et par coroutine)"""
+
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from config import PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_N
+
+# Frame de la boucle asyncio qui exécute une étape de tâche : tout ce qui est au-dessus est la coroutine
+LOOP_STEP_FRAME = ("events.py", "_run")
+LOOP_IDLE_FRAME = ("base_events.py", "_run_once")
+# Frame qui porte la source en cours (RunMetrics.track_source, paramètre "name")
+SOURCE_FRAME = ("metrics.py", "track_source")
+IDLE_LABEL = "(boucle asyncio en attente)"
+
+def frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Échantillonne la pile de chaque thread depuis un thread séparé.
+    
+    cProfile attribue mal le temps en asyncio (une coroutine suspendue n'est pas en cours). Ici on
+    ne garde que la pile réellement exécutée, coupée au niveau de la boucle : la racine est la
+    coroutine de la tâche, préfixée par la source quand la pile passe par track_source. Chaque
+    échantillon pèse le temps réel écoulé et le temps CPU consommé par le thread depuis le précédent.
+    """
+    
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.wall = defaultdict(int)  # pile repliée -> microsecondes
+        self.cpu = defaultdict(int)
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._cpu_clocks = {}
+        self._last_cpu = {}
+        self.started_at = None
+        self.elapsed = 0.0
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+    
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed = time.perf_counter() - self.started_at
+    
+    def _thread_cpu(self, ident: int) -> Optional[float]:
+        """Temps CPU d'un autre thread (horloge POSIX par thread, absente sur certaines plateformes)"""
+        if ident not in self._cpu_clocks:
+            try:
+                self._cpu_clocks[ident] = time.pthread_getcpuclockid(ident)
+            except (AttributeError, OSError):
+                self._cpu_clocks[ident] = None
+        clock = self._cpu_clocks[ident]
+        if clock is None:
+            return None
+        try:
+            return time.clock_gettime(clock)
+        except OSError:
+            return None
+    
+    def _run(self):
+        own = threading.get_ident()
+        main = threading.main_thread().ident
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            wall_us = int((now - last) * 1_000_000)
+            last = now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._collapse(frame)
+                if ident != main:
+                    stack = f"[thread {names.get(ident, ident)}];{stack}"
+                self.wall[stack] += wall_us
+                
+                cpu = self._thread_cpu(ident)
+                if cpu is not None:
+                    previous = self._last_cpu.get(ident, cpu)
+                    self._last_cpu[ident] = cpu
+                    self.cpu[stack] += int((cpu - previous) * 1_000_000)
+            self.samples += 1
+    
+    def _collapse(self, frame) -> str:
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+        
+        source = None
+        for frame in frames:
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) == SOURCE_FRAME:
+                source = frame.f_locals.get("name")
+                break
+        
+        # Couper la machinerie de la boucle : on garde ce qui suit la dernière étape de tâche
+        keys = [(os.path.basename(f.f_code.co_filename), f.f_code.co_name) for f in frames]
+        step = max((i for i, key in enumerate(keys) if key == LOOP_STEP_FRAME), default=None)
+        if step is not None:
+            labels = [frame_label(f.f_code) for f in frames[step + 1:]]
+        elif LOOP_IDLE_FRAME in keys:
+            labels = [IDLE_LABEL]
+        else:
+            labels = [frame_label(f.f_code) for f in frames]
+        
+        if source:
+            labels.insert(0, f"[{source}]")
+        return ";".join(label.replace(";", ",") for label in labels)
+    
+    def collapsed(self, kind: str = "wall") -> str:
+        """Format 'pile;repliée valeur' attendu par flamegraph.pl / speedscope"""
+        stacks = self.wall if kind == "wall" else self.cpu
+        return "\n".join(f"{stack} {value}" for stack, value in sorted(stacks.items()) if value > 0)
+    
+    def hot_functions(self, kind: str = "cpu", top: int = PROFILE_TOP_N) -> List[Tuple[str, int, int]]:
+        """(fonction, temps propre µs, temps cumulé µs), triées par temps propre"""
+        stacks = self.wall if kind == "wall" else self.cpu
+        own = defaultdict(int)
+        cumulative = defaultdict(int)
+        for stack, value in stacks.items():
+            frames = [frame for frame in stack.split(";") if not frame.startswith("[")]
+            if not frames:
+                continue
+            own[frames[-1]] += value
+            for frame in set(frames):
+                cumulative[frame] += value
+        ranked = sorted(own, key=own.get, reverse=True)[:top]
+        return [(name, own[name], cumulative[name]) for name in ranked]
+    
+    def by_source(self) -> Dict[str, Dict[str, float]]:
+        totals = defaultdict(lambda: {"wall": 0.0, "cpu": 0.0})
+        for kind, stacks in (("wall", self.wall), ("cpu", self.cpu)):
+            for stack, value in stacks.items():
+                root = stack.split(";", 1)[0]
+                source = root[1:-1] if root.startswith("[") and not root.startswith("[thread") else "(hors source)"
+                totals[source][kind] += value / 1_000_000
+        return dict(totals)
+    
+    def report(self, top: int = PROFILE_TOP_N) -> str:
+        lines = [f"Profil: {self.samples} échantillons sur {self.elapsed:.2f}s (intervalle {self.interval * 1000:.1f} ms)", ""]
+        
+        lines.append("Temps par source (réel / CPU):")
+        for source, totals in sorted(self.by_source().items(), key=lambda item: item[1]["cpu"], reverse=True):
+            lines.append(f"  - {source}: {totals['wall']:.3f}s / {totals['cpu']:.3f}s")
+        
+        for kind, title in (("cpu", "CPU"), ("wall", "temps réel")):
+            lines.append("")
+            lines.append(f"Top {top} fonctions ({title}, propre / cumulé):")
+            for name, own, cumulative in self.hot_functions(kind, top):
+                lines.append(f"  {own / 1_000_000:8.3f}s {cumulative / 1_000_000:8.3f}s  {name}")
+        return "\n".join(lines)
+    
+    def save(self, prefix: Optional[str] = None) -> List[str]:
+        if prefix is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            prefix = f"data/profile_{timestamp}"
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+        
+        files = []
+        for kind in ("wall", "cpu"):
+            path = f"{prefix}.{kind}.folded"
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.collapsed(kind))
+            files.append(path)
+        
+        path = f"{prefix}.txt"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.report())
+        files.append(path)
+        return files
+
+def print_profile(profiler: SamplingProfiler):
+    files = profiler.save()
+    print(f"\n🔥 {profiler.report()}")
+    print(f"\n💾 Profil sauvegardé: {', '.join(files)}")
\ No newline at end of file
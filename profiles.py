@@ -0,0 +1,90 @@
+"""Profils de newsletters : plusieurs newsletters produites à partir d'un seul passage de scraping
+
+Chaque profil de NEWSLETTER_PROFILES choisit ses sources, ses catégories, ses limites et son
+dossier de sortie. Le scraper ne récupère que l'union des sources des profils demandés, une
+seule fois, puis les articles sont répartis entre les profils.
+"""
+
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from transcript_by_source import TranscriptBySource
+from transcript_generator import TranscriptGenerator
+from config import NEWSLETTER_PROFILES, ARTICLES_PER_SOURCE, ARTICLES_PER_SECTION
+
+# Catégories reconnues par TranscriptGenerator
+CATEGORY_KEYS = {"research", "news", "tools", "community"}
+
+def load_profiles(names: str, known_sources: List[str]) -> Dict[str, Dict]:
+    """Profils demandés ("recherche,outils" ou "all"), complétés par les valeurs par défaut"""
+    requested = list(NEWSLETTER_PROFILES) if names == "all" else [name.strip() for name in names.split(",") if name.strip()]
+    
+    profiles = {}
+    for name in requested:
+        if name not in NEWSLETTER_PROFILES:
+            raise ValueError(f"Profil inconnu: {name} (disponibles: {', '.join(NEWSLETTER_PROFILES)})")
+        profile = dict(NEWSLETTER_PROFILES[name])
+        
+        unknown = [source for source in profile.get("sources", []) if source not in known_sources]
+        if unknown:
+            raise ValueError(f"Profil {name}: sources inconnues {', '.join(unknown)}")
+        if not profile.get("sources"):
+            raise ValueError(f"Profil {name}: aucune source")
+        if profile.get("categories") and not set(profile["categories"]) <= CATEGORY_KEYS:
+            raise ValueError(f"Profil {name}: catégories possibles {', '.join(sorted(CATEGORY_KEYS))}")
+        
+        profile.setdefault("title", "Newsletter IA")
+        profile.setdefault("articles_per_source", ARTICLES_PER_SOURCE)
+        profile.setdefault("articles_per_section", ARTICLES_PER_SECTION)
+        profile.setdefault("output_dir", os.path.join("transcripts", "profiles", name))
+        profiles[name] = profile
+    return profiles
+
+def union_sources(profiles: Dict[str, Dict]) -> List[str]:
+    """Sources à scraper pour l'ensemble des profils (chacune une seule fois)"""
+    return list(dict.fromkeys(source for profile in profiles.values() for source in profile["sources"]))
+
+def fetch_limit(profiles: Dict[str, Dict]) -> int:
+    """Entrées à lire par flux : la plus grande limite demandée par un profil"""
+    return max(profile["articles_per_source"] for profile in profiles.values())
+
+def select_articles(profile: Dict, articles: List[Dict], source_labels: Dict[str, str]) -> List[Dict]:
+    """Articles du profil : ses sources, dans la limite de articles_per_source par source"""
+    labels = {source_labels.get(source, source) for source in profile["sources"]}
+    per_source = Counter()
+    selected = []
+    for article in articles:
+        source = article.get("source")
+        if source in labels and per_source[source] < profile["articles_per_source"]:
+            per_source[source] += 1
+            selected.append(article)
+    return selected
+
+def render_profiles(profiles: Dict[str, Dict], articles: List[Dict], source_labels: Dict[str, str],
+                    generated_at: Optional[datetime] = None, delta: bool = False) -> Dict[str, str]:
+    """Écrit les transcripts par source et la newsletter de chaque profil ; retourne les newsletters écrites"""
+    generated_at = generated_at or datetime.now()
+    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
+    newsletters = {}
+    
+    for name, profile in profiles.items():
+        selected = select_articles(profile, articles, source_labels)
+        os.makedirs(profile["output_dir"], exist_ok=True)
+        print(f"\n📬 Profil {name}: {len(selected)} articles → {profile['output_dir']}/")
+        
+        # En mode delta, chaque profil compare à son propre run précédent (état dans son dossier)
+        transcripts = TranscriptBySource(base_dir=profile["output_dir"])
+        if delta:
+            transcripts.save_transcripts_delta(lambda: selected, generated_at)
+        else:
+            transcripts.save_transcripts_streaming(lambda: selected, generated_at)
+        
+        generator = TranscriptGenerator(profile.get("categories"), profile["articles_per_section"], profile["title"])
+        newsletter_file = os.path.join(profile["output_dir"], f"newsletter_{timestamp}.md")
+        with open(newsletter_file, 'w', encoding='utf-8') as f:
+            f.write(generator.generate_transcript(selected, generated_at))
+        print(f"📄 Newsletter {name}: {newsletter_file}")
+        newsletters[name] = newsletter_file
+    
+    return newsletters
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""Classement vectorisé des articles pour la newsletter
+
+Tous les articles sont scorés en une passe : pertinence textuelle TF-IDF
+(similarité cosinus avec le centroïde du corpus, calculée sur une matrice
+creuse au format coordonnées avec NumPy), fraîcheur d'après `published`,
+et engagement (score Reddit, téléchargements et likes Hugging Face).
+
+top_by_category_streaming donne la même sélection en relisant les articles à
+chaque passe plutôt qu'en les gardant tous en mémoire.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config import RANKING_WEIGHTS, RANKING_RECENCY_HALF_LIFE
+
+TOKEN_RE = re.compile(r"[a-zà-ÿ0-9]{3,}")
+
+STOP_WORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "were", "has", "have", "but", "not",
+    "you", "your", "its", "our", "their", "can", "will", "into", "more", "than", "also", "which", "about",
+    "les", "des", "une", "pour", "dans", "sur", "par", "avec", "est", "sont", "qui", "que", "aux", "ces",
+    "plus", "pas", "ont", "été", "elle", "ils", "leur", "mais", "comme", "cette"
+}
+
+# Longueur de contenu prise en compte pour le TF-IDF (les papers complets n'apportent rien de plus)
+MAX_TEXT_LENGTH = 3000
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+def _tokens(article) -> List[str]:
+    """Termes d'un article pour le TF-IDF : le titre compte double"""
+    title = article.get("title") or ""
+    body = (article.get("summary") or "") + " " + (article.get("content") or "")[:MAX_TEXT_LENGTH]
+    return tokenize(title) * 2 + tokenize(body)
+
+def _published(article) -> Optional[float]:
+    """Date de publication : `published_ts` (UTC) du scraper, sinon `published` des fichiers qui ne l'ont pas"""
+    if article.get("published_ts") is not None:
+        return float(article["published_ts"])
+    # Importé à l'usage, comme dans feed_parser : ses dépendances ne pèsent pas sur le démarrage de generate_transcripts_only
+    from feed_parser import parse_timestamp
+    # Une date sans fuseau a été écrite par le scraper en heure locale (Reddit, GitHub Trending)
+    return parse_timestamp(article.get("published"), local=True)
+
+def _engagement(article) -> float:
+    value = 0.0
+    if article.get("score"):
+        value += math.log1p(max(article["score"], 0))
+    if article.get("downloads"):
+        value += math.log1p(article["downloads"])
+    if article.get("likes"):
+        value += math.log1p(article["likes"])
+    return value
+
+class ArticleRanker:
+    def __init__(self, weights: Dict[str, float] = None, half_life_hours: float = RANKING_RECENCY_HALF_LIFE):
+        self.weights = weights or RANKING_WEIGHTS
+        self.half_life_hours = half_life_hours
+    
+    def text_scores(self, articles: List[Dict]):
+        """Similarité cosinus TF-IDF de chaque article avec le centroïde du corpus"""
+        import numpy as np
+        
+        vocabulary = {}
+        doc_ids, term_ids = [], []
+        for doc, article in enumerate(articles):
+            for token in _tokens(article):
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                doc_ids.append(doc)
+        
+        n_docs = len(articles)
+        if not term_ids:
+            return np.zeros(n_docs)
+        
+        # Matrice creuse (doc, terme) -> nombre d'occurrences
+        pairs = np.array(doc_ids, dtype=np.int64) * len(vocabulary) + np.array(term_ids, dtype=np.int64)
+        unique_pairs, counts = np.unique(pairs, return_counts=True)
+        rows = unique_pairs // len(vocabulary)
+        cols = unique_pairs % len(vocabulary)
+        
+        # TF-IDF lissé, puis normalisation L2 par document
+        df = np.bincount(cols, minlength=len(vocabulary))
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        weights = (1 + np.log(counts)) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+        weights = weights / norms[rows]
+        
+        centroid = np.bincount(cols, weights=weights, minlength=len(vocabulary)) / n_docs
+        centroid_norm = np.linalg.norm(centroid)
+        if centroid_norm == 0:
+            return np.zeros(n_docs)
+        return np.bincount(rows, weights=weights * centroid[cols], minlength=n_docs) / centroid_norm
+    
+    def score(self, articles: List[Dict], now: Optional[float] = None):
+        """Score combiné de chaque article, chaque composante étant ramenée dans [0, 1]"""
+        import numpy as np
+        
+        if not articles:
+            return np.zeros(0)
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        
+        published = np.array([_published(article) or np.nan for article in articles], dtype=float)
+        age_hours = np.clip((now - published) / 3600, 0, None)
+        recency = np.where(np.isnan(age_hours), 0.0, np.exp2(-age_hours / self.half_life_hours))
+        
+        engagement = np.array([_engagement(article) for article in articles], dtype=float)
+        
+        def normalize(values):
+            span = values.max() - values.min()
+            return (values - values.min()) / span if span > 0 else np.zeros_like(values)
+        
+        return (self.weights["text"] * normalize(self.text_scores(articles))
+                + self.weights["recency"] * recency
+                + self.weights["engagement"] * normalize(engagement))
+    
+    def top_by_category(self, categorized: Dict[str, List[Dict]], n: int, now: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """Les n meilleurs articles de chaque catégorie, scorés ensemble en une seule passe"""
+        import numpy as np
+        
+        articles = [article for items in categorized.values() for article in items]
+        scores = self.score(articles, now)
+        
+        selected = {}
+        offset = 0
+        for category, items in categorized.items():
+            category_scores = scores[offset:offset + len(items)]
+            offset += len(items)
+            if len(items) > n:
+                top = np.argpartition(-category_scores, n)[:n]
+            else:
+                top = np.arange(len(items))
+            # Tri stable par score décroissant (l'ordre d'origine départage les égalités)
+            top = top[np.lexsort((top, -category_scores[top]))]
+            selected[category] = [items[i] for i in top]
+        return selected
+    
+    def top_by_category_streaming(self, read_articles: Callable[[], Iterable[Tuple[str, Dict]]], n: int,
+                                  now: Optional[float] = None) -> Tuple[Dict[str, List[Dict]], Counter]:
+        """Les n meilleurs articles de chaque catégorie, comme top_by_category, sans garder le corpus en mémoire
+        
+        `read_articles` retourne un nouvel itérable de (catégorie, article) à chaque appel. Quatre passes :
+        fréquences des termes, centroïde, étendue des scores textuels, puis un tas borné de n articles par
+        catégorie. La mémoire dépend du vocabulaire et de n, pas du nombre d'articles. Retourne aussi le
+        nombre d'articles de chaque catégorie.
+        """
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        
+        # Identifiants des termes dans l'ordre d'apparition, comme text_scores (même ordre de sommation)
+        vocabulary: Dict[str, int] = {}
+        df: List[int] = []
+        counts = Counter()
+        engagement_range = [math.inf, -math.inf]
+        
+        def term_counts(article) -> Dict[int, int]:
+            # Counter garde l'ordre de première apparition des termes
+            return {vocabulary.setdefault(token, len(vocabulary)): count
+                    for token, count in Counter(_tokens(article)).items()}
+        
+        for category, article in read_articles():
+            counts[category] += 1
+            terms = term_counts(article)
+            df.extend([0] * (len(vocabulary) - len(df)))
+            for term in terms:
+                df[term] += 1
+            engagement = _engagement(article)
+            engagement_range = [min(engagement_range[0], engagement), max(engagement_range[1], engagement)]
+        
+        n_docs = sum(counts.values())
+        idf = [math.log((1 + n_docs) / (1 + count)) + 1 for count in df]
+        
+        def doc_weights(article) -> List[Tuple[int, float]]:
+            """Poids TF-IDF normalisés (L2) de l'article, par identifiant de terme croissant"""
+            terms = term_counts(article)
+            weights = [(term, (1 + math.log(terms[term])) * idf[term]) for term in sorted(terms)]
+            norm = math.sqrt(sum(weight ** 2 for _, weight in weights))
+            return [(term, weight / norm) for term, weight in weights]
+        
+        centroid = [0.0] * len(vocabulary)
+        for _, article in read_articles():
+            for term, weight in doc_weights(article):
+                centroid[term] += weight
+        centroid = [value / n_docs for value in centroid]
+        centroid_norm = math.sqrt(sum(value ** 2 for value in centroid))
+        
+        def text_score(article) -> float:
+            if centroid_norm == 0:
+                return 0.0
+            return sum(weight * centroid[term] for term, weight in doc_weights(article)) / centroid_norm
+        
+        text_range = [math.inf, -math.inf]
+        if centroid_norm:
+            for _, article in read_articles():
+                text = text_score(article)
+                text_range = [min(text_range[0], text), max(text_range[1], text)]
+        
+        def normalize(value: float, value_range: List[float]) -> float:
+            span = value_range[1] - value_range[0]
+            return (value - value_range[0]) / span if span > 0 else 0.0
+        
+        # Tas de (score, -position, article) : le plus faible est remplacé, la position départage les égalités
+        heaps: Dict[str, List] = {}
+        for position, (category, article) in enumerate(read_articles()):
+            published = _published(article)
+            recency = 0.0 if published is None else 2 ** (-max((now - published) / 3600, 0) / self.half_life_hours)
+            score = (self.weights["text"] * normalize(text_score(article), text_range)
+                     + self.weights["recency"] * recency
+                     + self.weights["engagement"] * normalize(_engagement(article), engagement_range))
+            heap = heaps.setdefault(category, [])
+            if len(heap) < n:
+                heapq.heappush(heap, (score, -position, article))
+            elif (score, -position) > heap[0][:2]:
+                heapq.heapreplace(heap, (score, -position, article))
+        
+        selected = {category: [article for _, _, article in sorted(heap, key=lambda item: (-item[0], -item[1]))]
+                    for category, heap in heaps.items()}
+        return selected, counts
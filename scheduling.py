@@ -0,0 +1,122 @@
+"""Ordonnancement des sources selon leur chemin critique
+
+Les durées de chaque source sont mémorisées d'un run à l'autre (moyenne
+mobile exponentielle). Les sources les plus longues sont lancées en premier
+et leurs requêtes (PDF, contenu complet) passent devant celles des sources
+rapides lorsque le budget de requêtes simultanées est saturé.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+from typing import Callable, Dict, List
+from metrics import current_source
+from config import SOURCE_HISTORY_ALPHA
+
+class SourceHistory:
+    def __init__(self, path: str = None):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+    
+    @classmethod
+    def load(cls, path: str) -> "SourceHistory":
+        history = cls(path)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    history.durations = json.load(f)
+            except (OSError, ValueError):
+                pass
+        return history
+    
+    def save(self):
+        if not self.path:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.durations, f, ensure_ascii=False, indent=2)
+    
+    def expected_duration(self, name: str) -> float:
+        """Durée attendue d'une source ; une source inconnue est supposée aussi longue que la plus longue"""
+        if name in self.durations:
+            return self.durations[name]
+        return max(self.durations.values(), default=0.0)
+    
+    def order(self, names: List[str]) -> List[str]:
+        """Sources triées de la plus longue à la plus courte (ordre d'origine à durée égale)"""
+        return sorted(names, key=self.expected_duration, reverse=True)
+    
+    def update(self, timings: Dict):
+        """Intègre les durées mesurées lors du run (rapport de RunMetrics)"""
+        for name, record in timings.items():
+            duration = record["duration"]
+            if name in self.durations:
+                duration = SOURCE_HISTORY_ALPHA * duration + (1 - SOURCE_HISTORY_ALPHA) * self.durations[name]
+            self.durations[name] = round(duration, 3)
+
+class PriorityLimiter:
+    """Sémaphore dont les slots libérés vont à la requête de plus haute priorité"""
+    
+    def __init__(self, slots: int):
+        self.free = slots
+        self.waiters = []
+        self.counter = itertools.count()
+    
+    async def acquire(self, priority: float):
+        if self.free > 0 and not self.waiters:
+            self.free -= 1
+            return
+        
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (-priority, next(self.counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Slot attribué juste avant l'annulation : le rendre
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+    
+    def release(self):
+        while self.waiters:
+            _, _, future = heapq.heappop(self.waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.free += 1
+
+class _LimitedRequest:
+    def __init__(self, request, limiter: PriorityLimiter, priority: float):
+        self.request = request
+        self.limiter = limiter
+        self.priority = priority
+        self.response_context = None
+    
+    async def __aenter__(self):
+        await self.limiter.acquire(self.priority)
+        try:
+            self.response_context = self.request()
+            return await self.response_context.__aenter__()
+        except BaseException:
+            self.limiter.release()
+            raise
+    
+    async def __aexit__(self, *exc_info):
+        try:
+            return await self.response_context.__aexit__(*exc_info)
+        finally:
+            self.limiter.release()
+
+class LimitedSession:
+    """Session dont chaque requête consomme un slot du budget, priorisé par la durée attendue de sa source"""
+    
+    def __init__(self, session, limiter: PriorityLimiter, priority: Callable[[str], float]):
+        self.session = session
+        self.limiter = limiter
+        self.priority = priority
+    
+    def get(self, url, **kwargs) -> _LimitedRequest:
+        source = current_source.get()
+        priority = self.priority(source) if source is not None else 0.0
+        return _LimitedRequest(lambda: self.session.get(url, **kwargs), self.limiter, priority)
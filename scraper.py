@@ -1,195 +1,511 @@
+from __future__ import annotations
+
 import asyncio
-import aiohttp
-import feedparser
-from bs4 import BeautifulSoup
+import time
 from datetime import datetime, timedelta
 import json
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, TYPE_CHECKING
+from urllib.parse import urljoin, urlencode
 import re
 from content_extractor import ContentExtractor
 from pdf_extractor import PDFExtractor
-from config import SOURCES_NEED_FULL_CONTENT, ARTICLES_PER_SOURCE, MIN_CONTENT_LENGTH
+from metrics import RunMetrics
+from feed_parser import parse_entries, parse_timestamp
+from article import Article
+from scheduling import SourceHistory, PriorityLimiter, LimitedSession
+from loop_monitor import LoopStallMonitor
+from arxiv_api import arxiv_id, metadata_url, parse_metadata, format_abstract
+from config import (MIN_CONTENT_LENGTH, SCRAPER_MAX_CONCURRENT_REQUESTS, DEADLINE_DEGRADE_FRACTION, DEADLINE_CANCEL_FRACTION,
+                    HUGGINGFACE_SORT, HUGGINGFACE_FIELDS, REDDIT_PAGE_SIZE, REDDIT_MAX_PAGES, ARTICLE_MAX_AGE_HOURS,
+                    ARXIV_PDF_BUDGET, ARXIV_PDF_CONCURRENCY)
+
+# Méthode de scraping de chaque type d'adaptateur du registre
+ADAPTERS = {
+    "rss": "fetch_rss",
+    "arxiv": "fetch_arxiv",
+    "reddit": "fetch_reddit",
+    "huggingface": "fetch_huggingface",
+    "github_trending": "scrape_github_trending"
+}
+
+# aiohttp, feedparser et bs4 sont importés à la première utilisation pour garder un démarrage rapide
+if TYPE_CHECKING:
+    import aiohttp
 
 class NewsletterScraper:
-    def __init__(self):
+    def __init__(self, sources: Optional[Dict[str, Dict]] = None):
+        # Importés à la création du scraper plutôt qu'à l'import du module (bench_startup.py)
+        from hedging import Hedger
+        from source_registry import load_source_registry
         self.source_status = {}
-        self.content_extractor = ContentExtractor()
-        self.pdf_extractor = PDFExtractor()
-        self.rss_sources = {
-            "ActuIA": "https://www.actuia.com/feed",
-            "MIT Tech Review AI": "https://www.technologyreview.com/feed/",
-            "TechCrunch AI": "https://techcrunch.com/tag/artificial-intelligence/feed/",
-            "KDnuggets": "https://www.kdnuggets.com/feed",
-            "MarkTechPost": "https://www.marktechpost.com/feed",
-            "arXiv AI": "https://export.arxiv.org/rss/cs.AI",
-            "arXiv ML": "https://export.arxiv.org/rss/cs.LG",
-            "ScienceDaily AI": "https://www.sciencedaily.com/rss/computers_math/artificial_intelligence.xml",
-            "Google AI Blog": "https://ai.googleblog.com/feeds/posts/default",
-            "OpenAI Blog": "https://openai.com/blog/rss/",
-            "AIhub": "https://aihub.org/feed/",
-            "Papers With Code": "https://paperswithcode.com/rss",
-            "AI Trends": "https://www.aitrends.com/feed/",
-            "AI Business": "https://aibusiness.com/rss.xml",
-            "VentureBeat AI": "https://venturebeat.com/category/ai/feed/",
-            "L'Usine Digitale IA": "https://www.usine-digitale.fr/themes/intelligence-artificielle/rss.xml"
-        }
-        
-        self.web_sources = {
-            "Product Hunt AI": "https://www.producthunt.com/topics/artificial-intelligence",
-            "Futurepedia": "https://www.futurepedia.io/",
-            "FutureTools": "https://www.futuretools.io/",
-            "There's An AI For That": "https://theresanaiforthat.com/",
-            "GitHub Trending": "https://github.com/trending?since=daily",
-            "Reddit ML": "https://www.reddit.com/r/MachineLearning/.json",
-            "Hugging Face": "https://huggingface.co/api/models"
-        }
+        self.metrics = RunMetrics()
+        self.stall_monitor = LoopStallMonitor()
+        # Latences des pages par hôte et requêtes de couverture (désactivées par défaut)
+        self.hedger = Hedger()
+        self.content_extractor = ContentExtractor(self.metrics, self.hedger)
+        self.pdf_extractor = PDFExtractor(self.metrics)
+        # Sources du registre (sources.json) par nom, sauf registre fourni
+        self.sources = sources if sources is not None else load_source_registry()
         
         self.articles = []
         
-    async def fetch_rss(self, session: aiohttp.ClientSession, name: str, url: str, fetch_full_content: bool = True) -> List[Dict]:
+        # Liens déjà connus : les entrées correspondantes ne sont pas re-traitées (mode daemon)
+        self.known_links = set()
+        
+        # Validateurs HTTP (ETag / Last-Modified) par URL de flux pour les requêtes conditionnelles
+        self.http_cache = {}
+        
+        # Archive HTTP : "record" enregistre tous les échanges, "replay" les rejoue sans réseau
+        self.http_archive = None
+        self.archive_mode = None
+        
+        # Durées historiques par source (chemin critique) et budget de requêtes simultanées
+        self.history = SourceHistory()
+        self.limiter = None
+        
+        # Sources à scraper (None = toutes celles activées) et nombre d'entrées lues par source (None = limite du registre)
+        self.enabled_sources = None
+        self.articles_per_source = None
+        
+        # arXiv : résumés par défaut ; PDFs complets sur demande, avec leur propre budget par run
+        self.arxiv_pdf = False
+        self.arxiv_pdf_budget = ARXIV_PDF_BUDGET
+        # Budget commun à plusieurs processus (file de sharding.py) : réserve un PDF, False s'il est épuisé
+        self.shared_pdf_budget: Optional[Callable[[], bool]] = None
+        self.pdf_slots = asyncio.Semaphore(ARXIV_PDF_CONCURRENCY)
+        
+        # Fenêtre de publication (en heures) : les entrées plus anciennes sont écartées avant toute requête
+        self.max_age_hours = ARTICLE_MAX_AGE_HOURS
+        
+        # Budget de temps total (mode échéance) et articles déjà collectés par source, conservés en cas d'annulation
+        self.time_budget = None
+        self.started_at = None
+        self.partial_results = {}
+        self.degradation = {"full_content_skipped": 0, "cancelled_sources": []}
+        
+        # Points de reprise du run (RunCheckpoint) : travail déjà fait relu, nouveau travail journalisé
+        self.checkpoint = None
+    
+    def set_time_budget(self, seconds: float):
+        """Active le mode échéance : le run doit se terminer en `seconds` secondes"""
+        self.time_budget = seconds
+        self.started_at = time.monotonic()
+    
+    def budget_fraction_reached(self, fraction: float) -> bool:
+        if self.time_budget is None:
+            return False
+        return time.monotonic() - self.started_at >= self.time_budget * fraction
+    
+    def skip_full_content(self) -> bool:
+        """Premier niveau de dégradation : garder le contenu RSS sans extraction PDF / page complète"""
+        if self.budget_fraction_reached(DEADLINE_DEGRADE_FRACTION):
+            self.degradation["full_content_skipped"] += 1
+            return True
+        return False
+    
+    def wrap_session(self, session):
+        """Enveloppe la session selon le mode d'archive HTTP et le budget de requêtes priorisé"""
+        if self.archive_mode == "record":
+            from http_archive import RecordingSession
+            session = RecordingSession(session, self.http_archive)
+        elif self.archive_mode == "replay":
+            from http_archive import ReplaySession
+            session = ReplaySession(self.http_archive)
+        
+        self.limiter = PriorityLimiter(SCRAPER_MAX_CONCURRENT_REQUESTS)
+        return LimitedSession(session, self.limiter, self.history.expected_duration)
+        
+    def window_start(self) -> Optional[float]:
+        """Timestamp UTC de début de la fenêtre de publication (None sans fenêtre)"""
+        if self.max_age_hours is None:
+            return None
+        # Run repris : même fenêtre que le run d'origine
+        now = self.checkpoint.started if self.checkpoint is not None else time.time()
+        return now - self.max_age_hours * 3600
+    
+    def get_source_names(self) -> List[str]:
+        """Retourne les identifiants des sources à scraper (clés du rapport de statut)"""
+        names = [name for name, spec in self.sources.items() if spec["enabled"]]
+        if self.enabled_sources is not None:
+            names = [name for name in names if name in self.enabled_sources]
+        return names
+    
+    def article_source(self, name: str) -> str:
+        """Valeur du champ "source" des articles d'une source"""
+        return self.sources[name]["label"]
+    
+    def source_limit(self, name: str) -> int:
+        """Nombre d'articles lus pour une source : limite imposée au scraper, sinon celle du registre"""
+        return self.articles_per_source or self.sources[name]["limit"]
+    
+    async def scrape_source(self, session: aiohttp.ClientSession, name: str) -> List[Dict]:
+        """Scrape une seule source à partir de son identifiant, avec l'adaptateur de son type"""
+        spec = self.sources.get(name)
+        if spec is None or spec["type"] not in ADAPTERS:
+            raise ValueError(f"Source inconnue: {name}")
+        if self.checkpoint is not None and self.checkpoint.completed(name) is not None:
+            return self.restore_source(name, self.checkpoint.completed(name))
+        
+        coro = getattr(self, ADAPTERS[spec["type"]])(session, name)
+        articles = await self.metrics.track_source(name, coro)
+        articles = [Article.from_dict(article) for article in articles]
+        
+        # Source en échec : elle sera retentée en cas de reprise
+        status = self.source_status.get(name)
+        if self.checkpoint is not None and status is not None and status["status"] == "success":
+            self.checkpoint.record_source(name, status, self.metrics.sources.get(name),
+                                          [article.to_dict() for article in articles])
+        return articles
+    
+    def restore_source(self, name: str, record: Dict) -> List[Dict]:
+        """Source terminée avant l'interruption : statut, mesures et articles relus depuis le journal"""
+        self.source_status[name] = record["status"]
+        # PDFs arXiv extraits par la source : ils comptent dans le budget du run repris
+        self.arxiv_pdf_budget -= record["status"].get("pdfs", 0)
+        if record["timings"] is not None:
+            self.metrics.sources[name] = record["timings"]
+        print(f"↻ {name}: {len(record['articles'])} articles repris")
+        return [Article.from_dict(article) for article in record["articles"]]
+    
+    def restored_article(self, name: str, link: str) -> Optional[Dict]:
+        """Article traité avant l'interruption (None s'il reste à faire)"""
+        if self.checkpoint is None or not link:
+            return None
+        return self.checkpoint.article(name, link)
+    
+    def checkpoint_article(self, name: str, link: str, article: Dict):
+        if self.checkpoint is not None and link:
+            self.checkpoint.record_article(name, link, article)
+
+    async def fetch_feed(self, session: aiohttp.ClientSession, name: str, url: str) -> Optional[bytes]:
+        """Télécharge un flux, avec requête conditionnelle s'il a déjà été récupéré ; None s'il n'a pas changé"""
+        headers = {}
+        validators = self.http_cache.get(url, {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        
+        async with session.get(url, headers=headers, timeout=30) as response:
+            if response.status == 304:
+                print(f"✓ {name}: flux inchangé")
+                self.source_status[name] = {"status": "success", "count": 0, "error": None, "not_modified": True}
+                return None
+            
+            content = await response.read()
+            
+            if response.headers.get("ETag") or response.headers.get("Last-Modified"):
+                self.http_cache[url] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                }
+        return content
+    
+    async def fetch_rss(self, session: aiohttp.ClientSession, name: str, fetch_full_content: bool = True) -> List[Dict]:
         try:
-            async with session.get(url, timeout=30) as response:
-                content = await response.text()
-                feed = feedparser.parse(content)
-                
-                articles = []
-                for entry in feed.entries[:ARTICLES_PER_SOURCE]:
-                    # Récupération du contenu depuis le RSS
-                    rss_content = ""
-                    
-                    # Pour AI Business, essayer d'extraire plus de contenu du RSS
-                    if name == "AI Business":
-                        # Chercher dans tous les champs possibles
-                        content_fields = []
-                        
-                        if entry.get("content"):
-                            for content_item in entry.get("content", []):
-                                if isinstance(content_item, dict) and content_item.get("value"):
-                                    content_fields.append(content_item.get("value", ""))
-                        
-                        if entry.get("content_detail") and entry.get("content_detail", {}).get("value"):
-                            content_fields.append(entry.get("content_detail", {}).get("value", ""))
-                        
-                        if entry.get("summary_detail") and entry.get("summary_detail", {}).get("value"):
-                            content_fields.append(entry.get("summary_detail", {}).get("value", ""))
-                        
-                        if entry.get("description"):
-                            content_fields.append(entry.get("description", ""))
-                        
-                        if entry.get("summary"):
-                            content_fields.append(entry.get("summary", ""))
-                        
-                        # Prendre le contenu le plus long
-                        if content_fields:
-                            rss_content = max(content_fields, key=len)
-                    else:
-                        # Logique standard pour les autres sources
-                        if entry.get("content"):
-                            rss_content = entry.get("content", [{}])[0].get("value", "")
-                        elif entry.get("content_detail"):
-                            rss_content = entry.get("content_detail", {}).get("value", "")
-                        elif entry.get("description"):
-                            rss_content = entry.get("description", "")
-                        
-                        # Pour certains flux, le contenu peut être dans d'autres champs
-                        if not rss_content and entry.get("summary_detail"):
-                            rss_content = entry.get("summary_detail", {}).get("value", "")
-                    
-                    # Nettoyer le contenu HTML du RSS
-                    if rss_content:
-                        rss_content = self.content_extractor.clean_html(rss_content)
-                    
-                    # Pour ActuIA et autres sources avec contenu partiel, récupérer depuis la page
-                    full_content = rss_content
-                    
-                    # Traitement spécial pour arXiv : extraire depuis le PDF
-                    if name in ["arXiv AI", "arXiv ML"] and fetch_full_content:
-                        article_url = entry.get("link")
-                        if article_url:
-                            try:
-                                pdf_content = await self.pdf_extractor.extract_arxiv_content(article_url, session)
-                                if pdf_content:
-                                    full_content = pdf_content
-                                    print(f"  ↳ Contenu PDF extrait pour: {entry.get('title', '')[:50]}...")
-                            except Exception as e:
-                                print(f"  ↳ Impossible d'extraire le PDF: {str(e)}")
-                    
-                    # Pour les autres sources nécessitant l'extraction web
-                    elif fetch_full_content and name in SOURCES_NEED_FULL_CONTENT:
-                        article_url = entry.get("link")
-                        if article_url and (not rss_content or len(rss_content) < MIN_CONTENT_LENGTH):
-                            try:
-                                extracted_content = await self.content_extractor.extract_full_content(article_url, session)
-                                if extracted_content and len(extracted_content) > len(rss_content):
-                                    full_content = extracted_content
-                                    print(f"  ↳ Contenu complet récupéré pour: {entry.get('title', '')[:50]}...")
-                            except Exception as e:
-                                print(f"  ↳ Impossible de récupérer le contenu complet: {str(e)}")
-                    
-                    article = {
-                        "source": name,
-                        "title": entry.get("title", ""),
-                        "link": entry.get("link", ""),
-                        "published": entry.get("published", entry.get("updated", "")),
-                        "summary": entry.get("summary", "")[:500] if entry.get("summary") else "",
-                        "content": full_content,
-                        "author": entry.get("author", entry.get("author_detail", {}).get("name", "")),
-                        "tags": [tag.term for tag in entry.get("tags", [])] if entry.get("tags") else [],
-                        "scraped_at": datetime.now().isoformat()
-                    }
-                    articles.append(article)
+            # La connexion du flux est libérée avant les requêtes de contenu complet
+            content = await self.fetch_feed(session, name, self.sources[name]["url"])
+            if content is None:
+                return []
+            
+            # Parsing incrémental arrêté après source_limit() entrées assez récentes (feedparser en secours)
+            with self.metrics.phase("parse"):
+                entries = parse_entries(content, self.source_limit(name), self.window_start())
+            
+            articles = []
+            self.partial_results[name] = articles
+            for entry in entries:
+                # Entrée déjà traitée lors d'un passage précédent
+                if entry.get("link") and entry.get("link") in self.known_links:
+                    continue
                 
-                print(f"✓ {name}: {len(articles)} articles")
-                self.source_status[name] = {"status": "success", "count": len(articles), "error": None}
-                return articles
+                article = self.restored_article(name, entry.get("link"))
+                if article is None:
+                    with self.metrics.article(entry.get("link", "")):
+                        article = await self.process_rss_entry(session, name, entry, fetch_full_content)
+                    self.checkpoint_article(name, entry.get("link"), article)
+                # Conversion immédiate : un contenu volumineux part sur disque avant l'entrée suivante
+                articles.append(Article.from_dict(article))
+            
+            stale = f" ({entries.skipped} trop anciens ignorés)" if entries.skipped else ""
+            print(f"✓ {name}: {len(articles)} articles{stale}")
+            self.source_status[name] = {"status": "success", "count": len(articles), "error": None}
+            return articles
                 
         except Exception as e:
             print(f"✗ Erreur {name}: {str(e)}")
             self.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
             return []
     
-    async def fetch_reddit(self, session: aiohttp.ClientSession) -> List[Dict]:
+    async def fetch_arxiv(self, session: aiohttp.ClientSession, name: str) -> List[Dict]:
+        """Flux arXiv : identifiants lus dans le flux, métadonnées de tous les papers en une requête à l'API d'export"""
+        url = self.sources[name]["url"]
+        try:
+            content = await self.fetch_feed(session, name, url)
+            if content is None:
+                return []
+            
+            with self.metrics.phase("parse"):
+                entries = [entry for entry in parse_entries(content, self.source_limit(name), self.window_start())
+                           if not (entry.get("link") and entry.get("link") in self.known_links)]
+            
+            ids = [paper_id for paper_id in (arxiv_id(entry.get("link", "")) for entry in entries) if paper_id]
+            papers = {}
+            if ids:
+                try:
+                    # Statut vérifié explicitement : les réponses d'archive (--record/--replay) n'ont pas raise_for_status
+                    async with session.get(metadata_url(url, ids), timeout=30) as response:
+                        if response.status != 200:
+                            raise ValueError(f"HTTP {response.status}")
+                        data = await response.read()
+                    with self.metrics.phase("parse"):
+                        papers = parse_metadata(data)
+                except Exception as e:
+                    print(f"  ↳ {name}: métadonnées arXiv indisponibles, contenu du flux utilisé ({str(e)})")
+            
+            articles = []
+            self.partial_results[name] = articles
+            pdfs = found = 0
+            for entry in entries:
+                paper = papers.get(arxiv_id(entry.get("link", "")))
+                found += paper is not None
+                article = self.restored_article(name, entry.get("link"))
+                if article is not None:
+                    # PDF extrait avant l'interruption : il compte dans le budget du run
+                    self.arxiv_pdf_budget -= article["pdf_extracted"]
+                else:
+                    with self.metrics.article(entry.get("link", "")):
+                        article = await self.process_arxiv_entry(session, name, entry, paper)
+                    self.checkpoint_article(name, entry.get("link"), article)
+                pdfs += article.pop("pdf_extracted")
+                articles.append(Article.from_dict(article))
+            
+            print(f"✓ {name}: {len(articles)} papers ({found} métadonnées en une requête, {pdfs} PDFs)")
+            self.source_status[name] = {"status": "success", "count": len(articles), "error": None, "pdfs": pdfs}
+            return articles
+        
+        except Exception as e:
+            print(f"✗ Erreur {name}: {str(e)}")
+            self.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
+            return []
+    
+    def take_pdf_budget(self, name: str) -> bool:
+        """Palier PDF : activé pour la source, budget du run non épuisé et échéance assez lointaine"""
+        if not self.arxiv_pdf or self.sources[name]["full_content"] != "arxiv_pdf" or self.arxiv_pdf_budget <= 0:
+            return False
+        if self.skip_full_content():
+            return False
+        if self.shared_pdf_budget is not None and not self.shared_pdf_budget():
+            self.arxiv_pdf_budget = 0
+            return False
+        self.arxiv_pdf_budget -= 1
+        return True
+    
+    async def process_arxiv_entry(self, session: aiohttp.ClientSession, name: str, entry, paper: Optional[Dict]) -> Dict:
+        """Article arXiv à partir des métadonnées de l'API (du flux à défaut), avec le PDF si le palier le permet"""
+        link = entry.get("link", "")
+        if paper is not None:
+            content = format_abstract(paper)
+            article = {
+                "source": self.article_source(name),
+                "title": paper["title"] or entry.get("title", ""),
+                "link": link,
+                "published": paper["published"] or entry.get("published", ""),
+                "summary": paper["abstract"][:500],
+                "author": ", ".join(paper["authors"]),
+                "tags": paper["categories"],
+                "published_ts": parse_timestamp(paper["published"]) or entry.get("published_ts")
+            }
+        else:
+            content = self.content_extractor.clean_html(entry.get("description", "")) if entry.get("description") else ""
+            article = {
+                "source": self.article_source(name),
+                "title": entry.get("title", ""),
+                "link": link,
+                "published": entry.get("published", entry.get("updated", "")),
+                "summary": entry.get("summary", "")[:500] if entry.get("summary") else "",
+                "author": entry.get("author", ""),
+                "tags": [tag.term for tag in entry.get("tags", [])] if entry.get("tags") else [],
+                "published_ts": entry.get("published_ts")
+            }
+        
+        pdf_extracted = False
+        if link and self.take_pdf_budget(name):
+            async with self.pdf_slots:
+                pdf_content = await self.pdf_extractor.extract_arxiv_content(link, session)
+            if pdf_content:
+                content = pdf_content
+                pdf_extracted = True
+                print(f"  ↳ Contenu PDF extrait pour: {article['title'][:50]}...")
+        
+        article.update({
+            "content": content,
+            "scraped_at": datetime.now().isoformat(),
+            "arxiv_id": arxiv_id(link),
+            "pdf_extracted": pdf_extracted
+        })
+        return article
+    
+    async def process_rss_entry(self, session: aiohttp.ClientSession, name: str, entry, fetch_full_content: bool = True) -> Dict:
+        """Construit un article à partir d'une entrée RSS, avec extraction du contenu complet si nécessaire"""
+        spec = self.sources[name]
+        
+        # Récupération du contenu depuis le RSS
+        rss_content = ""
+        
+        # Sources dont les pages sont inaccessibles (AI Business) : garder le plus long contenu du RSS
+        if spec["rss_content"] == "longest":
+            # Chercher dans tous les champs possibles
+            content_fields = []
+            
+            if entry.get("content"):
+                for content_item in entry.get("content", []):
+                    if isinstance(content_item, dict) and content_item.get("value"):
+                        content_fields.append(content_item.get("value", ""))
+            
+            if entry.get("content_detail") and entry.get("content_detail", {}).get("value"):
+                content_fields.append(entry.get("content_detail", {}).get("value", ""))
+            
+            if entry.get("summary_detail") and entry.get("summary_detail", {}).get("value"):
+                content_fields.append(entry.get("summary_detail", {}).get("value", ""))
+            
+            if entry.get("description"):
+                content_fields.append(entry.get("description", ""))
+            
+            if entry.get("summary"):
+                content_fields.append(entry.get("summary", ""))
+            
+            # Prendre le contenu le plus long
+            if content_fields:
+                rss_content = max(content_fields, key=len)
+        else:
+            # Logique standard pour les autres sources
+            if entry.get("content"):
+                rss_content = entry.get("content", [{}])[0].get("value", "")
+            elif entry.get("content_detail"):
+                rss_content = entry.get("content_detail", {}).get("value", "")
+            elif entry.get("description"):
+                rss_content = entry.get("description", "")
+            
+            # Pour certains flux, le contenu peut être dans d'autres champs
+            if not rss_content and entry.get("summary_detail"):
+                rss_content = entry.get("summary_detail", {}).get("value", "")
+        
+        # Nettoyer le contenu HTML du RSS
+        if rss_content:
+            with self.metrics.phase("extract"):
+                rss_content = self.content_extractor.clean_html(rss_content)
+        
+        # Pour ActuIA et autres sources avec contenu partiel, récupérer depuis la page
+        full_content = rss_content
+        
+        # Échéance proche : on garde le contenu RSS
+        needs_page = spec["full_content"] == "page" and (not rss_content or len(rss_content) < MIN_CONTENT_LENGTH)
+        if fetch_full_content and needs_page:
+            fetch_full_content = not self.skip_full_content()
+        
+        # Pour les sources nécessitant l'extraction web
+        if fetch_full_content and spec["full_content"] == "page":
+            article_url = entry.get("link")
+            if article_url and (not rss_content or len(rss_content) < MIN_CONTENT_LENGTH):
+                try:
+                    extracted_content = await self.content_extractor.extract_full_content(article_url, session)
+                    if extracted_content and len(extracted_content) > len(rss_content):
+                        full_content = extracted_content
+                        print(f"  ↳ Contenu complet récupéré pour: {entry.get('title', '')[:50]}...")
+                except Exception as e:
+                    print(f"  ↳ Impossible de récupérer le contenu complet: {str(e)}")
+        
+        return {
+            "source": self.article_source(name),
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", entry.get("updated", "")),
+            "summary": entry.get("summary", "")[:500] if entry.get("summary") else "",
+            "content": full_content,
+            "author": entry.get("author", entry.get("author_detail", {}).get("name", "")),
+            "tags": [tag.term for tag in entry.get("tags", [])] if entry.get("tags") else [],
+            "scraped_at": datetime.now().isoformat(),
+            "published_ts": entry.get("published_ts")
+        }
+    
+    async def fetch_reddit(self, session: aiohttp.ClientSession, name: str) -> List[Dict]:
+        limit = self.source_limit(name)
         try:
             headers = {"User-Agent": "AI Newsletter Bot 1.0"}
-            async with session.get(self.web_sources["Reddit ML"], headers=headers, timeout=30) as response:
-                data = await response.json()
+            articles = []
+            self.partial_results[name] = articles
+            after = None
+            since = self.window_start()
+            
+            # Pages suivantes uniquement si le filtre (posts texte) laisse trop peu de résultats
+            for _ in range(REDDIT_MAX_PAGES):
+                params = {"limit": REDDIT_PAGE_SIZE, "raw_json": 1}
+                if after:
+                    params["after"] = after
+                url = f"{self.sources[name]['url']}?{urlencode(params)}"
                 
-                articles = []
-                for post in data["data"]["children"][:10]:
+                async with session.get(url, headers=headers, timeout=30) as response:
+                    data = await response.json()
+                
+                for post in data["data"]["children"]:
                     post_data = post["data"]
+                    if f"https://reddit.com{post_data.get('permalink', '')}" in self.known_links:
+                        continue
+                    if since is not None and post_data.get("created_utc", 0) < since:
+                        continue
                     if post_data.get("is_self", False):  # Text posts only
                         article = {
-                            "source": "Reddit r/MachineLearning",
+                            "source": self.article_source(name),
                             "title": post_data.get("title", ""),
                             "link": f"https://reddit.com{post_data.get('permalink', '')}",
                             "published": datetime.fromtimestamp(post_data.get("created_utc", 0)).isoformat(),
                             "summary": post_data.get("selftext", "")[:500],
                             "content": post_data.get("selftext", ""),
                             "score": post_data.get("score", 0),
-                            "scraped_at": datetime.now().isoformat()
+                            "scraped_at": datetime.now().isoformat(),
+                            "published_ts": float(post_data.get("created_utc", 0))
                         }
                         articles.append(article)
+                        if len(articles) >= limit:
+                            break
                 
-                print(f"✓ Reddit ML: {len(articles)} posts")
-                self.source_status["Reddit ML"] = {"status": "success", "count": len(articles), "error": None}
-                return articles
+                after = data["data"].get("after")
+                if len(articles) >= limit or not after:
+                    break
+            
+            print(f"✓ {name}: {len(articles)} posts")
+            self.source_status[name] = {"status": "success", "count": len(articles), "error": None}
+            return articles
                 
         except Exception as e:
-            print(f"✗ Erreur Reddit: {str(e)}")
-            self.source_status["Reddit ML"] = {"status": "failed", "count": 0, "error": str(e)}
+            print(f"✗ Erreur {name}: {str(e)}")
+            self.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
             return []
     
-    async def fetch_huggingface(self, session: aiohttp.ClientSession) -> List[Dict]:
+    async def fetch_huggingface(self, session: aiohttp.ClientSession, name: str) -> List[Dict]:
+        limit = self.source_limit(name)
         try:
-            async with session.get(self.web_sources["Hugging Face"], timeout=30) as response:
+            # Tri, limite et champs demandés à l'API : la réponse ne contient que les modèles utilisés
+            params = [("sort", HUGGINGFACE_SORT), ("direction", -1), ("limit", limit)]
+            params += [("expand[]", field) for field in HUGGINGFACE_FIELDS]
+            url = f"{self.sources[name]['url']}?{urlencode(params)}"
+            
+            async with session.get(url, timeout=30) as response:
                 models = await response.json()
                 
                 articles = []
-                for model in models[:10]:  # Top 10 models
-                    model_id = model.get('modelId', '')
+                self.partial_results[name] = articles
+                for model in models[:limit]:
+                    model_id = model.get('modelId') or model.get('id', '')
+                    if f"https://huggingface.co/{model_id}" in self.known_links:
+                        continue
                     
                     # Récupérer le README du modèle
-                    readme_content = await self.fetch_huggingface_readme(session, model_id)
+                    readme_content = ""
+                    if not self.skip_full_content():
+                        with self.metrics.article(f"https://huggingface.co/{model_id}"):
+                            readme_content = await self.fetch_huggingface_readme(session, name, model_id)
                     
                     # Créer un résumé plus détaillé
                     summary_parts = []
@@ -230,30 +546,34 @@ class NewsletterScraper:
                         content_parts.append(readme_content)
                     
                     article = {
-                        "source": "Hugging Face Hub",
+                        "source": self.article_source(name),
                         "title": f"Model: {model_id}",
                         "link": f"https://huggingface.co/{model_id}",
                         "published": model.get("lastModified", ""),
                         "summary": " | ".join(summary_parts),
                         "content": "\n".join(content_parts),
                         "tags": model.get("tags", []),
-                        "scraped_at": datetime.now().isoformat()
+                        "downloads": model.get("downloads", 0),
+                        "likes": model.get("likes", 0),
+                        "scraped_at": datetime.now().isoformat(),
+                        "published_ts": parse_timestamp(model.get("lastModified"))
                     }
                     articles.append(article)
                 
-                print(f"✓ Hugging Face: {len(articles)} models avec contenu complet")
-                self.source_status["Hugging Face"] = {"status": "success", "count": len(articles), "error": None}
+                print(f"✓ {name}: {len(articles)} models avec contenu complet")
+                self.source_status[name] = {"status": "success", "count": len(articles), "error": None}
                 return articles
                 
         except Exception as e:
-            print(f"✗ Erreur Hugging Face: {str(e)}")
-            self.source_status["Hugging Face"] = {"status": "failed", "count": 0, "error": str(e)}
+            print(f"✗ Erreur {name}: {str(e)}")
+            self.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
             return []
     
-    async def fetch_huggingface_readme(self, session: aiohttp.ClientSession, model_id: str) -> str:
+    async def fetch_huggingface_readme(self, session: aiohttp.ClientSession, name: str, model_id: str) -> str:
         """Récupère le README d'un modèle Hugging Face"""
         try:
-            readme_url = f"https://huggingface.co/{model_id}/raw/main/README.md"
+            # Même hôte que l'API (permet de pointer le scraper vers un serveur local)
+            readme_url = urljoin(self.sources[name]["url"], f"/{model_id}/raw/main/README.md")
             async with session.get(readme_url, timeout=10) as response:
                 if response.status == 200:
                     content = await response.text()
@@ -267,90 +587,139 @@ class NewsletterScraper:
             print(f"  ↳ Impossible de récupérer le README pour {model_id}: {str(e)}")
             return ""
     
-    async def scrape_github_trending(self, session: aiohttp.ClientSession) -> List[Dict]:
+    async def scrape_github_trending(self, session: aiohttp.ClientSession, name: str) -> List[Dict]:
         try:
-            async with session.get(self.web_sources["GitHub Trending"], timeout=30) as response:
+            async with session.get(self.sources[name]["url"], timeout=30) as response:
                 html = await response.text()
+            
+            with self.metrics.phase("parse"):
+                from bs4 import BeautifulSoup
                 soup = BeautifulSoup(html, 'html.parser')
-                
-                articles = []
-                repos = soup.find_all('article', class_='Box-row')[:10]
-                
-                for repo in repos:
-                    title_elem = repo.find('h2', class_='h3')
-                    if title_elem:
-                        repo_path = title_elem.find('a')['href']
-                        title = repo_path.strip('/')
-                        
-                        description = repo.find('p', class_='col-9')
-                        description_text = description.text.strip() if description else ""
-                        
-                        stars = repo.find('span', class_='d-inline-block float-sm-right')
-                        stars_text = stars.text.strip() if stars else "0"
-                        
-                        article = {
-                            "source": "GitHub Trending",
-                            "title": title,
-                            "link": f"https://github.com{repo_path}",
-                            "published": datetime.now().isoformat(),
-                            "summary": description_text,
-                            "content": f"Stars today: {stars_text}",
-                            "scraped_at": datetime.now().isoformat()
-                        }
-                        articles.append(article)
-                
-                print(f"✓ GitHub Trending: {len(articles)} repos")
-                self.source_status["GitHub Trending"] = {"status": "success", "count": len(articles), "error": None}
-                return articles
-                
+                repos = soup.find_all('article', class_='Box-row')[:self.source_limit(name)]
+            
+            articles = []
+            for repo in repos:
+                title_elem = repo.find('h2', class_='h3')
+                if title_elem:
+                    repo_path = title_elem.find('a')['href']
+                    # Dépôt déjà signalé lors d'un passage précédent (mode daemon)
+                    if f"https://github.com{repo_path}" in self.known_links:
+                        continue
+                    title = repo_path.strip('/')
+                    
+                    description = repo.find('p', class_='col-9')
+                    description_text = description.text.strip() if description else ""
+                    
+                    stars = repo.find('span', class_='d-inline-block float-sm-right')
+                    stars_text = stars.text.strip() if stars else "0"
+                    
+                    article = {
+                        "source": self.article_source(name),
+                        "title": title,
+                        "link": f"https://github.com{repo_path}",
+                        "published": datetime.now().isoformat(),
+                        "summary": description_text,
+                        "content": f"Stars today: {stars_text}",
+                        "scraped_at": datetime.now().isoformat(),
+                        "published_ts": time.time()
+                    }
+                    articles.append(article)
+            
+            print(f"✓ {name}: {len(articles)} repos")
+            self.source_status[name] = {"status": "success", "count": len(articles), "error": None}
+            return articles
+            
         except Exception as e:
-            print(f"✗ Erreur GitHub: {str(e)}")
-            self.source_status["GitHub Trending"] = {"status": "failed", "count": 0, "error": str(e)}
+            print(f"✗ Erreur {name}: {str(e)}")
+            self.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
             return []
     
     async def scrape_all_sources(self) -> List[Dict]:
-        async with aiohttp.ClientSession() as session:
-            # RSS feeds
-            rss_tasks = [
-                self.fetch_rss(session, name, url) 
-                for name, url in self.rss_sources.items()
-            ]
-            
-            # Special sources
-            special_tasks = [
-                self.fetch_reddit(session),
-                self.fetch_huggingface(session),
-                self.scrape_github_trending(session)
-            ]
+        import aiohttp
+        async with aiohttp.ClientSession(trace_configs=[self.metrics.trace_config()]) as session:
+            session = self.wrap_session(session)
             
-            all_tasks = rss_tasks + special_tasks
-            results = await asyncio.gather(*all_tasks, return_exceptions=True)
+            # Les sources les plus longues d'après l'historique sont lancées en premier
+            names = self.history.order(self.get_source_names())
+            if not names:
+                # Toutes les sources désactivées ou filtrées : asyncio.wait refuse un ensemble vide
+                return []
+            self.stall_monitor.start()
+            try:
+                tasks = {name: asyncio.ensure_future(self.scrape_source(session, name)) for name in names}
+                
+                if self.time_budget is not None:
+                    # Second niveau de dégradation : annuler les sources encore en cours
+                    remaining = self.started_at + self.time_budget * DEADLINE_CANCEL_FRACTION - time.monotonic()
+                    _, pending = await asyncio.wait(tasks.values(), timeout=max(remaining, 0))
+                    for task in pending:
+                        task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+            finally:
+                await self.stall_monitor.stop()
             
+            # Résultats rassemblés dans l'ordre habituel des sources (déduplication stable)
             all_articles = []
-            for result in results:
-                if isinstance(result, list):
-                    all_articles.extend(result)
-            
-            # Dédupliquer par titre
-            seen_titles = set()
-            unique_articles = []
-            for article in all_articles:
-                if article["title"] not in seen_titles:
-                    seen_titles.add(article["title"])
-                    unique_articles.append(article)
+            for name in self.get_source_names():
+                task = tasks[name]
+                if task.cancelled():
+                    partial = [Article.from_dict(article) for article in self.partial_results.get(name, [])]
+                    print(f"⏰ {name}: annulé à l'échéance ({len(partial)} articles conservés)")
+                    self.source_status[name] = {"status": "partial" if partial else "failed", "count": len(partial),
+                                                "error": "Échéance dépassée"}
+                    self.degradation["cancelled_sources"].append(name)
+                    all_articles.extend(partial)
+                elif task.exception() is None:
+                    all_articles.extend(task.result())
             
-            return unique_articles
+            return self.deduplicate(all_articles)
+    
+    def deduplicate(self, articles: List[Dict]) -> List[Dict]:
+        """Dédupliquer par titre"""
+        seen_titles = set()
+        unique_articles = []
+        for article in articles:
+            if article["title"] not in seen_titles:
+                seen_titles.add(article["title"])
+                unique_articles.append(article)
+        
+        return unique_articles
     
     def get_status_report(self) -> Dict:
         total_sources = len(self.source_status)
         successful = sum(1 for s in self.source_status.values() if s["status"] == "success")
         failed = sum(1 for s in self.source_status.values() if s["status"] == "failed")
+        partial = sum(1 for s in self.source_status.values() if s["status"] == "partial")
         total_articles = sum(s["count"] for s in self.source_status.values())
         
         return {
             "total_sources": total_sources,
             "successful": successful,
             "failed": failed,
+            "partial": partial,
             "total_articles": total_articles,
-            "sources": self.source_status
+            "sources": self.source_status,
+            "timings": self.metrics.report(),
+            "degradation": self.get_degradation_report(),
+            "stalls": self.stall_monitor.report(),
+            "hedging": self.hedger.report()
+        }
+    
+    def get_degradation_report(self) -> Optional[Dict]:
+        """Dégradations appliquées en mode échéance (None sans budget de temps)"""
+        if self.time_budget is None:
+            return None
+        
+        level = 0
+        if self.degradation["full_content_skipped"]:
+            level = 1
+        if self.degradation["cancelled_sources"]:
+            level = 2
+        
+        return {
+            "time_budget": self.time_budget,
+            "elapsed": round(time.monotonic() - self.started_at, 3),
+            "level": level,
+            "full_content_skipped": self.degradation["full_content_skipped"],
+            "cancelled_sources": self.degradation["cancelled_sources"]
         }
\ No newline at end of file
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Scraping réparti sur plusieurs processus ou machines
+
+Les sources sont des jobs dans une file SQLite. Chaque worker réclame des
+sources, les scrape et écrit ses résultats partiels dans la même base ; le
+coordinateur fusionne et déduplique ensuite les résultats pour produire les
+fichiers raw_articles et status_report habituels.
+
+Usage sur plusieurs machines (base SQLite sur un disque partagé):
+    python sharding.py init data/queue.db
+    python sharding.py worker data/queue.db     # sur chaque machine
+    python sharding.py merge data/queue.db
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from scraper import NewsletterScraper
+from article import Article
+from scheduling import SourceHistory
+from checkpoint import RunCheckpoint
+from config import SHARD_WORKER_CONCURRENCY, SHARD_JOB_TIMEOUT, SOURCE_HISTORY_FILE, ARXIV_PDF_BUDGET
+
+class ShardQueue:
+    def __init__(self, path: str):
+        self.path = path
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60, isolation_level=None)
+    
+    def init(self, sources: List[str], pdf_budget: int = ARXIV_PDF_BUDGET):
+        """Crée la file avec un job par source et le budget de PDFs arXiv du run (les jobs et le budget existants sont conservés)"""
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS jobs (source TEXT PRIMARY KEY, position INTEGER, "
+                         "state TEXT, worker TEXT, claimed_at REAL, token TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS results (source TEXT PRIMARY KEY, status TEXT, "
+                         "timings TEXT, articles TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS budget (name TEXT PRIMARY KEY, remaining INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO budget VALUES ('arxiv_pdf', ?)", (pdf_budget,))
+            for position, source in enumerate(sources):
+                conn.execute("INSERT OR IGNORE INTO jobs VALUES (?, ?, 'pending', NULL, NULL, NULL)", (source, position))
+    
+    def claim(self, worker: str) -> Optional[Tuple[str, str]]:
+        """Réclame la prochaine source en attente, ou abandonnée depuis plus de SHARD_JOB_TIMEOUT
+        
+        Retourne la source et le jeton de cette réclamation, à présenter à complete().
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT source FROM jobs WHERE state = 'pending' OR (state = 'running' AND claimed_at < ?) "
+                "ORDER BY position LIMIT 1", (time.time() - SHARD_JOB_TIMEOUT,)
+            ).fetchone()
+            token = uuid.uuid4().hex
+            if row:
+                conn.execute("UPDATE jobs SET state = 'running', worker = ?, claimed_at = ?, token = ? WHERE source = ?",
+                             (worker, time.time(), token, row[0]))
+            conn.execute("COMMIT")
+            return (row[0], token) if row else None
+        finally:
+            conn.close()
+    
+    def complete(self, source: str, token: str, status: Dict, timings: Optional[Dict], articles: List[Dict]) -> bool:
+        """Enregistre les résultats d'une source ; False (résultats ignorés) si elle a été réclamée à nouveau entre-temps"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            claimed = conn.execute("UPDATE jobs SET state = 'done' WHERE source = ? AND token = ? AND state = 'running'",
+                                   (source, token)).rowcount
+            if claimed:
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                             (source, json.dumps(status), json.dumps(timings), json.dumps([dict(article) for article in articles], ensure_ascii=False)))
+            conn.execute("COMMIT")
+            return bool(claimed)
+        finally:
+            conn.close()
+    
+    def take_pdf(self) -> bool:
+        """Réserve un PDF arXiv sur le budget commun à tous les workers ; False s'il est épuisé"""
+        with closing(self._connect()) as conn:
+            return conn.execute("UPDATE budget SET remaining = remaining - 1 "
+                                "WHERE name = 'arxiv_pdf' AND remaining > 0").rowcount == 1
+    
+    def requeue_running(self) -> int:
+        """Remet en attente les sources dont le worker a été interrompu (reprise d'un run)"""
+        with closing(self._connect()) as conn:
+            return conn.execute("UPDATE jobs SET state = 'pending', worker = NULL, token = NULL WHERE state = 'running'").rowcount
+    
+    def remaining(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE state != 'done'").fetchone()[0]
+    
+    def results(self):
+        """Résultats partiels dans l'ordre des sources"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT r.source, r.status, r.timings, r.articles FROM results r "
+                                "JOIN jobs j ON j.source = r.source ORDER BY j.position").fetchall()
+        for source, status, timings, articles in rows:
+            yield source, json.loads(status), json.loads(timings), json.loads(articles)
+
+async def run_worker(queue_path: str, worker_id: str, concurrency: int = SHARD_WORKER_CONCURRENCY,
+                     max_age_hours: Optional[float] = None, articles_per_source: Optional[int] = None,
+                     arxiv_pdf: bool = False, run_id: Optional[str] = None) -> int:
+    """Traite des sources de la file jusqu'à ce qu'elle soit vide ; retourne le nombre de sources traitées"""
+    import aiohttp
+    queue = ShardQueue(queue_path)
+    scraper = NewsletterScraper()
+    # Priorités des requêtes d'après les durées historiques des sources, comme pour un run unique
+    scraper.history = SourceHistory.load(SOURCE_HISTORY_FILE)
+    if max_age_hours is not None:
+        scraper.max_age_hours = max_age_hours
+    if articles_per_source is not None:
+        scraper.articles_per_source = articles_per_source
+    # Le budget de PDFs est celui du run, réservé dans la file par tous les workers
+    scraper.arxiv_pdf = arxiv_pdf
+    scraper.shared_pdf_budget = queue.take_pdf
+    if run_id is not None:
+        # Articles déjà traités par les workers d'un run interrompu ; ce worker tient son propre journal
+        scraper.checkpoint = RunCheckpoint.load(run_id)
+    done = 0
+    
+    async with aiohttp.ClientSession(trace_configs=[scraper.metrics.trace_config()]) as session:
+        session = scraper.wrap_session(session)
+        scraper.stall_monitor.start()
+        
+        async def consume():
+            nonlocal done
+            while True:
+                claimed = await asyncio.to_thread(queue.claim, worker_id)
+                if claimed is None:
+                    return
+                name, token = claimed
+                try:
+                    articles = await scraper.scrape_source(session, name)
+                except Exception as e:
+                    print(f"✗ Erreur {name}: {str(e)}")
+                    scraper.source_status[name] = {"status": "failed", "count": 0, "error": str(e)}
+                    articles = []
+                status = scraper.source_status.get(name, {"status": "failed", "count": 0, "error": "aucun statut"})
+                timings = scraper.metrics.report().get(name)
+                if timings is not None:
+                    # Les blocages de boucle voyagent avec les mesures de la source
+                    timings["stalls"] = scraper.stall_monitor.for_source(name)
+                if not await asyncio.to_thread(queue.complete, name, token, status, timings, articles):
+                    # Réclamée par un autre worker après SHARD_JOB_TIMEOUT : ses résultats sont les seuls gardés
+                    print(f"⚠️ {name}: source réclamée par un autre worker, résultats ignorés")
+                    continue
+                done += 1
+        
+        try:
+            await asyncio.gather(*[consume() for _ in range(concurrency)])
+        finally:
+            await scraper.stall_monitor.stop()
+            if scraper.checkpoint is not None:
+                scraper.checkpoint.close()
+    
+    return done
+
+def worker_process(queue_path: str, worker_id: str, max_age_hours: Optional[float] = None,
+                   articles_per_source: Optional[int] = None, arxiv_pdf: bool = False, run_id: Optional[str] = None) -> int:
+    """Point d'entrée d'un processus worker"""
+    return asyncio.run(run_worker(queue_path, worker_id, max_age_hours=max_age_hours,
+                                  articles_per_source=articles_per_source, arxiv_pdf=arxiv_pdf, run_id=run_id))
+
+def merge_results(queue_path: str) -> Tuple[List[Dict], Dict]:
+    """Fusionne les résultats partiels : articles dédupliqués et rapport de statut complet"""
+    queue = ShardQueue(queue_path)
+    scraper = NewsletterScraper()
+    all_articles = []
+    timings = {}
+    
+    for source, status, source_timings, articles in queue.results():
+        scraper.source_status[source] = status
+        if source_timings:
+            scraper.stall_monitor.stalls.extend(source_timings.pop("stalls", []))
+            timings[source] = source_timings
+        all_articles.extend(Article.from_dict(article) for article in articles)
+    
+    status_report = scraper.get_status_report()
+    status_report["timings"] = timings
+    
+    remaining = queue.remaining()
+    if remaining:
+        print(f"⚠️ {remaining} sources non terminées dans la file")
+    
+    return scraper.deduplicate(all_articles), status_report
+
+def ordered_sources(sources: Optional[List[str]] = None) -> List[str]:
+    """Sources (toutes par défaut) de la plus longue à la plus courte d'après l'historique, pour être réclamées en premier"""
+    return SourceHistory.load(SOURCE_HISTORY_FILE).order(sources or NewsletterScraper().get_source_names())
+
+def run_local_shards(workers: int, queue_path: Optional[str] = None, max_age_hours: Optional[float] = None,
+                     sources: Optional[List[str]] = None, articles_per_source: Optional[int] = None,
+                     arxiv_pdf: bool = False, run_id: Optional[str] = None) -> Tuple[List[Dict], Dict]:
+    """Répartit toutes les sources sur plusieurs processus locaux puis fusionne les résultats
+    
+    Avec `run_id` (points de reprise du run), la file est celle du run : une reprise garde les
+    sources terminées et relance celles que les workers interrompus avaient réclamées.
+    """
+    if queue_path is None:
+        timestamp = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        queue_path = f"data/shards_{timestamp}.db"
+    
+    queue = ShardQueue(queue_path)
+    queue.init(ordered_sources(sources))
+    requeued = queue.requeue_running()
+    print(f"🧩 Scraping réparti sur {workers} processus (file: {queue_path})")
+    if requeued:
+        print(f"↻ {requeued} sources interrompues remises en file")
+    
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(worker_process, queue_path, f"{socket.gethostname()}-{os.getpid()}-{i}",
+                                   max_age_hours, articles_per_source, arxiv_pdf, run_id)
+                   for i in range(workers)]
+        for future in futures:
+            future.result()
+    
+    return merge_results(queue_path)
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("init", "worker", "merge"):
+        print("Usage: python sharding.py init|worker|merge <file.db>")
+        sys.exit(1)
+    
+    command, queue_path = sys.argv[1], sys.argv[2]
+    
+    if command == "init":
+        sources = ordered_sources()
+        ShardQueue(queue_path).init(sources)
+        print(f"✅ File initialisée avec {len(sources)} sources: {queue_path}")
+    elif command == "worker":
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        done = worker_process(queue_path, worker_id)
+        print(f"✅ Worker {worker_id}: {done} sources traitées")
+    else:
+        from main import save_outputs
+        articles, status_report = merge_results(queue_path)
+        print(f"\n✅ {len(articles)} articles récupérés (après dédupplication)")
+        save_outputs(articles, status_report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Registre des sources : sources.json décrit chaque source et la façon de la scraper
+
+Chaque entrée donne le nom de la source (clé du rapport de statut), son type d'adaptateur,
+son URL et ses options :
+    type          "rss", "arxiv", "reddit", "huggingface", "github_trending" ("web" : page sans adaptateur)
+    limit         nombre d'articles lus (défaut selon le type, voir config.py)
+    full_content  "none", "page" (page de l'article si le RSS est trop court) ou, pour arxiv,
+                  "arxiv_pdf" (PDF complet quand le palier PDF est demandé, voir --arxiv-pdf)
+    rss_content   "first" (premier champ de contenu du flux) ou "longest" (le plus long)
+    label         valeur du champ "source" des articles (défaut : le nom)
+    enabled       false pour garder une source dans le registre sans la scraper
+"""
+
+import json
+import os
+from typing import Dict, Optional
+from config import (SOURCES_FILE, ARTICLES_PER_SOURCE, REDDIT_POSTS_LIMIT, HUGGINGFACE_MODELS_LIMIT,
+                    GITHUB_TRENDING_LIMIT)
+
+# Types d'adaptateurs et nombre d'articles lus par défaut
+ADAPTER_LIMITS = {
+    "rss": ARTICLES_PER_SOURCE,
+    "arxiv": ARTICLES_PER_SOURCE,
+    "reddit": REDDIT_POSTS_LIMIT,
+    "huggingface": HUGGINGFACE_MODELS_LIMIT,
+    "github_trending": GITHUB_TRENDING_LIMIT
+}
+# Sources listées sans adaptateur : elles doivent rester désactivées
+PASSIVE_TYPES = {"web"}
+
+FULL_CONTENT_MODES = {"none", "page", "arxiv_pdf"}
+RSS_CONTENT_MODES = {"first", "longest"}
+
+def normalize_source(entry: Dict) -> Dict:
+    """Valide une entrée du registre et complète les valeurs par défaut"""
+    name = entry.get("name")
+    if not name or not entry.get("type") or not entry.get("url"):
+        raise ValueError(f"Source sans nom, type ou URL: {entry}")
+    
+    spec = dict(entry)
+    spec.setdefault("enabled", True)
+    if spec["type"] not in ADAPTER_LIMITS and spec["type"] not in PASSIVE_TYPES:
+        raise ValueError(f"Source {name}: type inconnu {spec['type']} (possibles: {', '.join(ADAPTER_LIMITS)})")
+    if spec["type"] in PASSIVE_TYPES and spec["enabled"]:
+        raise ValueError(f"Source {name}: aucun adaptateur pour le type {spec['type']}, elle doit être désactivée")
+    
+    spec.setdefault("limit", ADAPTER_LIMITS.get(spec["type"]))
+    spec.setdefault("full_content", "none")
+    spec.setdefault("rss_content", "first")
+    spec.setdefault("label", name)
+    if spec["full_content"] not in FULL_CONTENT_MODES:
+        raise ValueError(f"Source {name}: full_content possibles {', '.join(sorted(FULL_CONTENT_MODES))}")
+    if spec["full_content"] == "arxiv_pdf" and spec["type"] != "arxiv":
+        raise ValueError(f"Source {name}: full_content arxiv_pdf réservé au type arxiv")
+    if spec["rss_content"] not in RSS_CONTENT_MODES:
+        raise ValueError(f"Source {name}: rss_content possibles {', '.join(sorted(RSS_CONTENT_MODES))}")
+    return spec
+
+def load_source_registry(path: Optional[str] = None) -> Dict[str, Dict]:
+    """Sources du registre par nom, dans l'ordre du fichier (chemin relatif au dossier du projet)"""
+    path = path or SOURCES_FILE
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)["sources"]
+    
+    sources = {}
+    for entry in entries:
+        spec = normalize_source(entry)
+        if spec["name"] in sources:
+            raise ValueError(f"Source en double dans {path}: {spec['name']}")
+        sources[spec["name"]] = spec
+    return sources
+
+def source_labels(sources: Dict[str, Dict]) -> Dict[str, str]:
+    """Valeur du champ "source" des articles pour chaque source"""
+    return {name: spec["label"] for name, spec in sources.items()}
\ No newline at end of file
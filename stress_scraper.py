@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Test de charge du scraper avec des milliers de flux synthétiques
+
+Pour chaque taille, un registre de N flux RSS synthétiques est écrit puis chargé comme
+sources.json ; une part des flux demande l'extraction de la page des articles. Les flux
+sont servis par un serveur aiohttp local (dans un thread, pour ne pas bloquer la boucle
+mesurée) et l'on mesure le scraping complet (scrape_all_sources), la déduplication et
+l'écriture des transcripts par source. Le coût par source de chaque étape, comparé à la
+plus petite taille, montre où le scraper cesse de passer à l'échelle.
+
+Usage:
+    python stress_scraper.py [--scales 19,100,500,2000] [--entries 5] [--page-fraction 0.25]
+                             [--latency 0.01] [--save data/stress_report.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+from typing import Dict, List
+from bench_fixtures import build_fixtures, use_fixtures, start_fixture_server
+from config import STRESS_SCALES, STRESS_ENTRIES_PER_FEED, STRESS_PAGE_FRACTION, STRESS_SCALING_TOLERANCE
+from metrics import PHASES
+from scraper import NewsletterScraper
+from source_registry import load_source_registry
+from transcript_by_source import TranscriptBySource
+
+# Étapes mesurées, dans l'ordre du pipeline
+STAGES = ["registry_s", "scrape_s", "dedup_s", "transcripts_s"]
+
+# Temps CPU / temps réel du scraping au-delà duquel le processus est considéré saturé
+CPU_BOUND_RATIO = 0.8
+
+class StressScraper(NewsletterScraper):
+    """Scraper qui mesure le temps de déduplication, appelée à la fin de scrape_all_sources"""
+    
+    def deduplicate(self, articles):
+        start = time.perf_counter()
+        unique = super().deduplicate(articles)
+        self.dedup_seconds = time.perf_counter() - start
+        return unique
+
+def synthetic_registry(count: int, entries: int, page_fraction: float) -> List[Dict]:
+    """Entrées de registre de `count` flux RSS, dont une part régulière avec extraction de page"""
+    sources = []
+    for i in range(count):
+        needs_page = int((i + 1) * page_fraction) > int(i * page_fraction)
+        sources.append({
+            "name": f"Synthetic {i:04d}",
+            "type": "rss",
+            "url": f"http://127.0.0.1/rss/feed{i}.xml",
+            "limit": entries,
+            "full_content": "page" if needs_page else "none"
+        })
+    return sources
+
+@contextlib.contextmanager
+def fixture_server(routes: Dict, latency: float):
+    """Serveur de fixtures sur sa propre boucle, dans un thread ; retourne son URL de base"""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    server = {}
+    
+    def serve():
+        asyncio.set_event_loop(loop)
+        server["runner"], server["base_url"] = loop.run_until_complete(start_fixture_server(routes, latency))
+        started.set()
+        loop.run_forever()
+    
+    thread = threading.Thread(target=serve, name="stress-fixtures", daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        yield server["base_url"]
+    finally:
+        asyncio.run_coroutine_threadsafe(server["runner"].cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+def run_scale(count: int, entries: int, page_fraction: float, latency: float, workdir: str) -> Dict:
+    """Scraping, déduplication et transcripts pour `count` flux ; retourne les mesures"""
+    registry_file = os.path.join(workdir, f"sources_{count}.json")
+    with open(registry_file, 'w', encoding='utf-8') as f:
+        json.dump({"sources": synthetic_registry(count, entries, page_fraction)}, f)
+    
+    start = time.perf_counter()
+    sources = load_source_registry(registry_file)
+    registry_s = time.perf_counter() - start
+    
+    routes = {}
+    with fixture_server(routes, latency) as base_url:
+        fixture_routes, urls = build_fixtures(base_url, sources, entries)
+        routes.update(fixture_routes)
+        use_fixtures(sources, urls)
+        
+        scraper = StressScraper(sources)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            articles = asyncio.run(scraper.scrape_all_sources())
+        scrape_s = time.perf_counter() - start
+        cpu_s = time.process_time() - cpu_start
+    
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        TranscriptBySource(base_dir=os.path.join(workdir, f"transcripts_{count}")).save_transcripts_by_source(articles)
+    transcripts_s = time.perf_counter() - start
+    
+    report = scraper.get_status_report()
+    stages = {phase: round(sum(record[phase] for record in report["timings"].values()), 3) for phase in PHASES}
+    requests = sum(record["requests"] for record in report["timings"].values())
+    return {
+        "sources": count,
+        "articles": len(articles),
+        "failed": report["failed"],
+        "registry_s": round(registry_s, 4),
+        "scrape_s": round(scrape_s - scraper.dedup_seconds, 4),
+        "dedup_s": round(scraper.dedup_seconds, 4),
+        "transcripts_s": round(transcripts_s, 4),
+        # Temps CPU du processus, thread du serveur de fixtures compris
+        "cpu_s": round(cpu_s, 3),
+        "requests": requests,
+        # Plafond : SCRAPER_MAX_CONCURRENT_REQUESTS / latence ; en dessous, c'est le CPU qui limite
+        "requests_per_s": round(requests / scrape_s, 1),
+        "stages": stages,
+        "stalls": {"count": report["stalls"]["count"], "max_s": report["stalls"]["max_s"]},
+        # Maximum du processus depuis son démarrage (Linux : en Ko), serveur de fixtures compris
+        "peak_memory_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+def scaling_report(results: List[Dict]) -> Dict[str, float]:
+    """Croissance du coût par source de chaque étape entre la plus petite et la plus grande taille"""
+    first, last = results[0], results[-1]
+    growth = {}
+    for stage in STAGES:
+        base = first[stage] / first["sources"]
+        growth[stage] = round((last[stage] / last["sources"]) / base, 2) if base else 0.0
+    return growth
+
+def print_results(results: List[Dict]):
+    print(f"\n{'sources':>8} {'articles':>9} {'scraping':>16} {'dédup':>14} {'transcripts':>16} "
+          f"{'requêtes/s':>11} {'CPU':>7} {'blocages':>9} {'échecs':>7} {'mémoire':>9}")
+    for result in results:
+        per_source = lambda stage: f"{result[stage]:.2f}s ({result[stage] / result['sources'] * 1000:.1f}ms)"
+        print(f"{result['sources']:>8} {result['articles']:>9} {per_source('scrape_s'):>16} "
+              f"{result['dedup_s'] * 1000:>12.2f}ms {per_source('transcripts_s'):>16} "
+              f"{result['requests_per_s']:>11.0f} {result['cpu_s']:>6.1f}s {result['stalls']['count']:>9} {result['failed']:>7} "
+              f"{result['peak_memory_mb']:>7.0f}Mo")
+    
+    if len(results) < 2:
+        return
+    growth = scaling_report(results)
+    print(f"\nCoût par source, {results[-1]['sources']} sources contre {results[0]['sources']}:")
+    for stage, factor in growth.items():
+        status = "⚠" if factor > STRESS_SCALING_TOLERANCE else "✓"
+        print(f"  {status} {stage[:-2]}: x{factor}")
+    
+    last = results[-1]
+    if last["cpu_s"] >= CPU_BOUND_RATIO * last["scrape_s"]:
+        print(f"\n⚠ Scraping limité par le CPU à {last['sources']} sources ({last['cpu_s']:.1f}s CPU pour "
+              f"{last['scrape_s']:.1f}s) : répartir les sources sur plusieurs processus (--workers)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du scraper avec des flux synthétiques")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in STRESS_SCALES),
+                        help="nombres de flux testés, séparés par des virgules")
+    parser.add_argument("--entries", type=int, default=STRESS_ENTRIES_PER_FEED, help="entrées par flux")
+    parser.add_argument("--page-fraction", type=float, default=STRESS_PAGE_FRACTION,
+                        help="part des flux avec extraction de la page des articles")
+    parser.add_argument("--latency", type=float, default=0.01, help="latence injectée par requête (s)")
+    parser.add_argument("--save", help="enregistre les mesures en JSON")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    scales = sorted(int(scale) for scale in args.scales.split(","))
+    
+    results = []
+    with tempfile.TemporaryDirectory(prefix="stress_") as workdir:
+        for count in scales:
+            print(f"▶ {count} flux synthétiques...")
+            results.append(run_scale(count, args.entries, args.page_fraction, args.latency, workdir))
+    
+    print_results(results)
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"params": vars(args), "results": results,
+                       "growth": scaling_report(results) if len(results) > 1 else {}}, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 Mesures sauvegardées dans {args.save}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Reprise d'un run à partir de ses points de reprise (checkpoint.RunCheckpoint)"""
+
+import asyncio
+from checkpoint import RunCheckpoint
+from config import ARXIV_PDF_BUDGET
+from scraper import NewsletterScraper
+
+SOURCES = {"arXiv AI": {"type": "arxiv", "full_content": "arxiv_pdf", "limit": 5}}
+
+def test_completed_arxiv_source_charges_its_pdfs(tmp_path):
+    checkpoint = RunCheckpoint.create({"arxiv_pdf": True}, "run", str(tmp_path))
+    status = {"status": "success", "count": 1, "error": None, "pdfs": 3}
+    checkpoint.record_source("arXiv AI", status, None, [{"source": "arXiv", "title": "Paper", "link": "https://arxiv.org/abs/1"}])
+    checkpoint.close()
+    
+    scraper = NewsletterScraper(SOURCES)
+    scraper.arxiv_pdf = True
+    scraper.checkpoint = RunCheckpoint.load("run", str(tmp_path))
+    # Source terminée : relue depuis le journal, sans session HTTP
+    articles = asyncio.run(scraper.scrape_source(None, "arXiv AI"))
+    
+    assert [article["title"] for article in articles] == ["Paper"]
+    assert scraper.source_status["arXiv AI"] == status
+    assert scraper.arxiv_pdf_budget == ARXIV_PDF_BUDGET - 3
@@ -0,0 +1,22 @@
+"""Découpage en sections des papers arXiv (pdf_extractor.index_sections)"""
+
+from pdf_extractor import PDFExtractor
+
+PAPER = ("Great Paper John Doe Abstract We propose a method. 1 Introduction Models are large. "
+         "2 Method We train it. 3 Experiments We test on 5 Results datasets. 4 Results Accuracy rises. "
+         "5 Conclusion It works. References [1] A. Author.")
+
+def test_title_inside_a_sentence_is_not_a_heading():
+    # "5 Results" au milieu d'une phrase ne doit pas faire écarter le vrai "5 Conclusion"
+    headings = [heading["heading"] for heading in PDFExtractor().index_sections(PAPER)]
+    assert headings == ["Abstract", "1 Introduction", "2 Method", "3 Experiments", "4 Results",
+                        "5 Conclusion", "References"]
+
+def test_structured_sections():
+    paper = PDFExtractor().extract_paper_sections(PAPER)
+    sections = paper["sections"]
+    assert list(sections) == ["abstract", "introduction", "method", "results", "conclusion"]
+    # Experiments puis Results : une seule section de résultats
+    assert PAPER[sections["results"]["start"]:sections["results"]["end"]].strip() == \
+        "We test on 5 Results datasets. 4 Results Accuracy rises."
+    assert PAPER[sections["conclusion"]["start"]:sections["conclusion"]["end"]].strip() == "It works."
\ No newline at end of file
@@ -1,8 +1,16 @@
+import json
 import os
 import re
 from datetime import datetime
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Callable, Iterable, Optional
+from collections import Counter
+
+# Empreintes des articles du run précédent, par source (mode delta)
+DELTA_STATE_FILE = ".delta_state.json"
+
+def article_key(article: Dict) -> str:
+    """Identifiant stable d'un article d'un run à l'autre : son lien, sinon son titre"""
+    return article.get('link') or article.get('title', '')
 
 class TranscriptBySource:
     def __init__(self, base_dir="transcripts"):
@@ -107,66 +115,198 @@ class TranscriptBySource:
         
         return '\n'.join(lines)
     
-    def generate_source_transcript(self, source_name: str, articles: List[Dict]) -> str:
-        """Génère le transcript complet pour une source"""
-        timestamp = datetime.now()
-        
+    def generate_source_header(self, source_name: str, count: int, timestamp: datetime) -> str:
         header = []
         header.append("=" * 80)
         header.append(f"TRANSCRIPT - {source_name}")
         header.append(f"Date de génération: {timestamp.strftime('%d/%m/%Y %H:%M:%S')}")
-        header.append(f"Nombre d'articles: {len(articles)}")
+        header.append(f"Nombre d'articles: {count}")
         header.append("=" * 80)
         header.append("")
+        return "\n".join(header)
+    
+    def generate_source_footer(self, source_name: str, timestamp: datetime) -> str:
+        footer = []
+        footer.append("\n" + "=" * 80)
+        footer.append(f"FIN DU TRANSCRIPT - {source_name}")
+        footer.append(f"Généré le {timestamp.strftime('%d/%m/%Y à %H:%M:%S')}")
+        footer.append("=" * 80)
+        return "\n".join(footer)
+    
+    def generate_source_transcript(self, source_name: str, articles: List[Dict]) -> str:
+        """Génère le transcript complet pour une source"""
+        timestamp = datetime.now()
         
-        content = ["\n".join(header)]
+        content = [self.generate_source_header(source_name, len(articles), timestamp)]
         
         # Ajouter chaque article
         for i, article in enumerate(articles, 1):
             content.append(f"\n### ARTICLE {i}/{len(articles)} ###\n")
             content.append(self.generate_article_transcript(article))
         
-        # Footer
-        footer = []
-        footer.append("\n" + "=" * 80)
-        footer.append(f"FIN DU TRANSCRIPT - {source_name}")
-        footer.append(f"Généré le {timestamp.strftime('%d/%m/%Y à %H:%M:%S')}")
-        footer.append("=" * 80)
-        
-        content.append("\n".join(footer))
+        content.append(self.generate_source_footer(source_name, timestamp))
         
         return "\n".join(content)
     
     def save_transcripts_by_source(self, articles: List[Dict]) -> Dict[str, str]:
         """Sauvegarde les transcripts organisés par source"""
-        # Grouper les articles par source
-        articles_by_source = defaultdict(list)
-        for article in articles:
-            source = article.get('source', 'Unknown')
-            articles_by_source[source].append(article)
+        return self.save_transcripts_streaming(lambda: articles)
+    
+    def save_transcripts_streaming(self, read_articles: Callable[[], Iterable[Dict]],
+                                   generated_at: Optional[datetime] = None) -> Dict[str, str]:
+        """Sauvegarde les transcripts par source en deux passes sur les articles
+        
+        read_articles() doit renvoyer un nouvel itérable à chaque appel (liste, ou lecture d'un
+        fichier JSON). La première passe compte les articles de chaque source, la seconde écrit
+        chaque article directement dans le fichier de sa source : seuls les compteurs restent en mémoire.
+        generated_at (par défaut maintenant) fixe la date affichée et celle du nom de fichier.
+        """
+        counts = Counter(article.get('source', 'Unknown') for article in read_articles())
         
         saved_files = {}
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = generated_at or datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         
-        for source_name, source_articles in articles_by_source.items():
-            # Créer le dossier de la source
+        for source_name, count in counts.items():
+            # Créer le dossier de la source et écrire l'en-tête
             source_dir = self.create_source_directory(source_name)
-            
-            # Générer le transcript
-            transcript = self.generate_source_transcript(source_name, source_articles)
-            
-            # Sauvegarder le fichier
-            filename = f"transcript_{timestamp}.txt"
-            filepath = os.path.join(source_dir, filename)
-            
+            filepath = os.path.join(source_dir, f"transcript_{timestamp}.txt")
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(transcript)
-            
+                f.write(self.generate_source_header(source_name, count, now))
             saved_files[source_name] = filepath
-            print(f"✅ {source_name}: {len(source_articles)} articles → {filepath}")
+        
+        # Un fichier ouvert à la fois, quel que soit le nombre de sources
+        positions = Counter()
+        for article in read_articles():
+            source_name = article.get('source', 'Unknown')
+            positions[source_name] += 1
+            with open(saved_files[source_name], 'a', encoding='utf-8') as f:
+                f.write(f"\n\n### ARTICLE {positions[source_name]}/{counts[source_name]} ###\n\n")
+                f.write(self.generate_article_transcript(article))
+        
+        for source_name, filepath in saved_files.items():
+            with open(filepath, 'a', encoding='utf-8') as f:
+                f.write("\n" + self.generate_source_footer(source_name, now))
+            print(f"✅ {source_name}: {counts[source_name]} articles → {filepath}")
         
         return saved_files
     
+    def load_delta_state(self) -> Dict[str, Dict[str, Dict]]:
+        """Charge les empreintes du run précédent (source -> clé d'article -> empreinte et titre)"""
+        state_path = os.path.join(self.base_dir, DELTA_STATE_FILE)
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_delta_state(self, state: Dict[str, Dict[str, Dict]]):
+        os.makedirs(self.base_dir, exist_ok=True)
+        state_path = os.path.join(self.base_dir, DELTA_STATE_FILE)
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, state_path)
+    
+    def save_transcripts_delta(self, read_articles: Callable[[], Iterable[Dict]],
+                               generated_at: Optional[datetime] = None) -> Dict:
+        """Écrit seulement les articles nouveaux ou modifiés depuis le run précédent, et un manifeste
+        
+        Chaque article est identifié par article_key() et comparé via l'empreinte de son transcript.
+        Les articles nouveaux ou modifiés vont dans <source>/delta_<timestamp>.txt ; le manifeste
+        delta_manifest_<timestamp>.json liste les articles retirés. Une source absente de ce run
+        (en échec, par exemple) n'est pas comparée : ses articles ne sont pas considérés comme retirés.
+        """
+        # hashlib (OpenSSL) est importé ici pour ne pas alourdir le démarrage de generate_transcripts_only
+        import hashlib
+        
+        previous = self.load_delta_state()
+        now = generated_at or datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        
+        # Première passe : empreinte de chaque article (la première occurrence d'une clé l'emporte)
+        current = {}
+        for article in read_articles():
+            source_entries = current.setdefault(article.get('source', 'Unknown'), {})
+            key = article_key(article)
+            if key not in source_entries:
+                digest = hashlib.sha1(self.generate_article_transcript(article).encode('utf-8')).hexdigest()
+                source_entries[key] = {"hash": digest, "title": article.get('title', '')}
+        
+        changes = {}
+        for source_name, entries in current.items():
+            known = previous.get(source_name, {})
+            changes[source_name] = {
+                "added": {key for key in entries if key not in known},
+                "changed": {key for key, entry in entries.items() if key in known and known[key]["hash"] != entry["hash"]},
+                "removed": [{"key": key, "title": entry["title"]} for key, entry in known.items() if key not in entries]
+            }
+        
+        saved_files = {}
+        for source_name, change in changes.items():
+            count = len(change["added"]) + len(change["changed"])
+            if not count:
+                continue
+            filepath = os.path.join(self.create_source_directory(source_name), f"delta_{timestamp}.txt")
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(self.generate_source_header(f"{source_name} (DELTA)", count, now))
+                f.write(f"Nouveaux: {len(change['added'])} - Modifiés: {len(change['changed'])} - "
+                        f"Retirés: {len(change['removed'])}\n")
+            saved_files[source_name] = filepath
+        
+        # Seconde passe : seuls les articles nouveaux ou modifiés sont écrits
+        positions = Counter()
+        written = set()
+        for article in read_articles():
+            source_name = article.get('source', 'Unknown')
+            key = article_key(article)
+            change = changes[source_name]
+            if (source_name, key) in written or (key not in change["added"] and key not in change["changed"]):
+                continue
+            written.add((source_name, key))
+            positions[source_name] += 1
+            label = "NOUVEAU" if key in change["added"] else "MODIFIÉ"
+            total = len(change["added"]) + len(change["changed"])
+            with open(saved_files[source_name], 'a', encoding='utf-8') as f:
+                f.write(f"\n\n### ARTICLE {positions[source_name]}/{total} ({label}) ###\n\n")
+                f.write(self.generate_article_transcript(article))
+        
+        for source_name, filepath in saved_files.items():
+            with open(filepath, 'a', encoding='utf-8') as f:
+                f.write("\n" + self.generate_source_footer(f"{source_name} (DELTA)", now))
+        
+        manifest = {
+            "generated_at": now.isoformat(),
+            "sources": {
+                source_name: {
+                    "file": saved_files.get(source_name),
+                    "added": len(change["added"]),
+                    "changed": len(change["changed"]),
+                    "unchanged": len(current[source_name]) - len(change["added"]) - len(change["changed"]),
+                    "removed": change["removed"]
+                }
+                for source_name, change in changes.items()
+            }
+        }
+        os.makedirs(self.base_dir, exist_ok=True)
+        manifest_path = os.path.join(self.base_dir, f"delta_manifest_{timestamp}.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        
+        # Les sources absentes de ce run gardent leurs empreintes pour le prochain
+        previous.update(current)
+        self.save_delta_state(previous)
+        
+        for source_name, info in manifest["sources"].items():
+            if info["file"] or info["removed"]:
+                print(f"✅ {source_name}: +{info['added']} ~{info['changed']} -{len(info['removed'])} → {info['file'] or '(retraits seulement)'}")
+        unchanged = sum(1 for info in manifest["sources"].values() if not info["file"] and not info["removed"])
+        if unchanged:
+            print(f"= {unchanged} sources inchangées")
+        print(f"🧾 Manifeste delta: {manifest_path}")
+        
+        return manifest
+    
     def create_index_file(self, saved_files: Dict[str, str], timestamp: str):
         """Crée un fichier index listant tous les transcripts générés"""
         index_path = os.path.join(self.base_dir, f"index_{timestamp}.txt")
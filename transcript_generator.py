@@ -1,15 +1,29 @@
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 import re
+from ranking import ArticleRanker
+from config import ARTICLES_PER_SECTION
 
 class TranscriptGenerator:
-    def __init__(self):
-        self.categories = {
+    def __init__(self, categories: Optional[Dict[str, List[str]]] = None,
+                 articles_per_section: int = ARTICLES_PER_SECTION, title: str = "Newsletter IA"):
+        # Catégories d'un profil de newsletter : mêmes clés, listes de sources différentes
+        self.categories = categories or {
             "research": ["arXiv", "Papers With Code", "Google AI Blog", "OpenAI Blog", "ScienceDaily"],
             "news": ["MIT Tech Review", "TechCrunch", "VentureBeat", "AI Business", "AI Trends", "ActuIA", "L'Usine Digitale"],
             "tools": ["Product Hunt", "Futurepedia", "FutureTools", "There's An AI For That", "Hugging Face"],
             "community": ["Reddit", "GitHub Trending", "KDnuggets", "MarkTechPost", "AIhub"]
         }
+        self.articles_per_section = articles_per_section
+        self.title = title
+        self.ranker = ArticleRanker()
+    
+    def categorize_article(self, article: Dict) -> str:
+        source = article.get("source", "")
+        for category, sources in self.categories.items():
+            if any(s in source for s in sources):
+                return category
+        return "other"
     
     def categorize_articles(self, articles: List[Dict]) -> Dict[str, List[Dict]]:
         categorized = {
@@ -21,17 +35,7 @@ class TranscriptGenerator:
         }
         
         for article in articles:
-            source = article.get("source", "")
-            placed = False
-            
-            for category, sources in self.categories.items():
-                if any(s in source for s in sources):
-                    categorized[category].append(article)
-                    placed = True
-                    break
-            
-            if not placed:
-                categorized["other"].append(article)
+            categorized[self.categorize_article(article)].append(article)
         
         return categorized
     
@@ -40,26 +44,48 @@ class TranscriptGenerator:
         text = re.sub(r'\s+', ' ', text)
         return text.strip()
     
-    def generate_transcript(self, articles: List[Dict]) -> str:
+    def generate_transcript(self, articles: List[Dict], generated_at: Optional[datetime] = None) -> str:
+        # generated_at permet de re-générer une newsletter passée telle qu'à la date du run
+        generated_at = generated_at or datetime.now()
         categorized = self.categorize_articles(articles)
         
-        transcript = f"""# Newsletter IA - {datetime.now().strftime('%d %B %Y')}
+        # Meilleurs articles de chaque catégorie (pertinence, fraîcheur, engagement)
+        selected = self.ranker.top_by_category(categorized, self.articles_per_section, generated_at.timestamp())
+        counts = {category: len(items) for category, items in categorized.items()}
+        return self.render_transcript(selected, counts, generated_at)
+    
+    def generate_transcript_streaming(self, read_articles: Callable[[], Iterable[Dict]],
+                                      generated_at: Optional[datetime] = None) -> Tuple[str, int]:
+        """Même newsletter que generate_transcript, les articles étant relus à chaque passe du classement
+        
+        Seuls les meilleurs articles de chaque catégorie restent en mémoire. Retourne la newsletter
+        et le nombre d'articles lus.
+        """
+        generated_at = generated_at or datetime.now()
+        selected, counts = self.ranker.top_by_category_streaming(
+            lambda: ((self.categorize_article(article), article) for article in read_articles()),
+            self.articles_per_section, generated_at.timestamp())
+        return self.render_transcript(selected, counts, generated_at), sum(counts.values())
+    
+    def render_transcript(self, selected: Dict[str, List[Dict]], counts: Dict[str, int], generated_at: datetime) -> str:
+        """Newsletter à partir des articles retenus et du nombre d'articles de chaque catégorie"""
+        transcript = f"""# {self.title} - {generated_at.strftime('%d %B %Y')}
 
 ## 📊 Résumé
-- **Total d'articles**: {len(articles)}
-- **Recherche**: {len(categorized['research'])} articles
-- **Actualités**: {len(categorized['news'])} articles
-- **Nouveaux outils**: {len(categorized['tools'])} articles
-- **Communauté**: {len(categorized['community'])} articles
+- **Total d'articles**: {sum(counts.values())}
+- **Recherche**: {counts.get('research', 0)} articles
+- **Actualités**: {counts.get('news', 0)} articles
+- **Nouveaux outils**: {counts.get('tools', 0)} articles
+- **Communauté**: {counts.get('community', 0)} articles
 
 ---
 
 """
         
         # Section Recherche
-        if categorized['research']:
+        if counts.get('research'):
             transcript += "## 🔬 Recherche & Publications\n\n"
-            for article in categorized['research'][:5]:  # Top 5
+            for article in selected['research']:
                 transcript += f"### {article['title']}\n"
                 transcript += f"**Source**: {article['source']}\n"
                 transcript += f"**Lien**: {article['link']}\n"
@@ -69,9 +95,9 @@ class TranscriptGenerator:
                 transcript += "\n---\n\n"
         
         # Section Actualités
-        if categorized['news']:
+        if counts.get('news'):
             transcript += "## 📰 Actualités du secteur\n\n"
-            for article in categorized['news'][:5]:
+            for article in selected['news']:
                 transcript += f"### {article['title']}\n"
                 transcript += f"**Source**: {article['source']}\n"
                 transcript += f"**Lien**: {article['link']}\n"
@@ -81,9 +107,9 @@ class TranscriptGenerator:
                 transcript += "\n---\n\n"
         
         # Section Outils
-        if categorized['tools']:
+        if counts.get('tools'):
             transcript += "## 🛠️ Nouveaux outils & Produits\n\n"
-            for article in categorized['tools'][:5]:
+            for article in selected['tools']:
                 transcript += f"### {article['title']}\n"
                 transcript += f"**Source**: {article['source']}\n"
                 transcript += f"**Lien**: {article['link']}\n"
@@ -93,9 +119,9 @@ class TranscriptGenerator:
                 transcript += "\n---\n\n"
         
         # Section Communauté
-        if categorized['community']:
+        if counts.get('community'):
             transcript += "## 👥 Communauté & Open Source\n\n"
-            for article in categorized['community'][:5]:
+            for article in selected['community']:
                 transcript += f"### {article['title']}\n"
                 transcript += f"**Source**: {article['source']}\n"
                 transcript += f"**Lien**: {article['link']}\n"
@@ -106,6 +132,6 @@ class TranscriptGenerator:
                     transcript += f"**Aperçu**: {summary}...\n"
                 transcript += "\n---\n\n"
         
-        transcript += f"\n\n---\n*Généré automatiquement le {datetime.now().strftime('%d/%m/%Y à %H:%M')}*"
+        transcript += f"\n\n---\n*Généré automatiquement le {generated_at.strftime('%d/%m/%Y à %H:%M')}*"
         
         return transcript
\ No newline at end of file